@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Elevator Simulation Benchmarks
+
+This script compares car-level service policies under conventional (up/down
+hall call) and destination dispatch on identical seeded traffic using the
+discrete-event engine and reports for each combination:
+- Round-trip time (time between successive lobby stops of a car)
+- Door stops per car, stops saved by grouping riders, and events processed
+- Throughput (passengers delivered per five minutes at the offered rate)
+- Passenger wait and journey times, and passengers left undelivered
+- Wall-clock time of the run
+
+With --bank-cars it instead times the stepped simulation loop with the
+elevators as objects and in the vectorized elevator bank for each number
+of cars, to show the building size at which the bank pays off.
+
+Runs continue after the last arrival until every passenger is delivered
+or the drain time runs out. Dispatch modes are only compared for a
+policy when every mode delivered all its passengers; otherwise their
+time statistics would leave out the passengers each mode failed to serve.
+"""
+
+import sys
+import time
+import random
+import argparse
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from simulation.discrete_event import DiscreteEventEngine
+from simulation.logger import SimulationLogger
+from controllers.simulation_controller import SimulationController
+from controllers.dispatch import DISPATCH_MODES
+from config.simulation_config import SimulationConfig
+from models.building import Building
+from models.clock import VirtualClock
+from models.elevator import SERVICE_POLICIES
+
+TRAFFIC_PATTERNS = ('up_peak', 'down_peak', 'mixed')
+
+LOBBY_FLOOR = 1
+
+# Throughput is quoted per five minutes, like handling capacity; it only
+# equals the handling capacity when the offered rate saturates the cars
+THROUGHPUT_PERIOD = 300.0
+
+# Simulated seconds per step of the stepped simulation loop
+BANK_TIME_STEP = 0.1
+
+def generate_traffic(pattern: str, num_floors: int, arrival_rate: float,
+                     duration: float, rng: random.Random) -> List[Tuple[float, int, int]]:
+    """
+    Generate passenger arrivals for a traffic pattern.
+
+    Args:
+        pattern: 'up_peak' (lobby to upper floors), 'down_peak' (upper floors
+            to lobby) or 'mixed' (random origin and destination)
+        num_floors: Number of floors in the building
+        arrival_rate: Passengers per second
+        duration: Length of the arrival period in seconds
+        rng: Random number generator
+
+    Returns:
+        List[Tuple[float, int, int]]: (arrival_time, origin, destination) tuples
+    """
+    arrivals = []
+    arrival_time = rng.expovariate(arrival_rate)
+
+    while arrival_time < duration:
+        upper_floor = rng.randint(LOBBY_FLOOR + 1, num_floors)
+        if pattern == 'up_peak':
+            origin, destination = LOBBY_FLOOR, upper_floor
+        elif pattern == 'down_peak':
+            origin, destination = upper_floor, LOBBY_FLOOR
+        else:
+            origin = rng.randint(1, num_floors)
+            destination = rng.randint(1, num_floors - 1)
+            if destination >= origin:
+                destination += 1
+
+        arrivals.append((arrival_time, origin, destination))
+        arrival_time += rng.expovariate(arrival_rate)
+
+    return arrivals
+
+def run_policy_benchmark(policy: str, num_floors: int, num_cars: int,
+                         arrivals: List[Tuple[float, int, int]], duration: float,
+                         capacity: int = 12, speed: float = 2.0,
+                         dispatch_mode: str = 'conventional',
+                         drain_time: float = 0.0) -> Dict[str, Any]:
+    """
+    Run one service policy and dispatch mode on a list of passenger arrivals.
+
+    Args:
+        policy: Car-level service policy (see SERVICE_POLICIES)
+        num_floors: Number of floors in the building
+        num_cars: Number of elevators
+        arrivals: (arrival_time, origin, destination) tuples
+        duration: Simulated duration in seconds
+        capacity: Passengers per car
+        speed: Car speed in floors per second
+        dispatch_mode: 'conventional' or 'destination' (see DISPATCH_MODES)
+        drain_time: Further simulated seconds in which the passengers still
+            waiting or riding at the end of the duration are delivered
+
+    Returns:
+        Dict[str, Any]: Round-trip, stop, event and passenger statistics;
+        'undelivered' counts the passengers left at the end of the drain time
+    """
+    clock = VirtualClock()
+    elevators = [{'id': f'car_{i + 1}', 'capacity': capacity, 'speed': speed,
+                  'service_policy': policy} for i in range(num_cars)]
+    building = Building("benchmark", num_floors, elevators, clock)
+    controller = SimulationController(building, SimulationLogger(clock=clock), clock,
+                                      dispatch_mode=dispatch_mode)
+
+    # Record every stop; lobby stops delimit round trips
+    stops = {elevator_id: 0 for elevator_id in building.elevators}
+    lobby_stops = {elevator_id: [] for elevator_id in building.elevators}
+
+    def on_doors_opened(elevator):
+        stops[elevator.id] += 1
+        if elevator.current_floor == LOBBY_FLOOR:
+            lobby_stops[elevator.id].append(clock.now())
+
+    for elevator in building.elevators.values():
+        elevator.add_door_open_listener(on_doors_opened)
+
+    config = SimulationConfig()
+    config.update_simulation_params({'passenger_arrival_rate': 0})
+    engine = DiscreteEventEngine(building, controller, config, clock=clock)
+    for arrival_time, origin, destination in arrivals:
+        engine.schedule_passenger(arrival_time, origin, destination)
+
+    wall_start = time.perf_counter()
+    events = engine.run(duration)
+    delivered_in_duration = len(controller.journeys)
+    if drain_time > 0:
+        events += engine.run(duration + drain_time)
+    wall_time = time.perf_counter() - wall_start
+
+    round_trips = [later - earlier
+                   for times in lobby_stops.values()
+                   for earlier, later in zip(times, times[1:])]
+    journeys = controller.journeys
+    wait_times = journeys.get_wait_times()
+    total_times = journeys.get_total_times()
+
+    def mean(values):
+        return sum(values) / len(values) if values else None
+
+    return {
+        'policy': policy,
+        'dispatch_mode': dispatch_mode,
+        'round_trips': len(round_trips),
+        'mean_round_trip_time': mean(round_trips),
+        'stops_per_car': sum(stops.values()) / num_cars,
+        'stops_saved': sum(controller.elevator_controller.get_stops_saved().values()),
+        'throughput': delivered_in_duration * THROUGHPUT_PERIOD / duration,
+        'events': events,
+        'completed_passengers': len(journeys),
+        'undelivered': len(arrivals) - len(journeys),
+        'mean_wait_time': mean(wait_times),
+        'mean_journey_time': mean(total_times),
+        'wall_time': wall_time
+    }
+
+def run_bank_benchmark(num_floors: int, num_cars: int,
+                       arrivals: List[Tuple[float, int, int]], duration: float,
+                       vectorized: bool, capacity: int = 12,
+                       speed: float = 2.0) -> Dict[str, Any]:
+    """
+    Time the stepped simulation loop on a list of passenger arrivals.
+
+    Each step advances the clock, assigns due hall calls and updates the
+    building, as the GUI's simulation loop does.
+
+    Args:
+        num_floors: Number of floors in the building
+        num_cars: Number of elevators
+        arrivals: (arrival_time, origin, destination) tuples
+        duration: Simulated duration in seconds
+        vectorized: Store the elevators in a vectorized ElevatorBank
+        capacity: Passengers per car
+        speed: Car speed in floors per second
+
+    Returns:
+        Dict[str, Any]: Steps run, passengers delivered and wall-clock time
+    """
+    clock = VirtualClock()
+    elevators = [{'id': f'car_{i + 1}', 'capacity': capacity, 'speed': speed}
+                 for i in range(num_cars)]
+    building = Building("benchmark", num_floors, elevators, clock, vectorized=vectorized)
+    controller = SimulationController(building, SimulationLogger(clock=clock), clock)
+    elevator_controller = controller.elevator_controller
+
+    steps = int(duration / BANK_TIME_STEP)
+    next_arrival = 0
+    wall_start = time.perf_counter()
+    for step in range(1, steps + 1):
+        clock.advance(BANK_TIME_STEP)
+        now = step * BANK_TIME_STEP
+        while next_arrival < len(arrivals) and arrivals[next_arrival][0] <= now:
+            _, origin, destination = arrivals[next_arrival]
+            controller.add_passenger(origin, destination)
+            next_arrival += 1
+        elevator_controller.update(clock.now())
+        building.update(BANK_TIME_STEP)
+    wall_time = time.perf_counter() - wall_start
+
+    return {
+        'vectorized': vectorized,
+        'num_cars': num_cars,
+        'steps': steps,
+        'completed_passengers': len(controller.journeys),
+        'wall_time': wall_time
+    }
+
+def run_bank_scaling(car_counts: List[int], num_floors: int, rate_per_car: float,
+                     duration: float, seed: int, capacity: int = 12,
+                     speed: float = 2.0) -> List[Dict[str, Any]]:
+    """
+    Compare elevator objects and the vectorized bank over numbers of cars.
+
+    Traffic grows with the number of cars so that every building carries
+    the same load per car, and both models replay the same arrivals.
+
+    Args:
+        car_counts: Numbers of elevators to compare
+        num_floors: Number of floors in the building
+        rate_per_car: Passenger arrivals per second per car
+        duration: Simulated duration in seconds
+        seed: Traffic seed
+        capacity: Passengers per car
+        speed: Car speed in floors per second
+
+    Returns:
+        List[Dict[str, Any]]: One row per number of cars with both wall-clock
+        times and the speedup of the bank (above 1 when the bank is faster)
+    """
+    rows = []
+    for num_cars in car_counts:
+        arrivals = generate_traffic('mixed', num_floors, rate_per_car * num_cars,
+                                    duration, random.Random(seed))
+        objects = run_bank_benchmark(num_floors, num_cars, arrivals, duration,
+                                     False, capacity, speed)
+        bank = run_bank_benchmark(num_floors, num_cars, arrivals, duration,
+                                  True, capacity, speed)
+        rows.append({
+            'num_cars': num_cars,
+            'passengers': len(arrivals),
+            'steps': objects['steps'],
+            'object_wall_time': objects['wall_time'],
+            'bank_wall_time': bank['wall_time'],
+            'speedup': objects['wall_time'] / bank['wall_time']
+        })
+    return rows
+
+def _format(value, width: int = 10, precision: int = 1) -> str:
+    """Format an optional number for the results table."""
+    if value is None:
+        return f"{'n/a':>{width}}"
+    return f"{value:>{width}.{precision}f}"
+
+def main(argv=None) -> int:
+    """Run the service policy and dispatch mode benchmark from command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Compare car-level service policies and dispatch modes on seeded traffic")
+    parser.add_argument("--floors", type=int, default=20, help="Number of floors")
+    parser.add_argument("--cars", type=int, default=4, help="Number of elevators")
+    parser.add_argument("--capacity", type=int, default=12, help="Passengers per car")
+    parser.add_argument("--speed", type=float, default=2.0, help="Floors per second")
+    parser.add_argument("--traffic", default="up_peak", choices=TRAFFIC_PATTERNS,
+                        help="Traffic pattern")
+    parser.add_argument("--rate", type=float, default=0.5,
+                        help="Passenger arrivals per second")
+    parser.add_argument("--duration", type=float, default=3600.0,
+                        help="Simulated seconds")
+    parser.add_argument("--drain", type=float, default=1800.0,
+                        help="Simulated seconds after the duration for queues to clear")
+    parser.add_argument("--seed", type=int, default=1, help="Traffic seed")
+    parser.add_argument("--policies", nargs="+", default=list(SERVICE_POLICIES),
+                        choices=SERVICE_POLICIES, help="Policies to compare")
+    parser.add_argument("--modes", nargs="+", default=list(DISPATCH_MODES),
+                        choices=DISPATCH_MODES,
+                        help="Dispatch modes to compare (conventional hall calls "
+                             "or destination entry)")
+    parser.add_argument("--bank-cars", type=int, nargs="+", default=None,
+                        help="Instead of comparing policies, time the stepped loop "
+                             "with elevator objects and the vectorized bank (requires "
+                             "NumPy) for each of these numbers of cars; --rate is "
+                             "then the arrival rate per --cars cars")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.bank_cars:
+        return _print_bank_scaling(args)
+
+    arrivals = generate_traffic(args.traffic, args.floors, args.rate,
+                                args.duration, random.Random(args.seed))
+
+    print(f"{args.traffic} traffic: {len(arrivals)} passengers, {args.floors} floors, "
+          f"{args.cars} cars, {args.duration:.0f}s simulated")
+    print(f"{'policy':12s} {'mode':12s} {'RTT (s)':>10s} {'trips':>6s} "
+          f"{'stops/car':>10s} {'saved':>6s} {'events':>8s} {'done':>6s} {'left':>6s} "
+          f"{'thru/5min':>9s} {'wait (s)':>10s} {'journey (s)':>12s} {'wall (s)':>9s}")
+
+    uncleared = []
+    for policy in args.policies:
+        results = [run_policy_benchmark(policy, args.floors, args.cars, arrivals,
+                                        args.duration, args.capacity, args.speed,
+                                        mode, args.drain)
+                   for mode in args.modes]
+        # Time statistics of a run that left passengers behind are biased
+        # low, so they are only shown when every mode cleared its queues
+        cleared = all(result['undelivered'] == 0 for result in results)
+        if not cleared:
+            uncleared.append(policy)
+
+        for result in results:
+            wait_time = result['mean_wait_time'] if cleared else None
+            journey_time = result['mean_journey_time'] if cleared else None
+            print(f"{policy:12s} {result['dispatch_mode']:12s} "
+                  f"{_format(result['mean_round_trip_time'])} "
+                  f"{result['round_trips']:>6d} {_format(result['stops_per_car'])} "
+                  f"{result['stops_saved']:>6d} {result['events']:>8d} "
+                  f"{result['completed_passengers']:>6d} {result['undelivered']:>6d} "
+                  f"{_format(result['throughput'], 9)} "
+                  f"{_format(wait_time)} "
+                  f"{_format(journey_time, 12)} "
+                  f"{_format(result['wall_time'], 9, 2)}")
+
+    if uncleared:
+        print(f"Wait and journey times not compared for {', '.join(uncleared)}: "
+              f"passengers were left undelivered {args.drain:.0f}s after the last "
+              f"arrival; lower --rate or raise --drain")
+
+    return 0
+
+def _print_bank_scaling(args: argparse.Namespace) -> int:
+    """Print the elevator object and vectorized bank timings."""
+    rows = run_bank_scaling(args.bank_cars, args.floors, args.rate / args.cars,
+                            args.duration, args.seed, args.capacity, args.speed)
+
+    print(f"Stepped loop: {args.floors} floors, {args.duration:.0f}s simulated "
+          f"in {BANK_TIME_STEP}s steps, {args.rate / args.cars:.3f} arrivals/s per car")
+    print(f"{'cars':>6s} {'passengers':>10s} {'objects (s)':>12s} "
+          f"{'bank (s)':>10s} {'speedup':>8s}")
+    for row in rows:
+        print(f"{row['num_cars']:>6d} {row['passengers']:>10d} "
+              f"{_format(row['object_wall_time'], 12, 2)} "
+              f"{_format(row['bank_wall_time'], 10, 2)} "
+              f"{_format(row['speedup'], 8, 2)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,13 @@ Building configuration management from CSV files.
 """
 
 import csv
+import importlib.util
 from typing import List, Dict, Any
 from pathlib import Path
 import logging
+from models.elevator import SERVICE_POLICIES
+from models.building import PARKING_POLICIES
+from models.zones import ZoneMap, parse_floor_set
 
 class BuildingConfig:
     """
@@ -44,7 +48,10 @@ class BuildingConfig:
                         self._building_data = {
                             'id': row.get('id', 'building_1'),
                             'num_floors': int(row.get('num_floors', 10)),
-                            'name': row.get('name', 'Default Building')
+                            'name': row.get('name', 'Default Building'),
+                            'parking': (row.get('parking') or 'initial').strip().lower(),
+                            'vectorized': (row.get('vectorized') or '').strip().lower()
+                                          in ('1', 'true', 'yes')
                         }
                     
                     elif section == 'elevator':
@@ -52,8 +59,18 @@ class BuildingConfig:
                             'id': row.get('id', f'elevator_{len(self._elevators_data)}'),
                             'capacity': int(row.get('capacity', 8)),
                             'speed': float(row.get('speed', 2.0)),
-                            'initial_floor': int(row.get('initial_floor', 1))
+                            'door_open_time': float(row.get('door_open_time') or 3.0),
+                            'door_operation_time': float(row.get('door_operation_time') or 2.0),
+                            'service_policy': (row.get('service_policy') or 'nearest').strip().lower()
                         }
+                        # Cars without an initial floor start at the lowest floor they serve
+                        initial_floor = (row.get('initial_floor') or '').strip()
+                        if initial_floor:
+                            elevator_config['initial_floor'] = int(initial_floor)
+                        # Served floors such as "1-20;40"; every floor if empty
+                        served_floors = (row.get('served_floors') or '').strip()
+                        if served_floors:
+                            elevator_config['served_floors'] = parse_floor_set(served_floors)
                         self._elevators_data.append(elevator_config)
             
             logging.info(f"Configuration loaded from {self._config_file}")
@@ -103,6 +120,13 @@ class BuildingConfig:
         if num_floors < 2:
             errors.append("Building must have at least 2 floors")
         
+        if self._building_data.get('parking', 'initial') not in PARKING_POLICIES:
+            errors.append("Invalid parking policy")
+        
+        if (self._building_data.get('vectorized') and
+                importlib.util.find_spec('numpy') is None):
+            errors.append("Vectorized elevator bank requires NumPy")
+        
         for i, elevator in enumerate(self._elevators_data):
             if elevator.get('capacity', 0) <= 0:
                 errors.append(f"Elevator {i}: Invalid capacity")
@@ -110,9 +134,36 @@ class BuildingConfig:
             if elevator.get('speed', 0) <= 0:
                 errors.append(f"Elevator {i}: Invalid speed")
             
+            if elevator.get('door_open_time', 3.0) < 0:
+                errors.append(f"Elevator {i}: Invalid door open time")
+            
+            if elevator.get('door_operation_time', 2.0) < 0:
+                errors.append(f"Elevator {i}: Invalid door operation time")
+            
+            if elevator.get('service_policy', 'nearest') not in SERVICE_POLICIES:
+                errors.append(f"Elevator {i}: Invalid service policy")
+            
             initial_floor = elevator.get('initial_floor', 1)
             if not (1 <= initial_floor <= num_floors):
                 errors.append(f"Elevator {i}: Invalid initial floor")
+            
+            served_floors = elevator.get('served_floors')
+            if served_floors is not None and (
+                    len(served_floors) < 2 or
+                    not all(1 <= floor <= num_floors for floor in served_floors)):
+                errors.append(f"Elevator {i}: Invalid served floors")
+            elif (served_floors is not None and 'initial_floor' in elevator and
+                    elevator['initial_floor'] not in served_floors):
+                errors.append(f"Elevator {i}: Initial floor is not served")
+        
+        # Every floor must be reachable from the lobby
+        zones = ZoneMap(num_floors, [
+            (elevator.get('id', str(i)),
+             elevator.get('served_floors') or range(1, num_floors + 1))
+            for i, elevator in enumerate(self._elevators_data)])
+        for floor in range(2, num_floors + 1):
+            if zones.route(1, floor) is None:
+                errors.append(f"Floor {floor} cannot be reached from floor 1 by any cars")
         
         return errors
 
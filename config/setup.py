@@ -29,6 +29,12 @@ setup(
     install_requires=[
         # No external dependencies - uses only Python standard library
     ],
+    extras_require={
+        # Vectorized elevator bank for large buildings
+        "vectorized": ["numpy"],
+        # Binary columnar logs with memory-mapped reading
+        "columnar": ["numpy"],
+    },
     entry_points={
         "console_scripts": [
             "elevator-simulator=main:main",
@@ -45,7 +45,13 @@ class SimulationConfig:
                         self._simulation_params = {
                             'duration': float(row.get('duration', 300)),  # 5 minutes default
                             'speed_multiplier': float(row.get('speed_multiplier', 1.0)),
-                            'passenger_arrival_rate': float(row.get('passenger_arrival_rate', 0.5))
+                            'passenger_arrival_rate': float(row.get('passenger_arrival_rate', 0.5)),
+                            'dispatch_algorithm': row.get('dispatch_algorithm') or 'nearest_car',
+                            'dispatch_mode': row.get('dispatch_mode') or 'conventional',
+                            'dispatch_cycle': float(row.get('dispatch_cycle') or 0),
+                            'state_logging': row.get('state_logging') or 'every_tick',
+                            'log_format': row.get('log_format') or 'csv',
+                            'metrics_interval': float(row.get('metrics_interval') or 1.0)
                         }
                     
                     elif section == 'scenario':
@@ -100,6 +106,39 @@ class SimulationConfig:
         """Get passenger arrival rate (passengers per second)."""
         return self._simulation_params.get('passenger_arrival_rate', 0.5)
     
+    def get_dispatch_algorithm(self) -> str:
+        """Get the name of the hall call dispatch algorithm."""
+        return self._simulation_params.get('dispatch_algorithm', 'nearest_car')
+    
+    def get_dispatch_mode(self) -> str:
+        """Get how passengers call cars ('conventional' or 'destination')."""
+        return self._simulation_params.get('dispatch_mode', 'conventional')
+    
+    def get_dispatch_cycle(self) -> float:
+        """Get the seconds between joint hall call assignments (0 for immediate)."""
+        return self._simulation_params.get('dispatch_cycle', 0.0)
+    
+    def get_state_logging(self) -> str:
+        """Get how elevator states are logged ('every_tick' or 'changes')."""
+        return self._simulation_params.get('state_logging', 'every_tick')
+    
+    def get_log_format(self) -> str:
+        """Get the format of the simulation logs ('csv' or 'columnar')."""
+        return self._simulation_params.get('log_format', 'csv')
+    
+    def get_metrics_interval(self) -> float:
+        """Get the simulated seconds between system metrics rows of headless runs."""
+        return self._simulation_params.get('metrics_interval', 1.0)
+    
+    def update_simulation_params(self, params: Dict[str, Any]) -> None:
+        """
+        Override simulation parameters loaded from file.
+        
+        Args:
+            params: Parameter values keyed by name (e.g. passenger_arrival_rate)
+        """
+        self._simulation_params.update(params)
+    
     @staticmethod
     def create_sample_config(file_path: str) -> None:
         """
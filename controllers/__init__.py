@@ -2,7 +2,15 @@
 Controllers package for elevator simulation.
 """
 
+from .dispatch import (Dispatcher, BankView, CarState, HallCall, DestinationCall,
+                       DestinationDispatcher, DISPATCH_MODES,
+                       register_dispatcher, get_dispatcher, available_dispatchers)
 from .elevator_controller import ElevatorController
 from .simulation_controller import SimulationController
 
-__all__ = ['ElevatorController', 'SimulationController']
\ No newline at end of file
+__all__ = [
+    'Dispatcher', 'BankView', 'CarState', 'HallCall', 'DestinationCall',
+    'DestinationDispatcher', 'DISPATCH_MODES',
+    'register_dispatcher', 'get_dispatcher', 'available_dispatchers',
+    'ElevatorController', 'SimulationController'
+]
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+Minimum-cost assignment of rows to columns of a cost matrix.
+"""
+
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional dependency
+    np = None
+
+def solve_assignment(cost: Sequence[Sequence[float]]) -> List[Tuple[int, int]]:
+    """
+    Assign every row of a cost matrix to a distinct column at minimum total cost.
+
+    Uses the Hungarian method with shortest augmenting paths, which takes
+    O(rows^2 * columns) time. The inner loops run on NumPy arrays when
+    NumPy is installed and in pure Python otherwise; both give the same
+    assignment.
+
+    Args:
+        cost: Matrix with one row per item to assign and at least as many
+            columns as rows; entries must be finite
+
+    Returns:
+        List[Tuple[int, int]]: (row, column) pairs sorted by row
+
+    Raises:
+        ValueError: If the matrix has more rows than columns
+    """
+    rows = len(cost)
+    if rows == 0:
+        return []
+
+    columns = len(cost[0])
+    if rows > columns:
+        raise ValueError(f"Cannot assign {rows} rows to {columns} columns")
+
+    if np is not None:
+        row_of_column = _solve_numpy(np.asarray(cost, dtype=float))
+    else:
+        row_of_column = _solve_python([list(row) for row in cost], rows, columns)
+
+    return sorted((row - 1, column - 1)
+                  for column, row in enumerate(row_of_column) if column and row)
+
+def _solve_python(cost: List[List[float]], rows: int, columns: int) -> List[int]:
+    """Run the Hungarian method with lists; returns the 1-based row of each column."""
+    infinity = float('inf')
+    u = [0.0] * (rows + 1)
+    v = [0.0] * (columns + 1)
+    row_of_column = [0] * (columns + 1)
+    way = [0] * (columns + 1)
+
+    for row in range(1, rows + 1):
+        row_of_column[0] = row
+        column = 0
+        min_slack = [infinity] * (columns + 1)
+        used = [False] * (columns + 1)
+
+        # Grow a shortest augmenting path until it reaches a free column
+        while True:
+            used[column] = True
+            current_row = row_of_column[column]
+            row_cost = cost[current_row - 1]
+            row_potential = u[current_row]
+            delta = infinity
+            next_column = 0
+
+            for j in range(1, columns + 1):
+                if not used[j]:
+                    slack = row_cost[j - 1] - row_potential - v[j]
+                    if slack < min_slack[j]:
+                        min_slack[j] = slack
+                        way[j] = column
+                    if min_slack[j] < delta:
+                        delta = min_slack[j]
+                        next_column = j
+
+            for j in range(columns + 1):
+                if used[j]:
+                    u[row_of_column[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_slack[j] -= delta
+
+            column = next_column
+            if row_of_column[column] == 0:
+                break
+
+        # Flip the assignments along the path
+        while column:
+            previous = way[column]
+            row_of_column[column] = row_of_column[previous]
+            column = previous
+
+    return row_of_column
+
+def _solve_numpy(cost) -> List[int]:
+    """Run the Hungarian method with NumPy arrays; returns the 1-based row of each column."""
+    rows, columns = cost.shape
+    u = np.zeros(rows + 1)
+    v = np.zeros(columns + 1)
+    row_of_column = np.zeros(columns + 1, dtype=int)
+    way = np.zeros(columns + 1, dtype=int)
+
+    for row in range(1, rows + 1):
+        row_of_column[0] = row
+        column = 0
+        min_slack = np.full(columns + 1, np.inf)
+        used = np.zeros(columns + 1, dtype=bool)
+
+        while True:
+            used[column] = True
+            current_row = row_of_column[column]
+            slack = cost[current_row - 1] - u[current_row] - v[1:]
+
+            free = ~used[1:]
+            improved = free & (slack < min_slack[1:])
+            min_slack[1:][improved] = slack[improved]
+            way[1:][improved] = column
+
+            candidates = np.where(free, min_slack[1:], np.inf)
+            next_column = int(np.argmin(candidates)) + 1
+            delta = candidates[next_column - 1]
+
+            u[row_of_column[used]] += delta
+            v[used] -= delta
+            min_slack[~used] -= delta
+
+            column = next_column
+            if row_of_column[column] == 0:
+                break
+
+        while column:
+            previous = way[column]
+            row_of_column[column] = row_of_column[previous]
+            column = previous
+
+    return row_of_column.tolist()
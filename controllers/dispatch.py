@@ -0,0 +1,664 @@
+"""
+Hall call dispatch strategies and the registry they are loaded from.
+"""
+
+import bisect
+from abc import ABC, abstractmethod
+from typing import Callable, Collection, Dict, Iterator, List, NamedTuple, Optional, Type
+import logging
+from models.building import Building
+from models.car_index import CarPositionIndex
+from models.elevator import Direction, ElevatorState
+from models.hall_calls import HallCall
+from .assignment import solve_assignment
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional dependency
+    np = None
+
+# Entry point group scanned for dispatchers provided by other packages
+ENTRY_POINT_GROUP = "elevator_simulator.dispatchers"
+
+# How passengers call cars: up/down hall buttons or destination entry kiosks
+DISPATCH_MODES = ('conventional', 'destination')
+
+class DestinationCall(NamedTuple):
+    """A trip entered at a destination kiosk before boarding, in cars of a zone (None for any car)."""
+    origin: int
+    destination: int
+    zone: Optional[str] = None
+
+    @property
+    def direction(self) -> Direction:
+        return Direction.UP if self.destination > self.origin else Direction.DOWN
+
+    @property
+    def hall_call(self) -> HallCall:
+        """Get the hall call the assigned car has to answer."""
+        return HallCall(self.origin, self.direction, self.zone)
+
+class CarState:
+    """
+    Read-only view of one car for dispatchers.
+
+    Attributes are read from the car when accessed, so creating the view
+    copies nothing.
+    """
+
+    __slots__ = ('_elevator', '_index')
+
+    def __init__(self, elevator, index: int):
+        """
+        Initialize a view of one car.
+
+        Args:
+            elevator: Elevator (or bank elevator) to expose
+            index: Position of the car in the bank
+        """
+        self._elevator = elevator
+        self._index = index
+
+    @property
+    def id(self) -> str:
+        return self._elevator.id
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def current_floor(self) -> int:
+        return self._elevator.current_floor
+
+    @property
+    def state(self) -> ElevatorState:
+        return self._elevator.state
+
+    @property
+    def direction(self) -> Direction:
+        return self._elevator.direction
+
+    @property
+    def passenger_count(self) -> int:
+        return self._elevator.passenger_count
+
+    @property
+    def capacity(self) -> int:
+        return self._elevator.capacity
+
+    @property
+    def speed(self) -> float:
+        return self._elevator.speed
+
+    @property
+    def door_open_time(self) -> float:
+        return self._elevator.door_open_time
+
+    @property
+    def door_operation_time(self) -> float:
+        return self._elevator.door_operation_time
+
+    @property
+    def service_policy(self) -> str:
+        return self._elevator.service_policy
+
+    @property
+    def pending_stops(self) -> List[int]:
+        return self._elevator.pending_stops
+
+    @property
+    def time_to_next_event(self) -> Optional[float]:
+        return self._elevator.get_time_to_next_event()
+
+    @property
+    def in_service(self) -> bool:
+        return self._elevator.in_service
+
+    def has_hall_call(self, floor: int, direction: Direction) -> bool:
+        return self._elevator.has_hall_call(floor, direction)
+
+    def serves(self, floor: int) -> bool:
+        return self._elevator.serves(floor)
+
+class BankView:
+    """
+    Read-only snapshot of a building's cars handed to dispatchers.
+
+    Car views are only built when first accessed, and every attribute is
+    read lazily from the underlying car.
+    """
+
+    def __init__(self, building: Building):
+        """
+        Initialize a view of a building's cars.
+
+        Args:
+            building: Building whose cars are exposed
+        """
+        self._building = building
+        self._cars: Optional[List[CarState]] = None
+        self._zone_cars: Dict[Optional[str], List[CarState]] = {}
+
+    @property
+    def num_floors(self) -> int:
+        return self._building.num_floors
+
+    @property
+    def cars(self) -> List[CarState]:
+        """Get views of all cars in configuration order."""
+        if self._cars is None:
+            self._cars = [CarState(elevator, index) for index, elevator
+                          in enumerate(self._building.elevators.values())]
+        return self._cars
+
+    def __iter__(self) -> Iterator[CarState]:
+        return iter(self.cars)
+
+    def __len__(self) -> int:
+        return len(self.cars)
+
+    def in_service(self) -> List[CarState]:
+        """Get views of the cars that can take hall calls."""
+        return [car for car in self.cars if car.in_service]
+
+    def zone(self, zone: Optional[str]) -> List[CarState]:
+        """Get views of the in-service cars of a zone (None for every car)."""
+        cars = self._zone_cars.get(zone)
+        if cars is None:
+            cars = self.cars
+            if zone is not None:
+                zone_ids = set(self._building.zones.get_cars(zone))
+                cars = [car for car in cars if car.id in zone_ids]
+            self._zone_cars[zone] = cars
+        return [car for car in cars if car.in_service]
+
+    def eligible(self, call: HallCall) -> List[CarState]:
+        """
+        Get views of the in-service cars that can answer a hall call.
+
+        Only cars of the call's zone that stop at the call floor are
+        eligible, so zoning also narrows the dispatcher's search.
+
+        Args:
+            call: The hall call
+
+        Returns:
+            List[CarState]: Eligible cars in configuration order
+        """
+        return [car for car in self.zone(call.zone) if car.serves(call.floor)]
+
+    def get_positions(self, zone: Optional[str] = None) -> CarPositionIndex:
+        """Get the sorted index of the in-service car positions of a zone (None for every car)."""
+        return self._building.get_car_positions(zone)
+
+class Dispatcher(ABC):
+    """
+    Strategy assigning hall calls to cars.
+
+    A controller creates one dispatcher instance and keeps it for the whole
+    simulation, so implementations may keep incremental state between calls.
+    """
+
+    # Name the dispatcher is registered under
+    name = ""
+
+    @abstractmethod
+    def assign(self, bank: BankView, call: HallCall) -> Optional[str]:
+        """
+        Choose the car that should answer a hall call.
+
+        Args:
+            bank: Read-only view of the building's cars
+            call: The hall call to assign; only the cars in
+                bank.eligible(call) can answer it
+
+        Returns:
+            Optional[str]: ID of the chosen car, or None if no car can answer
+        """
+
+    def reassign(self, bank: BankView,
+                 assignments: Dict[HallCall, str]) -> Dict[HallCall, str]:
+        """
+        Review unanswered hall calls and move them to better cars.
+
+        Called by the controller whenever a car takes a new hall call,
+        unless calls are assigned in dispatch cycles. Only the calls of
+        cars that moved, stopped or took a call since the previous review
+        are passed; the default keeps every assignment.
+
+        Args:
+            bank: Read-only view of the building's cars
+            assignments: Car ID assigned to each unanswered call to review
+
+        Returns:
+            Dict[HallCall, str]: New car ID for each call that should move
+        """
+        return {}
+
+    def assign_batch(self, bank: BankView, calls: List[HallCall]) -> Dict[HallCall, str]:
+        """
+        Assign the hall calls collected during one dispatch cycle.
+
+        The default assigns each call on its own with assign().
+
+        Args:
+            bank: Read-only view of the building's cars
+            calls: Calls to assign, oldest first
+
+        Returns:
+            Dict[HallCall, str]: Car ID for each call that could be assigned
+        """
+        assignments = {}
+        for call in calls:
+            car_id = self.assign(bank, call)
+            if car_id is not None:
+                assignments[call] = car_id
+        return assignments
+
+def _contains(stops: List[int], floor: int) -> bool:
+    """Check if an ascending list of stops contains a floor."""
+    index = bisect.bisect_left(stops, floor)
+    return index < len(stops) and stops[index] == floor
+
+_DISPATCHERS: Dict[str, Type[Dispatcher]] = {}
+
+def register_dispatcher(name: str) -> Callable[[Type[Dispatcher]], Type[Dispatcher]]:
+    """
+    Class decorator registering a dispatcher under a name.
+
+    Args:
+        name: Name used to select the dispatcher (e.g. in simulation configs)
+
+    Returns:
+        Callable: Decorator returning the class unchanged
+
+    Raises:
+        TypeError: If the class is not a Dispatcher
+        ValueError: If another class is already registered under the name
+    """
+    def decorator(cls: Type[Dispatcher]) -> Type[Dispatcher]:
+        if not issubclass(cls, Dispatcher):
+            raise TypeError(f"{cls.__name__} is not a Dispatcher")
+        registered = _DISPATCHERS.get(name)
+        if registered is not None and registered is not cls:
+            raise ValueError(f"Dispatch algorithm {name} is already registered "
+                             f"by {registered.__name__}")
+        cls.name = name
+        _DISPATCHERS[name] = cls
+        return cls
+
+    return decorator
+
+def _load_entry_point(name: str) -> Optional[Type[Dispatcher]]:
+    """Load a dispatcher class advertised by an installed package."""
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # Python < 3.8
+        return None
+
+    points = entry_points()
+    if hasattr(points, 'select'):
+        candidates = points.select(group=ENTRY_POINT_GROUP, name=name)
+    else:
+        candidates = [point for point in points.get(ENTRY_POINT_GROUP, [])
+                      if point.name == name]
+
+    for point in candidates:
+        cls = point.load()
+        register_dispatcher(name)(cls)
+        logging.info(f"Loaded dispatcher {name} from {point.value}")
+        return cls
+
+    return None
+
+def available_dispatchers() -> List[str]:
+    """Get the names of registered dispatchers."""
+    return sorted(_DISPATCHERS)
+
+def is_dispatcher_available(name: str) -> bool:
+    """Check if a dispatcher is registered or can be loaded from an entry point."""
+    return name in _DISPATCHERS or _load_entry_point(name) is not None
+
+def get_dispatcher(name: str) -> Dispatcher:
+    """
+    Create a dispatcher by name.
+
+    Dispatchers registered in this process are used first; otherwise the
+    name is looked up in the elevator_simulator.dispatchers entry point group.
+
+    Args:
+        name: Registered dispatcher name
+
+    Returns:
+        Dispatcher: New dispatcher instance
+
+    Raises:
+        ValueError: If no dispatcher is registered under the name
+    """
+    cls = _DISPATCHERS.get(name) or _load_entry_point(name)
+    if cls is None:
+        raise ValueError(f"Unknown dispatch algorithm: {name}")
+    return cls()
+
+@register_dispatcher("nearest_car")
+class NearestCarDispatcher(Dispatcher):
+    """Prefer idle cars, then cars moving in the call direction, then the nearest."""
+
+    def assign(self, bank: BankView, call: HallCall) -> Optional[str]:
+        positions = bank.get_positions(call.zone)
+
+        best = positions.nearest(call.floor, [(True, d, 'any') for d in Direction])
+        if best is None and call.direction != Direction.NONE:
+            best = positions.nearest(call.floor, [(False, call.direction, 'any')])
+        if best is None:
+            best = positions.nearest(call.floor, [(False, d, 'any') for d in Direction])
+
+        return best[2] if best else None
+
+@register_dispatcher("scan")
+class ScanDispatcher(Dispatcher):
+    """Strongly prefer cars travelling towards the call in its direction."""
+
+    def assign(self, bank: BankView, call: HallCall) -> Optional[str]:
+        positions = bank.get_positions(call.zone)
+        direction = call.direction
+        others = [d for d in Direction if d != direction]
+
+        # Each group's nearest car, with the score bonus or penalty it carries
+        groups = [
+            # Cars below the call in its direction
+            (-100, [(idle, direction, 'below') for idle in (True, False)]),
+            # Other idle cars
+            (0, [(True, d, 'any') for d in others] + [(True, direction, 'not_below')]),
+            # Other cars, including those moving in the opposite direction
+            (50, [(False, d, 'any') for d in others] + [(False, direction, 'not_below')]),
+        ]
+
+        best_key = None
+        best_id = None
+        for bonus, queries in groups:
+            nearest = positions.nearest(call.floor, queries)
+            if nearest is None:
+                continue
+            key = (nearest[0] + bonus, nearest[1])
+            if best_key is None or key < best_key:
+                best_key, best_id = key, nearest[2]
+
+        return best_id
+
+@register_dispatcher("fcfs")
+class FcfsDispatcher(Dispatcher):
+    """Assign every call to the first car in service."""
+
+    def assign(self, bank: BankView, call: HallCall) -> Optional[str]:
+        for car in bank.eligible(call):
+            return car.id
+        return None
+
+@register_dispatcher("eta")
+class EtaDispatcher(Dispatcher):
+    """
+    Assign calls to the car with the lowest weighted estimated cost.
+
+    A car's estimated time of arrival (ETA) at the call floor follows its
+    queued stops: it finishes its current move or door cycle, serves the
+    stops ahead in its travel direction and turns around at the last one
+    if the call is behind it. Every intermediate stop costs a full door
+    cycle. The cost adds the delay a new stop causes to riding passengers
+    and a penalty for full cars, and unanswered calls move to another car
+    when that lowers their cost by more than REASSIGN_MARGIN seconds.
+    """
+
+    # Weight of the waiting time of the caller
+    WAIT_WEIGHT = 1.0
+    # Weight of the extra riding time of passengers already in the car
+    RIDE_WEIGHT = 0.5
+    # Seconds added for a car that is currently full
+    FULL_CAR_PENALTY = 60.0
+    # Seconds a reassignment must save to be worth moving a call
+    REASSIGN_MARGIN = 5.0
+    # Cost standing in for cars that do not stop at a call floor
+    INELIGIBLE_COST = 1e9
+
+    @staticmethod
+    def _stop_time(car: CarState) -> float:
+        """Get the time a car spends opening, holding and closing its doors."""
+        return 2 * car.door_operation_time + car.door_open_time
+
+    @staticmethod
+    def _start_position(car: CarState) -> tuple:
+        """Get the floor a car can next leave from and the time until then."""
+        remaining = car.time_to_next_event or 0.0
+        state = car.state
+
+        if state == ElevatorState.MOVING_UP:
+            return car.current_floor + 1, remaining
+        if state == ElevatorState.MOVING_DOWN:
+            return car.current_floor - 1, remaining
+        if state == ElevatorState.DOORS_OPENING:
+            return car.current_floor, (remaining + car.door_open_time +
+                                       car.door_operation_time)
+        if state == ElevatorState.DOORS_OPEN:
+            return car.current_floor, remaining + car.door_operation_time
+        if state == ElevatorState.DOORS_CLOSING:
+            return car.current_floor, remaining
+        return car.current_floor, 0.0
+
+    def estimate_arrival_time(self, car: CarState, call: HallCall,
+                              stops: List[int] = None) -> float:
+        """
+        Estimate when a car would open its doors at a call floor.
+
+        Args:
+            car: The car to estimate for
+            call: The hall call
+            stops: The car's pending stops, ascending, if already read
+
+        Returns:
+            float: Estimated seconds until the car answers the call
+        """
+        position, time = self._start_position(car)
+        time_per_floor = 1.0 / car.speed
+        stop_time = self._stop_time(car)
+        if stops is None:
+            stops = car.pending_stops
+        floor = call.floor
+
+        def stops_between(low: int, high: int) -> int:
+            """Count queued stops strictly between two floors."""
+            return max(0, bisect.bisect_left(stops, high) - bisect.bisect_right(stops, low))
+
+        direction = car.direction
+        if direction == Direction.NONE or not stops:
+            low, high = min(position, floor), max(position, floor)
+            return time + (high - low) * time_per_floor + stops_between(low, high) * stop_time
+
+        ahead = (floor >= position) if direction == Direction.UP else (floor <= position)
+        if ahead:
+            # Collective cars pass opposite calls while stops remain beyond them
+            beyond = (stops[-1] > floor) if direction == Direction.UP else (stops[0] < floor)
+            if (car.service_policy != "collective" or call.direction == direction or
+                    not beyond):
+                low, high = min(position, floor), max(position, floor)
+                return (time + (high - low) * time_per_floor +
+                        stops_between(low, high) * stop_time)
+
+        # Serve the stops ahead, turn around at the last one, then come back
+        turn = stops[-1] if direction == Direction.UP else stops[0]
+        if direction == Direction.UP:
+            turn = max(turn, position)
+            outbound = stops_between(position, turn) + (1 if turn in stops else 0)
+            inbound = stops_between(min(floor, turn), turn)
+        else:
+            turn = min(turn, position)
+            outbound = stops_between(turn, position) + (1 if turn in stops else 0)
+            inbound = stops_between(turn, max(floor, turn))
+
+        distance = abs(turn - position) + abs(turn - floor)
+        return time + distance * time_per_floor + (outbound + inbound) * stop_time
+
+    def get_cost(self, car: CarState, call: HallCall, stops: List[int] = None) -> float:
+        """
+        Get the weighted cost of letting a car answer a call.
+
+        Args:
+            car: The car to evaluate
+            call: The hall call
+            stops: The car's pending stops, ascending, if already read
+
+        Returns:
+            float: Weighted waiting and riding time in seconds
+        """
+        if stops is None:
+            stops = car.pending_stops
+        cost = self.WAIT_WEIGHT * self.estimate_arrival_time(car, call, stops)
+
+        if not _contains(stops, call.floor):
+            cost += self.RIDE_WEIGHT * car.passenger_count * self._stop_time(car)
+
+        if car.passenger_count >= car.capacity:
+            cost += self.FULL_CAR_PENALTY
+
+        return cost
+
+    def assign(self, bank: BankView, call: HallCall) -> Optional[str]:
+        best_car = None
+        best_cost = float('inf')
+
+        for car in bank.eligible(call):
+            cost = self.get_cost(car, call)
+            if cost < best_cost:
+                best_cost = cost
+                best_car = car
+
+        return best_car.id if best_car else None
+
+    def reassign(self, bank: BankView,
+                 assignments: Dict[HallCall, str]) -> Dict[HallCall, str]:
+        cars = {car.id: car for car in bank}
+        moves = {}
+
+        for call, car_id in assignments.items():
+            current = cars.get(car_id)
+            if current is None or current.current_floor == call.floor:
+                continue  # Already arriving
+
+            # Cost of the current car without the call's own stop
+            current_cost = self.WAIT_WEIGHT * self.estimate_arrival_time(current, call)
+            if current.passenger_count >= current.capacity:
+                current_cost += self.FULL_CAR_PENALTY
+
+            for car in bank.eligible(call):
+                if car is current:
+                    continue
+                cost = self.get_cost(car, call)
+                if cost < current_cost - self.REASSIGN_MARGIN:
+                    current_cost = cost
+                    moves[call] = car.id
+
+        return moves
+
+    def assign_batch(self, bank: BankView, calls: List[HallCall]) -> Dict[HallCall, str]:
+        """
+        Assign a cycle's hall calls jointly at minimum total cost.
+
+        Each car gets one column per call it could take in this cycle; the
+        k-th column adds k door cycles to the car's cost, since the calls
+        before it become stops on the way. The car-by-call cost matrix is
+        solved as a minimum-cost assignment, so two calls are never given
+        to the same car when sharing them out is cheaper overall. Calls
+        of different zones are assigned separately among their own cars.
+        """
+        calls_by_zone: Dict[Optional[str], List[HallCall]] = {}
+        for call in calls:
+            calls_by_zone.setdefault(call.zone, []).append(call)
+
+        assignments = {}
+        for zone_calls in calls_by_zone.values():
+            assignments.update(self._assign_zone_batch(bank, zone_calls))
+        return assignments
+
+    def _assign_zone_batch(self, bank: BankView, calls: List[HallCall]) -> Dict[HallCall, str]:
+        """Jointly assign the calls of one zone among its cars."""
+        cars = bank.zone(calls[0].zone)
+        if not cars:
+            return {}
+
+        slots = -(-len(calls) // len(cars))
+        car_stops = [car.pending_stops for car in cars]
+        costs = [[self.get_cost(car, call, stops) if car.serves(call.floor)
+                  else self.INELIGIBLE_COST
+                  for car, stops in zip(cars, car_stops)] for call in calls]
+        stop_times = [self._stop_time(car) for car in cars]
+
+        if np is not None:
+            base = np.asarray(costs)
+            penalties = np.asarray(stop_times)
+            matrix = np.hstack([base + slot * penalties for slot in range(slots)])
+        else:
+            matrix = [[cost + slot * stop_time
+                       for slot in range(slots)
+                       for cost, stop_time in zip(row, stop_times)]
+                      for row in costs]
+
+        assignments = {}
+        for row, column in solve_assignment(matrix):
+            car = cars[column % len(cars)]
+            if car.serves(calls[row].floor):
+                assignments[calls[row]] = car.id
+        return assignments
+
+class DestinationDispatcher(EtaDispatcher):
+    """
+    Allocate destination calls to cars, grouping riders by destination.
+
+    Passengers enter their destination before boarding, so each one is
+    allocated a car. A car's cost is its ETA cost at the origin plus, when
+    the destination is not already one of the car's stops, the delay a new
+    stop causes everyone riding or allocated to the car. Riders bound for
+    the same floor therefore share cars and cars make fewer stops. Cars
+    that cannot take another rider are skipped while any car has room.
+    """
+
+    def allocate(self, bank: BankView, call: DestinationCall,
+                 allocations: Dict[str, Collection[DestinationCall]]) -> Optional[str]:
+        """
+        Choose the car for a destination call.
+
+        Args:
+            bank: Read-only view of the building's cars
+            call: The passenger's origin and destination
+            allocations: Calls allocated to each car whose riders have not boarded
+
+        Returns:
+            Optional[str]: ID of the chosen car, or None if no car in service
+            stops at both floors
+        """
+        hall_call = call.hall_call
+        best_car = None
+        best_cost = float('inf')
+        best_has_room = False
+
+        for car in bank.eligible(hall_call):
+            if not car.serves(call.destination):
+                continue
+
+            allocated = allocations.get(car.id, ())
+            riders = car.passenger_count + len(allocated)
+            has_room = riders < car.capacity
+            if best_has_room and not has_room:
+                continue
+
+            stops = car.pending_stops
+            cost = self.get_cost(car, hall_call, stops)
+            if (not _contains(stops, call.destination) and
+                    all(other.destination != call.destination for other in allocated)):
+                cost += self.RIDE_WEIGHT * (riders + 1) * self._stop_time(car)
+
+            if (has_room and not best_has_room) or cost < best_cost:
+                best_cost = cost
+                best_car = car
+                best_has_room = has_room
+
+        return best_car.id if best_car else None
@@ -2,10 +2,15 @@
 Elevator controller implementing dispatch algorithms and control logic.
 """
 
-from typing import Dict, List, Optional
+import math
+import time
 import logging
+from typing import Dict, List, Optional, Set
 from models.building import Building
-from models.elevator import Elevator, Direction
+from models.elevator import Direction
+from models.hall_calls import HallCallRegistry
+from .dispatch import (BankView, DestinationCall, DestinationDispatcher, DISPATCH_MODES,
+                       HallCall, get_dispatcher)
 
 class ElevatorController:
     """
@@ -15,82 +20,416 @@ class ElevatorController:
     on abstractions rather than concrete implementations.
     """
     
-    def __init__(self, building: Building, algorithm: str = "nearest_car"):
+    def __init__(self, building: Building, algorithm: str = "nearest_car",
+                 dispatch_mode: str = "conventional", dispatch_cycle: float = 0.0):
         """
         Initialize the elevator controller.
         
         Args:
             building: The building to control
-            algorithm: Dispatch algorithm to use
+            algorithm: Name of a registered dispatcher (see controllers.dispatch)
+            dispatch_mode: 'conventional' (up/down hall calls) or 'destination'
+                (passengers enter their destination before boarding)
+            dispatch_cycle: Seconds between dispatch cycles that assign the
+                collected hall calls jointly; 0 assigns each call immediately
+            
+        Raises:
+            ValueError: If no dispatcher is registered under the algorithm name,
+                the dispatch mode is unknown or the dispatch cycle is negative
         """
+        if dispatch_mode not in DISPATCH_MODES:
+            raise ValueError(f"Unknown dispatch mode: {dispatch_mode}")
+        if dispatch_cycle < 0:
+            raise ValueError(f"Dispatch cycle must not be negative: {dispatch_cycle}")
+        
         self._building = building
         self._algorithm = algorithm
-        self._request_queue = []
+        self._dispatch_mode = dispatch_mode
+        self._dispatcher = get_dispatcher(algorithm)
+        self._destination_dispatcher = DestinationDispatcher()
+        self._bank = BankView(building)
+        
+        # Destination calls allocated to each car, by passenger, until boarding
+        self._allocations: Dict[str, Dict[str, DestinationCall]] = {
+            elevator_id: {} for elevator_id in building.elevators}
+        self._allocated_cars: Dict[str, str] = {}
+        
+        # Passengers delivered and stops made to let them out, per car
+        self._deliveries = {elevator_id: 0 for elevator_id in building.elevators}
+        self._delivery_stops = {elevator_id: 0 for elevator_id in building.elevators}
+        
+        # Unanswered hall calls, one per floor and direction, and their cars
+        self._hall_calls = building.hall_calls
+        
+        # Calls wait in the registry unassigned until the next dispatch cycle
+        self._dispatch_cycle = dispatch_cycle
+        self._next_cycle_time = 0.0
+        self._dispatch_cycles = 0
+        self._dispatch_decisions = 0
+        self._dispatch_time = 0.0
         
-        logging.info(f"Elevator controller initialized with {algorithm} algorithm")
+        # Cars that moved, stopped or took a call since their calls were last reviewed
+        self._changed_cars: Set[str] = set()
+        for elevator in building.elevators.values():
+            elevator.add_door_open_listener(self._on_doors_opened)
+            elevator.add_service_state_listener(self._on_service_state_changed)
+            elevator.add_motion_listener(self._on_car_moved)
+        
+        logging.info(f"Elevator controller initialized with {algorithm} algorithm "
+                    f"({dispatch_mode} dispatch)")
+    
+    @property
+    def dispatch_mode(self) -> str:
+        """Get how passengers call cars ('conventional' or 'destination')."""
+        return self._dispatch_mode
+    
+    @property
+    def dispatch_cycle(self) -> float:
+        """Get the seconds between dispatch cycles (0 if calls are assigned immediately)."""
+        return self._dispatch_cycle
     
-    def request_elevator(self, floor: int, direction: Direction) -> bool:
+    @property
+    def dispatch_time(self) -> float:
+        """Get the wall-clock seconds spent assigning hall calls."""
+        return self._dispatch_time
+    
+    def request_elevator(self, floor: int, direction: Direction,
+                         zone: Optional[str] = None) -> bool:
         """
         Handle an elevator request.
         
+        Repeated presses of a button whose call is already assigned to a
+        car are not dispatched again.
+        
         Args:
             floor: Floor where elevator is requested
             direction: Desired direction
+            zone: Zone whose cars should answer (defaults to the first zone
+                serving the floor)
             
         Returns:
             bool: True if request was handled successfully
         """
-        if self._algorithm == "nearest_car":
-            return self._dispatch_nearest_car(floor, direction)
-        elif self._algorithm == "scan":
-            return self._dispatch_scan(floor, direction)
-        else:
-            return self._dispatch_fcfs(floor, direction)
+        if not 1 <= floor <= self._building.num_floors:
+            logging.warning(f"Invalid floor request: {floor}")
+            return False
+        
+        if zone is None:
+            zone = self._building.zones.default_zone(floor)
+        call = HallCall(floor, direction, zone)
+        if call in self._hall_calls:
+            elevator_id = self._hall_calls.get_car(call)
+            elevator = self._building.get_elevator(elevator_id) if elevator_id else None
+            if elevator is not None and elevator.has_hall_call(floor, direction):
+                logging.debug(f"Hall call floor {floor} {direction.name} already "
+                             f"assigned to elevator {elevator_id}")
+                return True
+            if elevator is None and self._dispatch_cycle > 0:
+                return True  # Already waiting for the next dispatch cycle
+        
+        self._hall_calls.assign(call, None)
+        if self._dispatch_cycle > 0:
+            logging.info(f"Hall call queued for the next dispatch cycle: "
+                        f"floor {floor}, direction {direction.name}")
+            return True
+        
+        return self._assign_call(call)
     
-    def _dispatch_nearest_car(self, floor: int, direction: Direction) -> bool:
-        """Dispatch using nearest available car algorithm."""
-        return self._building.request_elevator(floor, direction)
+    def _assign_call(self, call: HallCall) -> bool:
+        """Assign a registered call to the dispatcher's choice of car."""
+        start = time.perf_counter()
+        elevator_id = self._dispatcher.assign(self._bank, call)
+        self._dispatch_time += time.perf_counter() - start
+        self._dispatch_decisions += 1
+        elevator = self._building.get_elevator(elevator_id) if elevator_id else None
+        
+        if elevator is None:
+            logging.warning(f"No available elevator for floor {call.floor}, "
+                           f"direction {call.direction.name}")
+            return False
+        
+        success = self._give_call(elevator, call)
+        if success:
+            logging.info(f"Hall call assigned to elevator {elevator.id}: "
+                        f"floor {call.floor}, direction {call.direction.name}")
+            self._hall_calls.assign(call, elevator.id)
+            self._reassign_pending_calls(elevator.id, call)
+        return success
     
-    def _dispatch_scan(self, floor: int, direction: Direction) -> bool:
-        """Dispatch using SCAN (elevator) algorithm."""
-        # Find elevator moving in same direction or idle elevator closest to floor
-        elevators = self._building.elevators
-        best_elevator = None
-        best_score = float('inf')
+    def _give_call(self, elevator, call: HallCall) -> bool:
+        """
+        Add an assigned call to its car.
         
-        for elevator in elevators.values():
-            if elevator.state.value in ["maintenance", "emergency"]:
+        A full car standing at the call floor has just left riders behind,
+        so the call is held back until the car has moved on (see
+        _on_doors_opened) instead of reopening its doors for riders who
+        cannot board.
+        
+        Returns:
+            bool: True if the car accepted the call
+        """
+        if (elevator.is_door_open and elevator.current_floor == call.floor and
+                elevator.passenger_count >= elevator.capacity):
+            return elevator.in_service and elevator.serves(call.floor)
+        return elevator.add_hall_call(call.floor, call.direction)
+    
+    def next_dispatch_time(self, now: float) -> Optional[float]:
+        """
+        Get when the next dispatch cycle is due.
+        
+        Cycles run on multiples of the cycle period and only while hall
+        calls are unanswered.
+        
+        Args:
+            now: Current simulation time
+            
+        Returns:
+            Optional[float]: Time of the next cycle after now, or None if none is needed
+        """
+        if self._dispatch_cycle <= 0 or not self._hall_calls:
+            return None
+        return (math.floor(now / self._dispatch_cycle) + 1) * self._dispatch_cycle
+    
+    def update(self, now: float) -> bool:
+        """
+        Run a dispatch cycle if one is due.
+        
+        Args:
+            now: Current simulation time
+            
+        Returns:
+            bool: True if a dispatch cycle ran
+        """
+        if self._dispatch_cycle <= 0 or now < self._next_cycle_time:
+            return False
+        
+        self.run_dispatch_cycle()
+        self._next_cycle_time = (math.floor(now / self._dispatch_cycle) + 1) * self._dispatch_cycle
+        return True
+    
+    def run_dispatch_cycle(self) -> int:
+        """
+        Assign the queued and unanswered hall calls jointly.
+        
+        Assigned calls are withdrawn from their cars unless the car is
+        already at the call floor, and the dispatcher assigns them together
+        with the calls registered since the last cycle.
+        
+        Returns:
+            int: Number of hall calls assigned
+        """
+        start = time.perf_counter()
+        calls = []
+        previous = {}
+        
+        for call, elevator_id in self._hall_calls.items():
+            if elevator_id is not None:
+                elevator = self._building.get_elevator(elevator_id)
+                if elevator.current_floor == call.floor:
+                    continue  # Already arriving
+                elevator.remove_hall_call(call.floor, call.direction)
+                previous[call] = elevator_id
+            calls.append(call)
+        
+        assignments = self._dispatcher.assign_batch(self._bank, calls) if calls else {}
+        self._dispatch_decisions += len(calls)
+        
+        for call in calls:
+            elevator_id = assignments.get(call, previous.get(call))
+            elevator = self._building.get_elevator(elevator_id) if elevator_id else None
+            if elevator is None or not self._give_call(elevator, call):
+                self._hall_calls.assign(call, None)  # Retry next cycle
                 continue
             
-            distance = abs(elevator.current_floor - floor)
+            self._hall_calls.assign(call, elevator.id)
+            if previous.get(call) != elevator.id:
+                logging.info(f"Hall call assigned to elevator {elevator.id}: "
+                            f"floor {call.floor}, direction {call.direction.name}")
+        
+        self._dispatch_cycles += 1
+        self._dispatch_time += time.perf_counter() - start
+        return len(assignments)
+    
+    def request_destination(self, passenger_id: str, origin_floor: int,
+                            destination_floor: int, zone: Optional[str] = None) -> Optional[str]:
+        """
+        Allocate a car to a passenger who entered a destination at a kiosk.
+        
+        The allocated car gets a hall call at the origin floor unless its
+        doors are already open there. The allocation lasts until
+        release_passenger is called when the passenger boards.
+        
+        Args:
+            passenger_id: ID of the waiting passenger
+            origin_floor: Floor where the passenger waits
+            destination_floor: Floor the passenger wants to go to
+            zone: Zone whose cars may be allocated (defaults to any car
+                stopping at both floors)
             
-            # Prefer elevators already moving in the same direction
-            if elevator.direction == direction and elevator.current_floor < floor:
-                score = distance - 100  # Bonus for same direction
-            elif elevator.state.value == "idle":
-                score = distance
-            else:
-                score = distance + 50  # Penalty for opposite direction
+        Returns:
+            Optional[str]: ID of the allocated car, or None if none is available
+        """
+        num_floors = self._building.num_floors
+        if (not 1 <= origin_floor <= num_floors or not 1 <= destination_floor <= num_floors
+                or origin_floor == destination_floor):
+            logging.warning(f"Invalid destination request: {origin_floor} -> {destination_floor}")
+            return None
+        
+        self.release_passenger(passenger_id)
+        call = DestinationCall(origin_floor, destination_floor, zone)
+        allocations = {elevator_id: calls.values()
+                       for elevator_id, calls in self._allocations.items()}
+        elevator_id = self._destination_dispatcher.allocate(self._bank, call, allocations)
+        elevator = self._building.get_elevator(elevator_id) if elevator_id else None
+        
+        if elevator is None:
+            logging.warning(f"No available elevator for passenger {passenger_id}: "
+                           f"floor {origin_floor} -> {destination_floor}")
+            return None
+        
+        if not (elevator.is_door_open and elevator.current_floor == origin_floor):
+            elevator.add_hall_call(origin_floor, call.direction)
+        
+        self._allocations[elevator.id][passenger_id] = call
+        self._allocated_cars[passenger_id] = elevator.id
+        logging.info(f"Passenger {passenger_id} allocated to elevator {elevator.id}: "
+                    f"floor {origin_floor} -> {destination_floor}")
+        return elevator.id
+    
+    def get_allocated_elevator(self, passenger_id: str) -> Optional[str]:
+        """Get the car allocated to a waiting passenger, if any."""
+        return self._allocated_cars.get(passenger_id)
+    
+    def get_allocated_passengers(self, elevator_id: str) -> List[str]:
+        """Get the waiting passengers allocated to a car, in allocation order."""
+        return list(self._allocations.get(elevator_id, ()))
+    
+    def release_passenger(self, passenger_id: str) -> None:
+        """
+        End a passenger's car allocation, e.g. once they have boarded.
+        
+        Args:
+            passenger_id: ID of the passenger
+        """
+        elevator_id = self._allocated_cars.pop(passenger_id, None)
+        if elevator_id is not None:
+            self._allocations[elevator_id].pop(passenger_id, None)
+    
+    def record_delivery_stop(self, elevator_id: str, passengers: int) -> None:
+        """
+        Record a stop at which passengers left a car.
+        
+        Args:
+            elevator_id: ID of the car
+            passengers: Number of passengers who got out
+        """
+        if passengers > 0 and elevator_id in self._deliveries:
+            self._deliveries[elevator_id] += passengers
+            self._delivery_stops[elevator_id] += 1
+    
+    def get_stops_saved(self) -> Dict[str, int]:
+        """
+        Get how many stops each car saved by delivering riders together.
+        
+        A car saves a stop for every passenger beyond the first who gets out
+        at the same stop, compared with stopping once per passenger.
+        
+        Returns:
+            Dict[str, int]: Stops saved keyed by elevator ID
+        """
+        return {elevator_id: self._deliveries[elevator_id] - self._delivery_stops[elevator_id]
+                for elevator_id in self._deliveries}
+    
+    def _reassign_pending_calls(self, elevator_id: str, new_call: HallCall) -> None:
+        """
+        Let the dispatcher move unanswered hall calls to better cars.
+        
+        Only the calls of cars whose state changed since the last review
+        are re-costed, including those of the car that has just taken
+        new_call; the calls of the other cars were reviewed against the
+        same car states before.
+        
+        Args:
+            elevator_id: ID of the car that took the new call
+            new_call: The call just assigned, which is not reviewed
+        """
+        self._changed_cars.add(elevator_id)
+        assignments = {call: car_id for car_id in self._changed_cars
+                       for call in self._hall_calls.get_calls(car_id) if call != new_call}
+        self._changed_cars.clear()
+        if not assignments:
+            return
+        
+        start = time.perf_counter()
+        moves = self._dispatcher.reassign(self._bank, assignments)
+        self._dispatch_time += time.perf_counter() - start
+        
+        for call, new_id in moves.items():
+            old_id = self._hall_calls.get_car(call)
+            new_elevator = self._building.get_elevator(new_id)
+            if old_id is None or old_id == new_id or new_elevator is None:
+                continue
             
-            if score < best_score:
-                best_score = score
-                best_elevator = elevator
+            self._building.get_elevator(old_id).remove_hall_call(call.floor, call.direction)
+            if new_elevator.add_hall_call(call.floor, call.direction):
+                self._hall_calls.assign(call, new_id)
+                self._changed_cars.add(new_id)
+                logging.info(f"Hall call reassigned from elevator {old_id} to {new_id}: "
+                            f"floor {call.floor}, direction {call.direction.name}")
+    
+    def _on_car_moved(self, elevator) -> None:
+        """Mark a car whose calls need a new review after it moved or changed state."""
+        self._changed_cars.add(elevator.id)
+    
+    def _on_doors_opened(self, elevator) -> None:
+        """Forget the calls a car has just answered and recall riders it left behind."""
+        floor = elevator.current_floor
         
-        if best_elevator:
-            return best_elevator.add_hall_call(floor, direction)
+        # Riders left behind by a full car keep their allocation; send the
+        # car back for them once it has moved on
+        for call in self._allocations.get(elevator.id, {}).values():
+            if call.origin != floor and not elevator.has_hall_call(call.origin, call.direction):
+                elevator.add_hall_call(call.origin, call.direction)
+        for call in self._hall_calls.get_calls(elevator.id):
+            if call.floor != floor and not elevator.has_hall_call(call.floor, call.direction):
+                elevator.add_hall_call(call.floor, call.direction)
         
-        return False
+        zone = self._building.zones.get_zone(elevator.id)
+        for direction in (Direction.UP, Direction.DOWN):
+            call = HallCall(floor, direction, zone)
+            if (self._hall_calls.get_car(call) == elevator.id and
+                    not elevator.has_hall_call(floor, direction)):
+                self._hall_calls.release(call)
     
-    def _dispatch_fcfs(self, floor: int, direction: Direction) -> bool:
-        """Dispatch using First Come First Served algorithm."""
-        # Simple FCFS: assign to first available elevator
-        elevators = self._building.elevators
+    def _on_service_state_changed(self, elevator) -> None:
+        """Hand the calls of a car leaving service to other cars."""
+        if elevator.in_service:
+            # Calls no car could take may now go to the returning car
+            if self._dispatch_cycle <= 0:
+                for call in self._hall_calls.get_unassigned():
+                    self._assign_call(call)
+            return
         
-        for elevator in elevators.values():
-            if elevator.state.value not in ["maintenance", "emergency"]:
-                return elevator.add_hall_call(floor, direction)
+        for call in self._hall_calls.get_calls(elevator.id):
+            self._hall_calls.assign(call, None)
+            logging.info(f"Hall call floor {call.floor} {call.direction.name} released "
+                        f"by elevator {elevator.id} going out of service")
+            if self._dispatch_cycle <= 0:
+                self._assign_call(call)
         
-        return False
+        for passenger_id, call in list(self._allocations.get(elevator.id, {}).items()):
+            self.request_destination(passenger_id, call.origin, call.destination, call.zone)
+    
+    @property
+    def hall_calls(self) -> HallCallRegistry:
+        """Get the building's registry of unanswered hall calls."""
+        return self._hall_calls
+    
+    @property
+    def pending_calls(self) -> Dict[HallCall, str]:
+        """Get the unanswered hall calls that are assigned to a car, and their cars."""
+        return {call: elevator_id for call, elevator_id in self._hall_calls.items()
+                if elevator_id is not None}
     
     def get_performance_metrics(self) -> dict:
         """Calculate and return performance metrics."""
@@ -115,5 +454,10 @@ class ElevatorController:
             'active_elevators': active_elevators,
             'idle_elevators': idle_elevators,
             'pending_requests': total_requests,
-            'estimated_energy': total_energy
+            'estimated_energy': total_energy,
+            'stops_saved': sum(self.get_stops_saved().values()),
+            'hall_calls': len(self._hall_calls),
+            'dispatch_decisions': self._dispatch_decisions,
+            'dispatch_cycles': self._dispatch_cycles,
+            'dispatch_time': self._dispatch_time
         }
\ No newline at end of file
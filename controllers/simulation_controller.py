@@ -4,11 +4,15 @@ Simulation controller managing the overall simulation lifecycle.
 
 import time
 import threading
-from typing import Optional, Callable, List
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Callable, List
 import logging
 from models.building import Building
-from models.passenger import Passenger
+from models.passenger import PassengerState
+from models.passenger_store import PassengerStore, PassengerView, JourneyLog
 from models.elevator import Direction
+from models.zones import Leg
+from models.clock import SimulationClock, RealTimeClock
 from .elevator_controller import ElevatorController
 from simulation.logger import SimulationLogger
 
@@ -20,17 +24,28 @@ class SimulationController:
     the Single Responsibility Principle.
     """
     
-    def __init__(self, building: Building, logger: SimulationLogger):
+    def __init__(self, building: Building, logger: SimulationLogger,
+                 clock: SimulationClock = None, algorithm: str = "nearest_car",
+                 dispatch_mode: str = "conventional", dispatch_cycle: float = 0.0):
         """
         Initialize the simulation controller.
         
         Args:
             building: The building to simulate
             logger: Logger for simulation data
+            clock: Clock providing simulation time (defaults to real time)
+            algorithm: Hall call dispatch algorithm
+            dispatch_mode: 'conventional' (up/down hall calls) or 'destination'
+                (destination entry, riders board only their allocated car)
+            dispatch_cycle: Seconds between joint hall call assignments
+                (0 assigns each call when it is made)
         """
         self._building = building
         self._logger = logger
-        self._elevator_controller = ElevatorController(building)
+        self._clock = clock or RealTimeClock()
+        self._elevator_controller = ElevatorController(building, algorithm, dispatch_mode,
+                                                       dispatch_cycle)
+        self._destination_dispatch = dispatch_mode == "destination"
         
         self._is_running = False
         self._is_paused = False
@@ -41,12 +56,57 @@ class SimulationController:
         # Callbacks for UI updates
         self._update_callbacks: List[Callable] = []
         
-        # Passengers
-        self._passengers = {}
-        self._passenger_counter = 0
+        # Waiting and riding passengers; completed journeys are streamed
+        # to the logger and kept in the store's journey log
+        self._passengers = PassengerStore(self._clock)
+        self._passengers.add_journey_listener(self._logger.log_passenger_journey)
+        
+        # Remaining rides of passengers in zoned buildings, current ride first
+        self._zoned = building.zones.is_zoned
+        self._routes: Dict[str, List[Leg]] = {}
+        self._transfers = 0
+        
+        # Exchange passengers only when a car's doors have just opened
+        for elevator in building.elevators.values():
+            elevator.add_door_open_listener(self._on_doors_opened)
         
         logging.info("Simulation controller initialized")
     
+    @property
+    def clock(self) -> SimulationClock:
+        """Get the clock providing simulation time."""
+        return self._clock
+    
+    @property
+    def passengers(self) -> Mapping[str, PassengerView]:
+        """Get a read-only mapping of the waiting and riding passengers by ID."""
+        return MappingProxyType(self._passengers)
+    
+    @property
+    def journeys(self) -> JourneyLog:
+        """Get the log of completed passenger journeys."""
+        return self._passengers.journeys
+    
+    @property
+    def elevator_controller(self) -> ElevatorController:
+        """Get the controller dispatching calls to elevators."""
+        return self._elevator_controller
+    
+    @property
+    def transfers(self) -> int:
+        """Get the number of times passengers changed cars between zones."""
+        return self._transfers
+    
+    def set_clock(self, clock: SimulationClock) -> None:
+        """
+        Set the clock providing simulation time.
+        
+        Args:
+            clock: Clock shared with the building and logger
+        """
+        self._clock = clock
+        self._passengers.set_clock(clock)
+    
     def add_update_callback(self, callback: Callable) -> None:
         """Add a callback function to be called on each simulation update."""
         self._update_callbacks.append(callback)
@@ -101,39 +161,75 @@ class SimulationController:
         self._simulation_speed = max(0.1, min(10.0, speed))
         logging.info(f"Simulation speed set to {self._simulation_speed}x")
     
-    def add_passenger(self, origin_floor: int, destination_floor: int) -> str:
+    def add_passenger(self, origin_floor: int, destination_floor: int,
+                      arrival_time: float = None) -> str:
         """
         Add a new passenger to the simulation.
         
         Args:
             origin_floor: Starting floor
             destination_floor: Target floor
+            arrival_time: When the passenger arrived (defaults to current time)
             
         Returns:
             str: Passenger ID
         """
-        self._passenger_counter += 1
-        passenger_id = f"P{self._passenger_counter:04d}"
+        passenger_id = self._passengers.add(origin_floor, destination_floor, arrival_time)
         
-        passenger = Passenger(passenger_id, origin_floor, destination_floor)
-        self._passengers[passenger_id] = passenger
+        logging.info(f"Added passenger {passenger_id}: "
+                    f"floor {origin_floor} -> {destination_floor}")
+        self._log_passenger_event(self._passengers[passenger_id], 'arrival', origin_floor)
+        
+        route = self._building.zones.route(origin_floor, destination_floor)
+        if route is None:
+            logging.warning(f"No cars connect floor {origin_floor} to floor "
+                           f"{destination_floor} for passenger {passenger_id}")
+            return passenger_id
+        
+        if self._zoned:
+            self._routes[passenger_id] = route
+        self._request_ride(passenger_id, route[0], arrival_time)
+        return passenger_id
+    
+    def _request_ride(self, passenger_id: str, leg: Leg, timestamp: float = None) -> None:
+        """Queue a passenger for one ride and call a car, boarding one already open here."""
+        going_up = leg.destination > leg.origin
         
         # Add passenger to floor waiting queue
-        floor = self._building.get_floor(origin_floor)
+        floor = self._building.get_floor(leg.origin)
         if floor:
-            floor.add_waiting_passenger(passenger_id, passenger.wants_to_go_up)
+            floor.add_waiting_passenger(passenger_id, going_up, leg.destination)
         
-        # Request elevator
-        direction = Direction.UP if passenger.wants_to_go_up else Direction.DOWN
-        self._elevator_controller.request_elevator(
-            origin_floor, 
-            direction
-        )
+        if self._destination_dispatch:
+            # Allocate a car now and board it if it is already waiting here
+            self._logger.log_button_press('destination_entry', f"floor_{leg.origin}",
+                                          str(leg.destination), timestamp)
+            elevator_id = self._elevator_controller.request_destination(
+                passenger_id, leg.origin, leg.destination, leg.zone)
+            elevator = self._building.get_elevator(elevator_id) if elevator_id else None
+            if elevator and elevator.is_door_open and elevator.current_floor == leg.origin:
+                self._handle_passengers_boarding(elevator, leg.origin, timestamp)
+            return
         
-        logging.info(f"Added passenger {passenger_id}: "
-                    f"floor {origin_floor} -> {destination_floor}")
+        # Board a car whose doors are already open at the origin floor
+        passenger = self._passengers[passenger_id]
+        for elevator in self._building.get_open_elevators(leg.origin):
+            self._handle_passengers_boarding(elevator, leg.origin, timestamp)
+            if passenger.state == PassengerState.IN_ELEVATOR:
+                return
         
-        return passenger_id
+        # Request elevator
+        direction = Direction.UP if going_up else Direction.DOWN
+        self._logger.log_button_press('hall_call', f"floor_{leg.origin}",
+                                      direction.name.lower(), timestamp)
+        self._elevator_controller.request_elevator(leg.origin, direction, leg.zone)
+    
+    def _current_leg(self, passenger) -> Leg:
+        """Get the ride a passenger is waiting for or taking."""
+        route = self._routes.get(passenger.id)
+        if route:
+            return route[0]
+        return Leg(passenger.origin_floor, passenger.destination_floor, None)
     
     def press_elevator_button(self, elevator_id: str, floor: int) -> bool:
         """
@@ -151,6 +247,7 @@ class SimulationController:
             success = elevator.add_floor_request(floor)
             if success:
                 logging.info(f"Elevator {elevator_id} button pressed: floor {floor}")
+                self._logger.log_button_press('elevator_floor', elevator_id, str(floor))
             return success
         return False
     
@@ -172,6 +269,7 @@ class SimulationController:
         
         if success:
             logging.info(f"Hall button pressed: floor {floor}, direction {direction}")
+            self._logger.log_button_press('hall_call', f"floor_{floor}", dir_enum.name.lower())
         
         return success
     
@@ -183,85 +281,205 @@ class SimulationController:
             'simulation_speed': self._simulation_speed,
             'building_status': self._building.get_building_status(),
             'controller_metrics': self._elevator_controller.get_performance_metrics(),
-            'passenger_count': len(self._passengers),
-            'active_passengers': len([p for p in self._passengers.values() 
-                                    if p.state.value != 'arrived'])
+            'passenger_count': self._passengers.total_count,
+            'active_passengers': self._passengers.active_count,
+            'transfers': self._transfers
         }
     
-    def _handle_passenger_movement(self) -> None:
-        """Handle passenger boarding and exiting when elevators arrive at floors."""
-        building_status = self._building.get_building_status()
+    def service_floor(self, elevator, timestamp: float = None) -> None:
+        """
+        Let passengers exit and board an elevator whose doors are open.
         
-        for elevator_id, elevator_status in building_status['elevators'].items():
-            elevator = self._building.get_elevator(elevator_id)
-            if not elevator:
-                continue
-            
-            current_floor = elevator_status['current_floor']
-            state = elevator_status['state']
-            
-            # Only handle passenger movement when doors are open
-            if state == 'doors_open':
-                # Handle passengers exiting (arriving at destination)
-                self._handle_passengers_exiting(elevator, current_floor)
-                
-                # Handle passengers boarding (waiting at current floor)
-                self._handle_passengers_boarding(elevator, current_floor)
+        Args:
+            elevator: Elevator with open doors
+            timestamp: Time of the exchange (defaults to current time)
+        """
+        floor_num = elevator.current_floor
+        self._handle_passengers_exiting(elevator, floor_num, timestamp)
+        self._handle_passengers_boarding(elevator, floor_num, timestamp)
     
-    def _handle_passengers_exiting(self, elevator, floor_num: int) -> None:
-        """Handle passengers exiting the elevator at their destination."""
-        elevator_status = elevator.get_status_dict()
+    def _on_doors_opened(self, elevator) -> None:
+        """Exchange passengers when an elevator's doors finish opening."""
+        self.service_floor(elevator)
+    
+    def _handle_passengers_exiting(self, elevator, floor_num: int,
+                                   timestamp: float = None) -> None:
+        """Handle passengers exiting the elevator at their destination or a transfer floor."""
         passengers_to_remove = []
+        transferring = []
         
-        for passenger_id in elevator_status['passengers']:
-            if passenger_id in self._passengers:
-                passenger = self._passengers[passenger_id]
+        for passenger_id in sorted(elevator.get_passengers()):
+            passenger = self._passengers.get(passenger_id)
+            if passenger:
                 if passenger.destination_floor == floor_num:
-                    # Passenger has reached destination
-                    passenger.arrive_at_destination()
+                    # Passenger has reached destination; the store frees
+                    # the passenger's slot on arrival, so log first
+                    self._log_passenger_event(passenger, 'departure', floor_num, elevator.id)
+                    passenger.arrive_at_destination(timestamp)
+                    self._routes.pop(passenger_id, None)
                     passengers_to_remove.append(passenger_id)
                     logging.info(f"Passenger {passenger_id} arrived at floor {floor_num}")
+                elif self._current_leg(passenger).destination == floor_num:
+                    # Passenger changes to a car of the next zone
+                    self._log_passenger_event(passenger, 'transfer', floor_num, elevator.id)
+                    passenger.start_transfer()
+                    passengers_to_remove.append(passenger_id)
+                    transferring.append(passenger_id)
+                    logging.info(f"Passenger {passenger_id} transferring at floor {floor_num}")
         
         # Remove passengers from elevator
         for passenger_id in passengers_to_remove:
             elevator.remove_passenger(passenger_id)
+        
+        self._elevator_controller.record_delivery_stop(elevator.id, len(passengers_to_remove))
+        
+        for passenger_id in transferring:
+            route = self._routes[passenger_id]
+            route.pop(0)
+            self._transfers += 1
+            self._request_ride(passenger_id, route[0], timestamp)
     
-    def _handle_passengers_boarding(self, elevator, floor_num: int) -> None:
+    def _handle_passengers_boarding(self, elevator, floor_num: int,
+                                    timestamp: float = None) -> None:
         """Handle passengers boarding the elevator from the current floor."""
         floor = self._building.get_floor(floor_num)
         if not floor:
             return
         
-        floor_status = floor.get_status_dict()
-        elevator_status = elevator.get_status_dict()
-        
-        # Check if elevator has capacity
-        if elevator_status['passenger_count'] >= elevator_status['capacity']:
+        if self._destination_dispatch:
+            self._board_allocated_passengers(elevator, floor, timestamp)
             return
         
+        # Passengers of zoned buildings only board cars serving their next stop
+        board = self._board_zoned_passengers if self._zoned else self._board_waiting_passengers
+        
         # Determine which direction passengers want to go
-        direction = elevator_status['direction']
-        if direction == 'UP' or direction == 'NONE':
-            # Board passengers going up
-            for passenger_id in list(floor_status['waiting_up']):
-                if elevator_status['passenger_count'] < elevator_status['capacity']:
-                    passenger = self._passengers.get(passenger_id)
-                    if passenger and passenger.state.value == 'waiting':
-                        if elevator.add_passenger(passenger_id, passenger.destination_floor):
-                            floor.remove_waiting_passenger(passenger_id)
-                            passenger.board_elevator(elevator.id)
-                            logging.info(f"Passenger {passenger_id} boarded elevator {elevator.id}")
-        
-        if direction == 'DOWN' or direction == 'NONE':
-            # Board passengers going down
-            for passenger_id in list(floor_status['waiting_down']):
-                if elevator_status['passenger_count'] < elevator_status['capacity']:
-                    passenger = self._passengers.get(passenger_id)
-                    if passenger and passenger.state.value == 'waiting':
-                        if elevator.add_passenger(passenger_id, passenger.destination_floor):
-                            floor.remove_waiting_passenger(passenger_id)
-                            passenger.board_elevator(elevator.id)
-                            logging.info(f"Passenger {passenger_id} boarded elevator {elevator.id}")
+        direction = elevator.direction
+        for going_up, call_direction in ((True, Direction.UP), (False, Direction.DOWN)):
+            if direction != call_direction and direction != Direction.NONE:
+                continue
+            
+            board(elevator, floor, going_up, timestamp)
+            
+            # The car answered the hall call; call another for the riders
+            # it had no room for
+            if (elevator.passenger_count >= elevator.capacity and
+                    self._has_riders_for(elevator, floor, going_up)):
+                self._elevator_controller.request_elevator(
+                    floor.number, call_direction, self._building.zones.get_zone(elevator.id))
+    
+    def _has_riders_for(self, elevator, floor, going_up: bool) -> bool:
+        """Check if passengers the elevator could take still wait in a direction."""
+        if not self._zoned:
+            return floor.next_waiting_passenger(going_up) is not None
+        
+        return any((destination > floor.number) == going_up and elevator.serves(destination)
+                   for destination in floor.get_waiting_destinations())
+    
+    def _board_waiting_passengers(self, elevator, floor, going_up: bool,
+                                  timestamp: float = None) -> None:
+        """Board passengers from the front of a floor queue until the elevator is full."""
+        skipped = 0
+        while elevator.passenger_count < elevator.capacity:
+            passenger_id = floor.next_waiting_passenger(going_up, skipped)
+            if passenger_id is None:
+                return
+            
+            passenger = self._passengers.get(passenger_id)
+            if passenger is None:
+                floor.remove_waiting_passenger(passenger_id)
+                continue
+            
+            if not elevator.add_passenger(passenger_id, passenger.destination_floor):
+                skipped += 1  # Leave them queued for another car
+                continue
+            
+            self._complete_boarding(elevator, floor, passenger, timestamp,
+                                    passenger.destination_floor)
+    
+    def _board_zoned_passengers(self, elevator, floor, going_up: bool,
+                                timestamp: float = None) -> None:
+        """Board passengers bound for floors the elevator serves, in arrival order."""
+        destinations = [destination for destination in floor.get_waiting_destinations()
+                        if (destination > floor.number) == going_up and
+                        elevator.serves(destination)]
+        
+        while elevator.passenger_count < elevator.capacity:
+            waiting = floor.get_waiting_passengers_to_floors(
+                destinations, elevator.capacity - elevator.passenger_count)
+            if not waiting:
+                return
+            
+            for passenger_id in waiting:
+                passenger = self._passengers.get(passenger_id)
+                if passenger is None:
+                    floor.remove_waiting_passenger(passenger_id)
+                    continue
+                
+                destination = self._current_leg(passenger).destination
+                if not elevator.add_passenger(passenger_id, destination):
+                    return
+                
+                self._complete_boarding(elevator, floor, passenger, timestamp, destination)
+    
+    def _complete_boarding(self, elevator, floor, passenger, timestamp: float = None,
+                           destination: int = None) -> None:
+        """
+        Record a passenger who has been added to an elevator.
+        
+        Args:
+            elevator: The elevator boarded
+            floor: Floor the passenger boarded from
+            passenger: The boarding passenger
+            timestamp: Time of boarding (defaults to current time)
+            destination: Floor button pressed in the car, if the passenger
+                did not enter it at a destination kiosk
+        """
+        floor.remove_waiting_passenger(passenger.id)
+        passenger.board_elevator(elevator.id, timestamp)
+        logging.info(f"Passenger {passenger.id} boarded elevator {elevator.id}")
+        
+        self._log_passenger_event(passenger, 'boarding', floor.number, elevator.id)
+        if destination is not None:
+            self._logger.log_button_press('elevator_floor', elevator.id, str(destination),
+                                          timestamp)
+    
+    def _log_passenger_event(self, passenger, event_type: str, floor: int,
+                             elevator_id: str = None) -> None:
+        """Write a passenger event to the passenger events log while logging."""
+        if self._logger.is_logging:
+            self._logger.log_passenger_event(passenger.id, event_type, {
+                'floor': floor,
+                'elevator_id': elevator_id,
+                'origin_floor': passenger.origin_floor,
+                'destination_floor': passenger.destination_floor
+            })
+    
+    def _board_allocated_passengers(self, elevator, floor, timestamp: float = None) -> None:
+        """Board the passengers allocated to an elevator and reallocate any left behind."""
+        controller = self._elevator_controller
+        left_behind = []
+        
+        for passenger_id in controller.get_allocated_passengers(elevator.id):
+            passenger = self._passengers.get(passenger_id)
+            if passenger is None:
+                controller.release_passenger(passenger_id)
+                continue
+            leg = self._current_leg(passenger)
+            if leg.origin != floor.number:
+                continue
+            
+            if (elevator.passenger_count >= elevator.capacity or
+                    not elevator.add_passenger(passenger_id, leg.destination)):
+                left_behind.append((passenger_id, leg))
+                continue
+            
+            controller.release_passenger(passenger_id)
+            self._complete_boarding(elevator, floor, passenger, timestamp)
+        
+        # The car is full; send another one
+        for passenger_id, leg in left_behind:
+            controller.request_destination(passenger_id, leg.origin, leg.destination, leg.zone)
     
     def _simulation_loop(self) -> None:
         """Main simulation loop running in separate thread."""
@@ -269,12 +487,14 @@ class SimulationController:
             if not self._is_paused:
                 current_time = time.time()
                 delta_time = (current_time - self._last_update_time) * self._simulation_speed
+                self._clock.advance(delta_time)
                 
-                # Update building (elevators)
-                self._building.update(delta_time)
+                # Assign collected hall calls if a dispatch cycle is due
+                self._elevator_controller.update(self._clock.now())
                 
-                # Handle passenger boarding and exiting
-                self._handle_passenger_movement()
+                # Update building (elevators); passengers board and exit
+                # through the door open listeners
+                self._building.update(delta_time)
                 
                 # Log simulation state
                 self._logger.log_simulation_state(self.get_simulation_status())
@@ -226,7 +226,9 @@ class MainWindow:
         self.building = Building(
             building_data['id'],
             building_data['num_floors'],
-            elevators_data
+            elevators_data,
+            vectorized=building_data.get('vectorized', False),
+            parking=building_data.get('parking', 'initial')
         )
         
         # Create simulator
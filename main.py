@@ -1,22 +1,173 @@
 import sys
-import tkinter as tk
+import argparse
 from pathlib import Path
 import logging
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from gui.main_window import MainWindow
 from simulation.logger import setup_logging
 
-def main():
-    """Main entry point for the elevator simulation tool."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="elevator-simulator",
+        description="Elevator control system simulator. "
+                    "Starts the GUI when no command is given."
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("gui", help="Start the graphical user interface")
+
+    run_parser = subparsers.add_parser(
+        "run", help="Run a simulation headlessly as fast as possible")
+    run_parser.add_argument("--building", required=True,
+                            help="Building configuration CSV file")
+    run_parser.add_argument("--sim", default=None,
+                            help="Simulation configuration CSV file")
+    run_parser.add_argument("--duration", type=float, default=None,
+                            help="Simulated duration in seconds "
+                                 "(defaults to the configured duration)")
+    run_parser.add_argument("--seed", type=int, default=None,
+                            help="Seed for random passenger generation")
+    run_parser.add_argument("--output-dir", default="simulation_output",
+                            help="Directory for CSV and JSON output files")
+    run_parser.add_argument("--vectorized", action="store_true",
+                            help="Advance the cars together in a NumPy elevator bank "
+                                 "(requires NumPy)")
+    run_parser.add_argument("--log-level", default="WARNING",
+                            choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                            help="Application log level")
+
+    replicate_parser = subparsers.add_parser(
+        "replicate", help="Run seeded replications in parallel and report KPIs")
+    replicate_parser.add_argument("--building", required=True,
+                                  help="Building configuration CSV file")
+    replicate_parser.add_argument("--sim", default=None,
+                                  help="Simulation configuration CSV file")
+    replicate_parser.add_argument("--duration", type=float, default=None,
+                                  help="Simulated duration per replication in seconds")
+    replicate_parser.add_argument("--replications", type=int, default=10,
+                                  help="Number of replications")
+    replicate_parser.add_argument("--seed", type=int, default=0,
+                                  help="Seed of the first replication")
+    replicate_parser.add_argument("--workers", type=int, default=None,
+                                  help="Worker processes (defaults to CPU count)")
+    replicate_parser.add_argument("--output", default=None,
+                                  help="Write per-run KPIs and summary to this JSON file")
+    replicate_parser.add_argument("--log-level", default="WARNING",
+                                  choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                                  help="Application log level")
+
+    sweep_parser = subparsers.add_parser(
+        "sweep", help="Run every combination of a parameter grid in parallel")
+    sweep_parser.add_argument("--building", required=True,
+                              help="Base building configuration CSV file")
+    sweep_parser.add_argument("--sim", default=None,
+                              help="Simulation configuration CSV file")
+    sweep_parser.add_argument("--grid", required=True,
+                              help="JSON file mapping parameter names to lists of values")
+    sweep_parser.add_argument("--output", default="sweep_results.csv",
+                              help="Consolidated results CSV (existing cells are skipped)")
+    sweep_parser.add_argument("--duration", type=float, default=None,
+                              help="Simulated duration per run in seconds")
+    sweep_parser.add_argument("--replications", type=int, default=1,
+                              help="Seeded runs per grid cell")
+    sweep_parser.add_argument("--seed", type=int, default=0,
+                              help="Seed of the first replication of every cell")
+    sweep_parser.add_argument("--workers", type=int, default=None,
+                              help="Worker processes (defaults to CPU count)")
+    sweep_parser.add_argument("--log-level", default="WARNING",
+                              choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                              help="Application log level")
+
+    return parser
+
+def run_parameter_sweep(args: argparse.Namespace) -> int:
+    """Run a parameter sweep from command line arguments."""
+    import json
+    from simulation.sweep import run_sweep
+
+    setup_logging(getattr(logging, args.log_level))
+
+    try:
+        with open(args.grid, 'r') as f:
+            grid = json.load(f)
+
+        result = run_sweep(args.building, grid, args.output, args.sim,
+                           args.duration, args.replications, args.seed,
+                           args.workers)
+    except (OSError, ValueError) as e:
+        logging.error(f"Sweep failed: {e}")
+        return 1
+
+    print(f"Sweep: {result['total_cells']} cells, {result['skipped_cells']} resumed, "
+          f"{result['completed_cells']} run in {result['wall_time']:.2f}s")
+    print(f"Results written to {result['output_file']}")
+    return 0
+
+def run_replicate(args: argparse.Namespace) -> int:
+    """Run parallel replications from command line arguments."""
+    import json
+    from simulation.replication import run_replications
+
+    setup_logging(getattr(logging, args.log_level))
+
+    try:
+        results = run_replications(args.building, args.sim, args.replications,
+                                   args.duration, args.seed, args.workers)
+    except (OSError, ValueError) as e:
+        logging.error(f"Replication run failed: {e}")
+        return 1
+
+    print(f"{args.replications} replications of {results['duration']:.0f}s "
+          f"in {results['wall_time']:.2f}s")
+    for kpi, stats in results['summary'].items():
+        if stats['mean'] is None:
+            print(f"  {kpi:20s} n/a")
+        elif stats['half_width'] is None:
+            print(f"  {kpi:20s} {stats['mean']:10.2f}")
+        else:
+            print(f"  {kpi:20s} {stats['mean']:10.2f} +/- {stats['half_width']:.2f} (95% CI)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    return 0
+
+def run_headless(args: argparse.Namespace) -> int:
+    """Run a batch simulation from command line arguments."""
+    from simulation.batch import run_batch
+
+    setup_logging(getattr(logging, args.log_level))
+
+    try:
+        summary = run_batch(args.building, args.sim, args.duration,
+                            args.seed, args.output_dir, args.vectorized)
+    except (OSError, ValueError, ImportError) as e:
+        logging.error(f"Batch run failed: {e}")
+        return 1
+
+    print(f"Simulated {summary['simulated_time']:.0f}s in "
+          f"{summary['wall_time']:.2f}s ({summary['events_processed']} events)")
+    print(f"Passengers: {summary['total_passengers']} total, "
+          f"{summary['active_passengers']} still active")
+    print(f"Output written to {summary['output_dir']}")
+    return 0
+
+def run_gui() -> int:
+    """Start the Tkinter GUI application."""
+    import tkinter as tk
+    from gui.main_window import MainWindow
+
     setup_logging()
     logging.info("Starting Elevator Simulation Tool")
-    
+
     root = tk.Tk()
     app = MainWindow(root)
-    
+
     try:
         root.mainloop()
     except KeyboardInterrupt:
@@ -26,5 +177,20 @@ def main():
     finally:
         logging.info("Elevator Simulation Tool shutting down")
 
+    return 0
+
+def main(argv=None) -> int:
+    """Main entry point for the elevator simulation tool."""
+    args = _build_parser().parse_args(argv)
+
+    if args.command == "run":
+        return run_headless(args)
+    if args.command == "replicate":
+        return run_replicate(args)
+    if args.command == "sweep":
+        return run_parameter_sweep(args)
+
+    return run_gui()
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
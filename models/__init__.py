@@ -3,12 +3,22 @@ Models package for elevator simulation.
 """
 
 from .elevator import Elevator, ElevatorState, Direction
+from .hall_calls import HallCall, HallCallRegistry
+from .car_index import CarPositionIndex
+from .zones import ZoneMap, Leg, parse_floor_set, format_floor_set
 from .building import Building
 from .floor import Floor
 from .passenger import Passenger, PassengerState
+from .passenger_store import PassengerStore, PassengerView, JourneyLog
+from .clock import SimulationClock, RealTimeClock, VirtualClock
+from .elevator_bank import ElevatorBank, BankElevator
 
 __all__ = [
     'Elevator', 'ElevatorState', 'Direction',
+    'HallCall', 'HallCallRegistry', 'CarPositionIndex',
+    'ZoneMap', 'Leg', 'parse_floor_set', 'format_floor_set',
     'Building', 'Floor', 
-    'Passenger', 'PassengerState'
+    'Passenger', 'PassengerState', 'PassengerStore', 'PassengerView', 'JourneyLog',
+    'SimulationClock', 'RealTimeClock', 'VirtualClock',
+    'ElevatorBank', 'BankElevator'
 ]
\ No newline at end of file
@@ -2,10 +2,19 @@
 Building model that manages multiple elevators and floors.
 """
 
-from typing import List, Dict, Optional
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional
 import logging
 from .elevator import Elevator, Direction
 from .floor import Floor
+from .hall_calls import HallCall, HallCallRegistry
+from .clock import SimulationClock, RealTimeClock
+from .elevator_bank import ElevatorBank
+from .car_index import CarPositionIndex
+from .zones import ZoneMap
+
+# Where cars are parked when the building is created
+PARKING_POLICIES = ('initial', 'lobby', 'spread')
 
 class Building:
     """
@@ -16,7 +25,8 @@ class Building:
     """
     
     def __init__(self, building_id: str, num_floors: int, 
-                 elevators_config: List[dict]):
+                 elevators_config: List[dict], clock: SimulationClock = None,
+                 vectorized: bool = False, parking: str = 'initial'):
         """
         Initialize a building instance.
         
@@ -24,14 +34,65 @@ class Building:
             building_id: Unique identifier for this building
             num_floors: Total number of floors
             elevators_config: List of elevator configuration dictionaries
+            clock: Clock shared by all elevators (defaults to real time)
+            vectorized: Store elevators in a NumPy ElevatorBank and advance
+                them with array operations (requires NumPy)
+            parking: Where cars start (see PARKING_POLICIES): 'initial' at
+                each car's configured initial_floor, 'lobby' at the lowest
+                floor of its zone, 'spread' evenly over the floors of its zone
+            
+        Raises:
+            ValueError: If the parking policy is unknown
         """
+        if parking not in PARKING_POLICIES:
+            raise ValueError(f"Unknown parking policy: {parking}")
+        
         self._id = building_id
+        self._clock = clock or RealTimeClock()
         self._num_floors = num_floors
         self._floors = {}
         self._elevators = {}
+        self._bank: Optional[ElevatorBank] = None
+        self._hall_calls = HallCallRegistry()
+        
+        # Cars serving the same floors form a zone
+        self._zones = ZoneMap(num_floors, [
+            (config.get('id', f'elevator_{i}'),
+             config.get('served_floors') or range(1, num_floors + 1))
+            for i, config in enumerate(elevators_config)])
+        elevators_config = self._park_cars(elevators_config, parking)
         
         self._initialize_floors()
-        self._initialize_elevators(elevators_config)
+        if vectorized:
+            self._initialize_elevator_bank(elevators_config)
+        else:
+            self._initialize_elevators(elevators_config)
+        
+        # Positions of in-service cars, overall and per zone, kept current
+        # by the cars' listeners
+        self._car_positions = CarPositionIndex(self._elevators.values())
+        self._zone_positions: Dict[str, CarPositionIndex] = {}
+        if self._zones.is_zoned:
+            for zone in self._zones.zones:
+                self._zone_positions[zone] = CarPositionIndex(
+                    self._elevators[elevator_id] for elevator_id in self._zones.get_cars(zone))
+        
+        # Cars whose doors are open, by floor
+        self._car_order = {elevator_id: i for i, elevator_id in enumerate(self._elevators)}
+        self._open_cars: Dict[int, Dict[str, None]] = {}
+        self._open_floor_of: Dict[str, int] = {}
+        
+        for elevator in self._elevators.values():
+            indexes = [self._car_positions]
+            zone = self._zones.get_zone(elevator.id)
+            if zone is not None:
+                indexes.append(self._zone_positions[zone])
+            for index in indexes:
+                elevator.add_motion_listener(index.update)
+                elevator.add_service_state_listener(index.update)
+            elevator.add_motion_listener(self._update_open_cars)
+            elevator.add_service_state_listener(self._update_open_cars)
+            self._update_open_cars(elevator)
         
         logging.info(f"Building {self._id} initialized with "
                     f"{len(self._elevators)} elevators and "
@@ -42,6 +103,23 @@ class Building:
         for floor_num in range(1, self._num_floors + 1):
             self._floors[floor_num] = Floor(floor_num)
     
+    def _park_cars(self, elevators_config: List[dict], parking: str) -> List[dict]:
+        """Set each car's initial_floor according to the parking policy."""
+        if parking == 'initial':
+            return elevators_config
+        
+        floors = {}
+        for zone in self._zones.zones:
+            if parking == 'lobby':
+                lobby = min(self._zones.get_floors(zone))
+                zone_floors = [lobby] * len(self._zones.get_cars(zone))
+            else:
+                zone_floors = self._zones.spread_floors(zone)
+            floors.update(zip(self._zones.get_cars(zone), zone_floors))
+        
+        return [dict(config, initial_floor=floors[config.get('id', f'elevator_{i}')])
+                for i, config in enumerate(elevators_config)]
+    
     def _initialize_elevators(self, elevators_config: List[dict]) -> None:
         """Initialize elevators from configuration."""
         for config in elevators_config:
@@ -49,10 +127,24 @@ class Building:
             capacity = config.get('capacity', 8)
             floors_range = (1, self._num_floors)
             speed = config.get('speed', 2.0)
+            door_open_time = config.get('door_open_time', 3.0)
+            door_operation_time = config.get('door_operation_time', 2.0)
+            service_policy = config.get('service_policy', 'nearest')
+            served_floors = config.get('served_floors')
+            initial_floor = config.get('initial_floor')
             
-            elevator = Elevator(elevator_id, capacity, floors_range, speed)
+            elevator = Elevator(elevator_id, capacity, floors_range, speed,
+                                self._clock, door_open_time, door_operation_time,
+                                service_policy, served_floors, initial_floor)
             self._elevators[elevator_id] = elevator
     
+    def _initialize_elevator_bank(self, elevators_config: List[dict]) -> None:
+        """Initialize elevators as views of a vectorized elevator bank."""
+        self._bank = ElevatorBank(elevators_config, (1, self._num_floors),
+                                  self._clock)
+        for elevator in self._bank.elevators:
+            self._elevators[elevator.id] = elevator
+    
     @property
     def id(self) -> str:
         return self._id
@@ -62,13 +154,58 @@ class Building:
         return self._num_floors
     
     @property
-    def elevators(self) -> Dict[str, Elevator]:
-        return self._elevators.copy()
+    def elevators(self) -> Mapping[str, Elevator]:
+        """Get a read-only view of the elevators keyed by ID, in configuration order."""
+        return MappingProxyType(self._elevators)
     
     @property
     def floors(self) -> Dict[int, Floor]:
         return self._floors.copy()
     
+    @property
+    def clock(self) -> SimulationClock:
+        return self._clock
+    
+    def set_clock(self, clock: SimulationClock) -> None:
+        """
+        Set the clock shared by the building and all of its elevators.
+        
+        Args:
+            clock: Clock providing the current time
+        """
+        self._clock = clock
+        for elevator in self._elevators.values():
+            elevator.set_clock(clock)
+    
+    @property
+    def zones(self) -> ZoneMap:
+        """Get the service zones of the cars and the routes across them."""
+        return self._zones
+    
+    @property
+    def car_positions(self) -> CarPositionIndex:
+        """Get the sorted index of in-service car positions."""
+        return self._car_positions
+    
+    def get_car_positions(self, zone: Optional[str] = None) -> CarPositionIndex:
+        """
+        Get the sorted index of the in-service cars of a zone.
+        
+        Args:
+            zone: Zone name, or None for every car
+            
+        Returns:
+            CarPositionIndex: Positions of the zone's cars
+        """
+        if zone is None:
+            return self._car_positions
+        return self._zone_positions[zone]
+    
+    @property
+    def hall_calls(self) -> HallCallRegistry:
+        """Get the registry of unanswered hall calls and their assigned cars."""
+        return self._hall_calls
+    
     def get_elevator(self, elevator_id: str) -> Optional[Elevator]:
         """Get elevator by ID."""
         return self._elevators.get(elevator_id)
@@ -77,6 +214,26 @@ class Building:
         """Get floor by number."""
         return self._floors.get(floor_num)
     
+    def get_open_elevators(self, floor_num: int) -> List[Elevator]:
+        """Get the elevators whose doors are open at a floor, in configuration order."""
+        open_cars = self._open_cars.get(floor_num)
+        if not open_cars:
+            return []
+        return [self._elevators[elevator_id]
+                for elevator_id in sorted(open_cars, key=self._car_order.get)]
+    
+    def _update_open_cars(self, elevator) -> None:
+        """Move a car's entry in the open-door lookup after it changed."""
+        previous = self._open_floor_of.pop(elevator.id, None)
+        if previous is not None:
+            del self._open_cars[previous][elevator.id]
+            if not self._open_cars[previous]:
+                del self._open_cars[previous]
+        
+        if elevator.is_door_open:
+            self._open_floor_of[elevator.id] = elevator.current_floor
+            self._open_cars.setdefault(elevator.current_floor, {})[elevator.id] = None
+    
     def request_elevator(self, floor: int, direction: Direction) -> bool:
         """
         Request an elevator to a specific floor.
@@ -92,13 +249,21 @@ class Building:
             logging.warning(f"Invalid floor request: {floor}")
             return False
         
+        # Repeated presses are answered by the car already assigned
+        zone = self._zones.default_zone(floor)
+        call = HallCall(floor, direction, zone)
+        assigned = self._elevators.get(self._hall_calls.get_car(call))
+        if assigned and assigned.has_hall_call(floor, direction):
+            return True
+        
         # Simple dispatching: assign to nearest idle elevator
         # or elevator already going in the right direction
-        best_elevator = self._find_best_elevator(floor, direction)
+        best_elevator = self._find_best_elevator(floor, direction, zone)
         
         if best_elevator:
             success = best_elevator.add_hall_call(floor, direction)
             if success:
+                self._hall_calls.assign(call, best_elevator.id)
                 logging.info(f"Hall call assigned to elevator {best_elevator.id}: "
                            f"floor {floor}, direction {direction.name}")
             return success
@@ -107,32 +272,25 @@ class Building:
                        f"direction {direction.name}")
         return False
     
-    def _find_best_elevator(self, floor: int, direction: Direction) -> Optional[Elevator]:
-        """Find the best elevator to handle a hall call."""
-        available_elevators = []
+    def _find_best_elevator(self, floor: int, direction: Direction,
+                            zone: Optional[str] = None) -> Optional[Elevator]:
+        """Find the nearest idle elevator, else the nearest going in the call direction, else the nearest."""
+        positions = self.get_car_positions(zone)
         
-        for elevator in self._elevators.values():
-            if elevator.state.value != "maintenance" and elevator.state.value != "emergency":
-                distance = abs(elevator.current_floor - floor)
-                # Prefer elevators that are idle or moving in the same direction
-                priority = 0
-                if elevator.state.value == "idle":
-                    priority = 2
-                elif ((direction == Direction.UP and elevator.direction == Direction.UP) or
-                      (direction == Direction.DOWN and elevator.direction == Direction.DOWN)):
-                    priority = 1
-                
-                available_elevators.append((elevator, distance, priority))
-        
-        if not available_elevators:
-            return None
-        
-        # Sort by priority (desc) then by distance (asc)
-        available_elevators.sort(key=lambda x: (-x[2], x[1]))
-        return available_elevators[0][0]
+        best = positions.nearest(floor, [(True, d, 'any') for d in Direction])
+        if best is None and direction != Direction.NONE:
+            best = positions.nearest(floor, [(False, direction, 'any')])
+        if best is None:
+            best = positions.nearest(floor, [(False, d, 'any') for d in Direction])
+        
+        return self._elevators[best[2]] if best else None
     
     def update(self, delta_time: float) -> None:
         """Update all elevators in the building."""
+        if self._bank is not None:
+            self._bank.update(delta_time)
+            return
+        
         for elevator in self._elevators.values():
             elevator.update(delta_time)
     
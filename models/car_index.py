@@ -0,0 +1,104 @@
+"""
+Sorted index of car positions for nearest-car queries.
+"""
+
+import bisect
+from typing import Dict, Iterable, List, Optional, Tuple
+from .elevator import ElevatorState, Direction
+
+class CarPositionIndex:
+    """
+    Floors of the in-service cars of a building, bucketed by motion.
+
+    Cars are grouped by whether they are idle and by their direction, and
+    each group is a sorted list of (floor, car index) pairs. A query
+    bisects to the call floor and compares only the closest car on each
+    side, so finding the nearest candidate takes O(log cars) instead of a
+    scan of the whole bank. Entries are moved by update(), which the
+    building calls whenever a car changes floor, state, direction or
+    service state.
+    """
+
+    def __init__(self, elevators: Iterable):
+        """
+        Initialize the index.
+
+        Args:
+            elevators: Cars to index, in configuration order; a car's
+                position in this order breaks distance ties
+        """
+        self._ids: List[str] = []
+        self._index_of: Dict[str, int] = {}
+        self._buckets: Dict[Tuple[bool, Direction], List[Tuple[int, int]]] = {}
+        self._entries: Dict[str, Tuple[Tuple[bool, Direction], Tuple[int, int]]] = {}
+
+        for elevator in elevators:
+            self._index_of[elevator.id] = len(self._ids)
+            self._ids.append(elevator.id)
+            self.update(elevator)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, elevator_id: str) -> bool:
+        return elevator_id in self._entries
+
+    def update(self, elevator) -> None:
+        """
+        Move a car's entry to its current floor and motion bucket.
+
+        Cars out of service are removed from the index.
+
+        Args:
+            elevator: The car that changed
+        """
+        elevator_id = elevator.id
+        previous = self._entries.pop(elevator_id, None)
+        if previous is not None:
+            bucket = self._buckets[previous[0]]
+            del bucket[bisect.bisect_left(bucket, previous[1])]
+
+        if elevator.in_service:
+            key = (elevator.state == ElevatorState.IDLE, elevator.direction)
+            entry = (elevator.current_floor, self._index_of[elevator_id])
+            bisect.insort(self._buckets.setdefault(key, []), entry)
+            self._entries[elevator_id] = (key, entry)
+
+    def nearest(self, floor: int,
+                queries: Iterable[Tuple[bool, Direction, str]]) -> Optional[Tuple[int, int, str]]:
+        """
+        Find the car closest to a floor among several buckets.
+
+        Args:
+            floor: Floor to measure distances from
+            queries: (idle, direction, side) triples selecting the buckets to
+                search; side is 'any', 'below' (floors strictly below) or
+                'not_below' (the floor itself and floors above)
+
+        Returns:
+            Optional[Tuple[int, int, str]]: (distance, car index, car ID) of the
+            closest car, the lowest car index on ties, or None if no car matches
+        """
+        best = None
+        for idle, direction, side in queries:
+            bucket = self._buckets.get((idle, direction))
+            if not bucket:
+                continue
+
+            position = bisect.bisect_left(bucket, (floor, -1))
+            if side != 'below' and position < len(bucket):
+                # First entry at or above the floor has the lowest index there
+                above_floor, above_index = bucket[position]
+                candidate = (above_floor - floor, above_index)
+                if best is None or candidate < best:
+                    best = candidate
+            if side != 'not_below' and position > 0:
+                below_floor = bucket[position - 1][0]
+                first = bisect.bisect_left(bucket, (below_floor, -1), 0, position)
+                candidate = (floor - below_floor, bucket[first][1])
+                if best is None or candidate < best:
+                    best = candidate
+
+        if best is None:
+            return None
+        return best[0], best[1], self._ids[best[1]]
@@ -0,0 +1,73 @@
+"""
+Clock abstractions providing the current simulation time to all components.
+"""
+
+from abc import ABC, abstractmethod
+import time
+
+class SimulationClock(ABC):
+    """
+    Source of the current simulation time in seconds.
+
+    Models, controllers and the logger read timestamps from a shared clock
+    instead of calling time.time() directly, so the same simulation can be
+    driven by the wall clock or by simulated time.
+    """
+
+    @abstractmethod
+    def now(self) -> float:
+        """Get the current time in seconds."""
+
+    def advance(self, delta_time: float) -> None:
+        """
+        Advance the clock by the given amount of simulated time.
+
+        Args:
+            delta_time: Time to advance in seconds
+        """
+
+class RealTimeClock(SimulationClock):
+    """
+    Clock that follows the host's wall clock.
+
+    Advancing has no effect; time passes on its own.
+    """
+
+    def now(self) -> float:
+        return time.time()
+
+class VirtualClock(SimulationClock):
+    """
+    Clock whose time only changes when it is explicitly advanced.
+
+    Runs driven by a virtual clock are independent of host load and can
+    execute as fast as the CPU allows.
+    """
+
+    def __init__(self, start_time: float = 0.0):
+        """
+        Initialize a virtual clock.
+
+        Args:
+            start_time: Initial time in seconds
+        """
+        self._now = start_time
+
+    def now(self) -> float:
+        return self._now
+
+    def advance(self, delta_time: float) -> None:
+        if delta_time < 0:
+            raise ValueError(f"Cannot advance clock by negative time {delta_time}")
+        self._now += delta_time
+
+    def advance_to(self, new_time: float) -> None:
+        """
+        Move the clock forward to an absolute time.
+
+        Args:
+            new_time: Target time in seconds (must not be in the past)
+        """
+        if new_time < self._now:
+            raise ValueError(f"Cannot move clock back from {self._now} to {new_time}")
+        self._now = new_time
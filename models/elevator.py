@@ -3,9 +3,22 @@ Elevator model representing the physical elevator car and its state.
 """
 
 from enum import Enum
-from typing import Set, Optional
-import time
+from typing import Callable, Iterable, List, Set, Optional
 import logging
+from .clock import SimulationClock, RealTimeClock
+from .request_index import FloorRequestIndex
+
+# Car-level service policies deciding where an elevator goes next:
+# 'nearest' heads for the closest request and idles after every stop,
+# 'look' keeps its travel direction while requests remain ahead and stops
+# at every requested floor, 'collective' also keeps its direction but only
+# stops for hall calls in that direction, answering opposite calls when it
+# turns around.
+SERVICE_POLICIES = ('nearest', 'look', 'collective')
+
+# Tolerance used when comparing accumulated timers against durations so that
+# stepping by exactly the remaining time always completes a transition.
+TIMER_EPSILON = 1e-9
 
 class ElevatorState(Enum):
     """Enumeration of possible elevator states."""
@@ -18,6 +31,9 @@ class ElevatorState(Enum):
     MAINTENANCE = "maintenance"
     EMERGENCY = "emergency"
 
+# States in which an elevator does not move or take hall calls
+OUT_OF_SERVICE_STATES = (ElevatorState.MAINTENANCE, ElevatorState.EMERGENCY)
+
 class Direction(Enum):
     """Enumeration of elevator movement directions."""
     UP = 1
@@ -33,7 +49,11 @@ class Elevator:
     """
     
     def __init__(self, elevator_id: str, capacity: int = 8, 
-                 floors_range: tuple = (1, 10), speed: float = 2.0):
+                 floors_range: tuple = (1, 10), speed: float = 2.0,
+                 clock: SimulationClock = None, door_open_time: float = 3.0,
+                 door_operation_time: float = 2.0, service_policy: str = "nearest",
+                 served_floors: Optional[Iterable[int]] = None,
+                 initial_floor: Optional[int] = None):
         """
         Initialize an elevator instance.
         
@@ -42,33 +62,64 @@ class Elevator:
             capacity: Maximum number of passengers
             floors_range: Tuple of (min_floor, max_floor)
             speed: Speed in floors per second
+            clock: Clock providing the current time (defaults to real time)
+            door_open_time: Seconds doors stay open at a stop
+            door_operation_time: Seconds to open or close the doors
+            service_policy: Car-level service policy (see SERVICE_POLICIES)
+            served_floors: Floors the car stops at (defaults to every floor
+                in floors_range); requests for other floors are rejected
+            initial_floor: Floor the car starts at (defaults to the lowest
+                floor it serves)
+            
+        Raises:
+            ValueError: If the service policy is unknown or the car does not
+                serve its initial floor
         """
+        if service_policy not in SERVICE_POLICIES:
+            raise ValueError(f"Unknown service policy: {service_policy}")
+        
         self._id = elevator_id
         self._capacity = capacity
         self._min_floor = floors_range[0]
         self._max_floor = floors_range[1]
+        self._served_floors = frozenset(served_floors) if served_floors is not None else None
         self._speed = speed
         
         # Current state
-        self._current_floor = 1
+        if initial_floor is None:
+            initial_floor = min(self._served_floors or (self._min_floor,))
+        if not self._is_valid_floor(initial_floor):
+            raise ValueError(f"Elevator {self._id} does not serve its "
+                             f"initial floor {initial_floor}")
+        self._current_floor = initial_floor
         self._state = ElevatorState.IDLE
         self._direction = Direction.NONE
+        self._travel_direction = Direction.NONE  # Kept across stops by look/collective
+        self._service_policy = service_policy
         self._passengers = set()
         self._door_open = False
         
-        # Requests
-        self._floor_requests = set()  # Internal button presses
-        self._up_requests = set()     # Up hall calls
-        self._down_requests = set()   # Down hall calls
+        # Requests (internal button presses and up/down hall calls)
+        self._requests = FloorRequestIndex()
         
         # Timing
         self._door_timer = 0.0
         self._move_timer = 0.0
-        self._last_update = time.time()
+        self._clock = clock or RealTimeClock()
+        self._last_update = self._clock.now()
         
         # Configuration
-        self._door_open_time = 3.0    # Seconds doors stay open
-        self._door_operation_time = 2.0  # Seconds to open/close doors
+        self._door_open_time = door_open_time    # Seconds doors stay open
+        self._door_operation_time = door_operation_time  # Seconds to open/close doors
+        
+        # Functions called when the doors finish opening at a floor
+        self._door_open_listeners: List[Callable[['Elevator'], None]] = []
+        
+        # Functions called when the elevator leaves or returns to service
+        self._service_state_listeners: List[Callable[['Elevator'], None]] = []
+        
+        # Functions called when the floor, state or direction changes
+        self._motion_listeners: List[Callable[['Elevator'], None]] = []
         
         logging.info(f"Elevator {self._id} initialized: "
                     f"floors {self._min_floor}-{self._max_floor}, "
@@ -90,6 +141,29 @@ class Elevator:
     def direction(self) -> Direction:
         return self._direction
     
+    @property
+    def speed(self) -> float:
+        return self._speed
+    
+    @property
+    def door_open_time(self) -> float:
+        return self._door_open_time
+    
+    @property
+    def door_operation_time(self) -> float:
+        return self._door_operation_time
+    
+    @property
+    def service_policy(self) -> str:
+        return self._service_policy
+    
+    @property
+    def served_floors(self) -> List[int]:
+        """Get the floors the elevator stops at, ascending."""
+        if self._served_floors is None:
+            return list(range(self._min_floor, self._max_floor + 1))
+        return sorted(self._served_floors)
+    
     @property
     def passenger_count(self) -> int:
         return len(self._passengers)
@@ -102,9 +176,102 @@ class Elevator:
     def is_door_open(self) -> bool:
         return self._door_open
     
+    @property
+    def in_service(self) -> bool:
+        return self._state not in OUT_OF_SERVICE_STATES
+    
     @property
     def floor_requests(self) -> Set[int]:
-        return self._floor_requests.copy()
+        return set(self._requests.car_calls)
+    
+    @property
+    def pending_stops(self) -> List[int]:
+        """Get every floor the elevator has been asked to stop at, ascending."""
+        return self._requests.floors
+    
+    def set_clock(self, clock: SimulationClock) -> None:
+        """
+        Set the clock this elevator reads the current time from.
+        
+        Args:
+            clock: Clock providing the current time
+        """
+        self._clock = clock
+        self._last_update = clock.now()
+    
+    def add_door_open_listener(self, listener: Callable[['Elevator'], None]) -> None:
+        """
+        Register a function to call whenever the doors finish opening.
+        
+        Passengers can exit and board from the moment the listener is
+        called until the doors start closing.
+        
+        Args:
+            listener: Function called with this elevator
+        """
+        self._door_open_listeners.append(listener)
+    
+    def add_motion_listener(self, listener: Callable[['Elevator'], None]) -> None:
+        """
+        Register a function to call when the floor, state or direction changes.
+        
+        Called after every update that moves the elevator to another floor
+        or changes its state or direction, e.g. to keep an index of car
+        positions current.
+        
+        Args:
+            listener: Function called with this elevator after the change
+        """
+        self._motion_listeners.append(listener)
+    
+    def add_service_state_listener(self, listener: Callable[['Elevator'], None]) -> None:
+        """
+        Register a function to call when the elevator leaves or returns to service.
+        
+        Args:
+            listener: Function called with this elevator after the change
+        """
+        self._service_state_listeners.append(listener)
+    
+    def set_service_state(self, state: ElevatorState) -> bool:
+        """
+        Take the elevator out of service or return it to service.
+        
+        An elevator taken out of service stops at the floor it last
+        reached with its doors closed and drops its hall calls so they can
+        be given to other cars; car calls are kept for when it returns.
+        
+        Args:
+            state: MAINTENANCE or EMERGENCY to take the elevator out of
+                service, IDLE to return it to service
+            
+        Returns:
+            bool: True if the service state changed
+            
+        Raises:
+            ValueError: If the state is not a service state
+        """
+        if state != ElevatorState.IDLE and state not in OUT_OF_SERVICE_STATES:
+            raise ValueError(f"Invalid service state: {state.value}")
+        
+        if state == self._state or (state == ElevatorState.IDLE and self.in_service):
+            return False
+        
+        self._state = state
+        self._direction = Direction.NONE
+        self._travel_direction = Direction.NONE
+        self._door_open = False
+        self._door_timer = 0.0
+        self._move_timer = 0.0
+        if state != ElevatorState.IDLE:
+            self._requests.clear_hall_calls()
+        
+        logging.info(f"Elevator {self._id}: Service state set to {state.value} "
+                    f"at floor {self._current_floor}")
+        
+        for listener in self._service_state_listeners:
+            listener(self)
+        return True
     
     def add_floor_request(self, floor: int) -> bool:
         """
@@ -120,7 +287,7 @@ class Elevator:
             return False
         
         if floor != self._current_floor:
-            self._floor_requests.add(floor)
+            self._requests.add_car_call(floor)
             logging.debug(f"Elevator {self._id}: Floor {floor} requested")
         
         return True
@@ -136,7 +303,7 @@ class Elevator:
         Returns:
             bool: True if request was added successfully
         """
-        if not self._is_valid_floor(floor):
+        if not self._is_valid_floor(floor) or not self.in_service:
             return False
         
         # Ensure direction is a Direction enum
@@ -146,13 +313,43 @@ class Elevator:
             return False
         
         if direction == Direction.UP:
-            self._up_requests.add(floor)
+            self._requests.add_up_call(floor)
         elif direction == Direction.DOWN:
-            self._down_requests.add(floor)
+            self._requests.add_down_call(floor)
         
         logging.debug(f"Elevator {self._id}: Hall call floor {floor} {direction.name}")
         return True
     
+    def has_hall_call(self, floor: int, direction: Direction) -> bool:
+        """Check if a hall call is assigned to this elevator."""
+        if direction == Direction.UP:
+            return self._requests.has_up_call(floor)
+        elif direction == Direction.DOWN:
+            return self._requests.has_down_call(floor)
+        return False
+    
+    def remove_hall_call(self, floor: int, direction: Direction) -> bool:
+        """
+        Withdraw an unanswered hall call, e.g. to reassign it to another car.
+        
+        Args:
+            floor: Floor where call was made
+            direction: Direction of the call
+            
+        Returns:
+            bool: True if the call was assigned to this elevator and removed
+        """
+        if not self.has_hall_call(floor, direction):
+            return False
+        
+        if direction == Direction.UP:
+            self._requests.clear_up_call(floor)
+        else:
+            self._requests.clear_down_call(floor)
+        
+        logging.debug(f"Elevator {self._id}: Hall call floor {floor} {direction.name} withdrawn")
+        return True
+    
     def update(self, delta_time: float) -> None:
         """
         Update elevator state based on elapsed time.
@@ -160,6 +357,8 @@ class Elevator:
         Args:
             delta_time: Time elapsed since last update in seconds
         """
+        motion = (self._current_floor, self._state, self._direction)
+        
         if self._state == ElevatorState.IDLE:
             self._handle_idle_state()
         elif self._state == ElevatorState.MOVING_UP:
@@ -172,31 +371,68 @@ class Elevator:
             self._handle_doors_open(delta_time)
         elif self._state == ElevatorState.DOORS_CLOSING:
             self._handle_door_closing(delta_time)
+        
+        if (self._motion_listeners and
+                motion != (self._current_floor, self._state, self._direction)):
+            for listener in self._motion_listeners:
+                listener(self)
+        
+        # Door open listeners run last so they see the car's new position
+        if motion[1] == ElevatorState.DOORS_OPENING and self._state == ElevatorState.DOORS_OPEN:
+            for listener in self._door_open_listeners:
+                listener(self)
+    
+    def get_time_to_next_event(self) -> Optional[float]:
+        """
+        Get the time until the elevator's next state transition.
+        
+        Used by the discrete-event engine to schedule the elevator instead
+        of polling it with fixed time steps.
+        
+        Returns:
+            Optional[float]: Seconds until the next transition, 0.0 if the
+            elevator can act immediately, or None if it is waiting for a request
+        """
+        if self._state == ElevatorState.IDLE:
+            if self._requests:
+                return 0.0
+            return None
+        elif self._state in (ElevatorState.MOVING_UP, ElevatorState.MOVING_DOWN):
+            return max(0.0, 1.0 / self._speed - self._move_timer)
+        elif self._state == ElevatorState.DOORS_OPEN:
+            return max(0.0, self._door_open_time - self._door_timer)
+        elif self._state in (ElevatorState.DOORS_OPENING, ElevatorState.DOORS_CLOSING):
+            return max(0.0, self._door_operation_time - self._door_timer)
+        
+        return None
     
     def _handle_idle_state(self) -> None:
         """Handle elevator behavior when idle."""
         next_floor = self._get_next_destination()
         
-        if next_floor is not None:
-            if next_floor > self._current_floor:
-                self._direction = Direction.UP
-                self._state = ElevatorState.MOVING_UP
-                self._move_timer = 0.0
-            elif next_floor < self._current_floor:
-                self._direction = Direction.DOWN
-                self._state = ElevatorState.MOVING_DOWN
-                self._move_timer = 0.0
-            else:
-                # Same floor - open doors
-                self._state = ElevatorState.DOORS_OPENING
-                self._door_timer = 0.0
+        if next_floor is None:
+            self._travel_direction = Direction.NONE
+        elif next_floor > self._current_floor:
+            self._direction = Direction.UP
+            self._travel_direction = Direction.UP
+            self._state = ElevatorState.MOVING_UP
+            self._move_timer = 0.0
+        elif next_floor < self._current_floor:
+            self._direction = Direction.DOWN
+            self._travel_direction = Direction.DOWN
+            self._state = ElevatorState.MOVING_DOWN
+            self._move_timer = 0.0
+        else:
+            # Same floor - open doors
+            self._state = ElevatorState.DOORS_OPENING
+            self._door_timer = 0.0
     
     def _handle_moving_state(self, direction: Direction, delta_time: float) -> None:
         """Handle elevator movement between floors."""
         self._move_timer += delta_time
         time_per_floor = 1.0 / self._speed
         
-        if self._move_timer >= time_per_floor:
+        if self._move_timer >= time_per_floor - TIMER_EPSILON:
             # Arrived at next floor
             self._current_floor += direction.value
             self._move_timer = 0.0
@@ -209,22 +445,32 @@ class Elevator:
                 # No more requests in this direction
                 self._state = ElevatorState.IDLE
                 self._direction = Direction.NONE
+                if self._service_policy != "nearest":
+                    self._handle_idle_state()
     
     def _handle_door_opening(self, delta_time: float) -> None:
         """Handle door opening sequence."""
         self._door_timer += delta_time
         
-        if self._door_timer >= self._door_operation_time:
+        if self._door_timer >= self._door_operation_time - TIMER_EPSILON:
             self._door_open = True
             self._state = ElevatorState.DOORS_OPEN
             self._door_timer = 0.0
-            self._clear_requests_at_current_floor()
+            
+            if self._service_policy == "collective":
+                # Announce the departure direction so only passengers going
+                # that way board, and keep the opposite hall call
+                self._travel_direction = self._get_departure_direction()
+                self._direction = self._travel_direction
+                self._clear_served_requests_at_current_floor()
+            else:
+                self._clear_requests_at_current_floor()
     
     def _handle_doors_open(self, delta_time: float) -> None:
         """Handle doors open state."""
         self._door_timer += delta_time
         
-        if self._door_timer >= self._door_open_time:
+        if self._door_timer >= self._door_open_time - TIMER_EPSILON:
             self._state = ElevatorState.DOORS_CLOSING
             self._door_timer = 0.0
     
@@ -232,51 +478,107 @@ class Elevator:
         """Handle door closing sequence."""
         self._door_timer += delta_time
         
-        if self._door_timer >= self._door_operation_time:
+        if self._door_timer >= self._door_operation_time - TIMER_EPSILON:
             self._door_open = False
             self._state = ElevatorState.IDLE
             self._door_timer = 0.0
+            
+            if self._service_policy != "nearest":
+                # Depart straight away instead of idling after every stop
+                self._handle_idle_state()
     
     def _should_stop_at_current_floor(self) -> bool:
         """Check if elevator should stop at current floor."""
-        return (self._current_floor in self._floor_requests or
-                self._current_floor in self._up_requests or
-                self._current_floor in self._down_requests)
+        floor = self._current_floor
+        if self._service_policy != "collective":
+            return self._requests.has_request(floor)
+        
+        if self._requests.has_car_call(floor):
+            return True
+        
+        # Stop for hall calls in the travel direction, and for opposite
+        # calls only where the car will turn around
+        if self._travel_direction == Direction.UP:
+            return (self._requests.has_up_call(floor) or
+                    (self._requests.has_down_call(floor) and
+                     not self._requests.has_requests_above(floor)))
+        elif self._travel_direction == Direction.DOWN:
+            return (self._requests.has_down_call(floor) or
+                    (self._requests.has_up_call(floor) and
+                     not self._requests.has_requests_below(floor)))
+        
+        return self._requests.has_request(floor)
     
     def _clear_requests_at_current_floor(self) -> None:
         """Clear all requests for the current floor."""
-        self._floor_requests.discard(self._current_floor)
-        self._up_requests.discard(self._current_floor)
-        self._down_requests.discard(self._current_floor)
+        self._requests.clear_floor(self._current_floor)
+    
+    def _clear_served_requests_at_current_floor(self) -> None:
+        """Clear the car call and the hall call answered in the travel direction."""
+        floor = self._current_floor
+        self._requests.clear_car_call(floor)
+        if self._travel_direction != Direction.DOWN:
+            self._requests.clear_up_call(floor)
+        if self._travel_direction != Direction.UP:
+            self._requests.clear_down_call(floor)
+    
+    def _get_departure_direction(self) -> Direction:
+        """Get the direction to leave the current floor in, keeping the travel direction."""
+        floor = self._current_floor
+        up_ahead = self._requests.has_requests_above(floor)
+        down_ahead = self._requests.has_requests_below(floor)
+        
+        if self._travel_direction == Direction.UP and up_ahead:
+            return Direction.UP
+        if self._travel_direction == Direction.DOWN and down_ahead:
+            return Direction.DOWN
+        
+        # Turning around (or starting): serve a hall call waiting here first
+        if self._requests.has_up_call(floor) or (up_ahead and not down_ahead):
+            return Direction.UP
+        if self._requests.has_down_call(floor) or down_ahead:
+            return Direction.DOWN
+        return Direction.NONE
     
     def _get_next_destination(self) -> Optional[int]:
         """Get the next floor the elevator should visit."""
-        all_requests = (self._floor_requests | 
-                       self._up_requests | 
-                       self._down_requests)
+        floor = self._current_floor
+        if self._service_policy == "nearest" or self._travel_direction == Direction.NONE:
+            # Go to nearest floor, lower floor on ties
+            return self._requests.nearest(floor)
         
-        if not all_requests:
-            return None
+        # Keep going while requests remain ahead, then serve this floor,
+        # then reverse
+        if self._travel_direction == Direction.UP:
+            ahead = self._requests.next_above(floor)
+            behind = self._requests.next_below(floor)
+        else:
+            ahead = self._requests.next_below(floor)
+            behind = self._requests.next_above(floor)
         
-        # Simple strategy: go to nearest floor
-        return min(all_requests, key=lambda f: abs(f - self._current_floor))
+        if ahead is not None:
+            return ahead
+        if self._requests.has_request(floor):
+            return floor
+        return behind
     
     def _has_requests_in_direction(self, direction: Direction) -> bool:
         """Check if there are any requests in the given direction."""
-        all_requests = (self._floor_requests | 
-                       self._up_requests | 
-                       self._down_requests)
-        
         if direction == Direction.UP:
-            return any(f > self._current_floor for f in all_requests)
+            return self._requests.has_requests_above(self._current_floor)
         elif direction == Direction.DOWN:
-            return any(f < self._current_floor for f in all_requests)
+            return self._requests.has_requests_below(self._current_floor)
         
         return False
     
+    def serves(self, floor: int) -> bool:
+        """Check if the elevator stops at a floor."""
+        return self._is_valid_floor(floor)
+    
     def _is_valid_floor(self, floor: int) -> bool:
         """Check if floor number is valid for this elevator."""
-        return self._min_floor <= floor <= self._max_floor
+        return (self._min_floor <= floor <= self._max_floor and
+                (self._served_floors is None or floor in self._served_floors))
     
     def add_passenger(self, passenger_id: str, destination_floor: int) -> bool:
         """
@@ -299,7 +601,7 @@ class Elevator:
         
         # Add passenger and their destination
         self._passengers.add(passenger_id)
-        self._floor_requests.add(destination_floor)
+        self._requests.add_car_call(destination_floor)
         
         logging.info(f"Passenger {passenger_id} boarded elevator {self._id}, "
                     f"destination: floor {destination_floor}")
@@ -336,7 +638,7 @@ class Elevator:
             'capacity': self._capacity,
             'door_open': self._door_open,
             'passengers': sorted(list(self._passengers)),
-            'floor_requests': sorted(list(self._floor_requests)),
-            'up_requests': sorted(list(self._up_requests)),
-            'down_requests': sorted(list(self._down_requests))
+            'floor_requests': self._requests.car_calls,
+            'up_requests': self._requests.up_calls,
+            'down_requests': self._requests.down_calls
         }
\ No newline at end of file
@@ -0,0 +1,595 @@
+"""
+Vectorized struct-of-arrays representation of a bank of elevators.
+"""
+
+from typing import Callable, List, Optional, Set
+import logging
+from .elevator import ElevatorState, Direction, OUT_OF_SERVICE_STATES, TIMER_EPSILON
+from .clock import SimulationClock, RealTimeClock
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional dependency
+    np = None
+
+# Integer codes used to store elevator states in arrays
+_STATES = list(ElevatorState)
+_STATE_CODES = {state: code for code, state in enumerate(_STATES)}
+_IDLE = _STATE_CODES[ElevatorState.IDLE]
+_MOVING_UP = _STATE_CODES[ElevatorState.MOVING_UP]
+_MOVING_DOWN = _STATE_CODES[ElevatorState.MOVING_DOWN]
+_DOORS_OPENING = _STATE_CODES[ElevatorState.DOORS_OPENING]
+_DOORS_OPEN = _STATE_CODES[ElevatorState.DOORS_OPEN]
+_DOORS_CLOSING = _STATE_CODES[ElevatorState.DOORS_CLOSING]
+_OUT_OF_SERVICE = [_STATE_CODES[state] for state in OUT_OF_SERVICE_STATES]
+
+class ElevatorBank:
+    """
+    Stores the state of many elevators in NumPy arrays.
+
+    Positions, states, directions, timers, loads and requests live in one
+    array per attribute, and update() advances every car with array
+    operations instead of calling Elevator.update per car. Individual cars
+    are exposed as BankElevator views with the same interface as Elevator.
+    """
+
+    def __init__(self, elevators_config: List[dict], floors_range: tuple,
+                 clock: SimulationClock = None):
+        """
+        Initialize an elevator bank.
+
+        Args:
+            elevators_config: List of elevator configuration dictionaries
+            floors_range: Tuple of (min_floor, max_floor); cars serve every
+                floor in it unless their configuration lists served_floors
+            clock: Clock providing the current time (defaults to real time)
+
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If a car uses a service policy other than 'nearest'
+                or does not serve its initial_floor
+        """
+        if np is None:
+            raise ImportError("NumPy is required for the vectorized elevator bank")
+
+        for config in elevators_config:
+            if config.get('service_policy', 'nearest') != 'nearest':
+                raise ValueError("The vectorized elevator bank only supports "
+                                 "the 'nearest' service policy")
+
+        count = len(elevators_config)
+        self._min_floor, self._max_floor = floors_range
+        self._clock = clock or RealTimeClock()
+        self._ids = [config.get('id', f'elevator_{i}')
+                     for i, config in enumerate(elevators_config)]
+        self._all_cars = np.arange(count)
+        self._floor_numbers = np.arange(self._max_floor + 1)
+
+        # Current state
+        self._current_floor = np.zeros(count, dtype=np.int64)
+        self._state = np.full(count, _IDLE, dtype=np.int8)
+        self._direction = np.zeros(count, dtype=np.int8)
+        self._door_open = np.zeros(count, dtype=bool)
+        self._load = np.zeros(count, dtype=np.int64)
+        self._passengers: List[Set[str]] = [set() for _ in range(count)]
+
+        # Requests indexed by [car, floor]
+        self._floor_requests = np.zeros((count, self._max_floor + 1), dtype=bool)
+        self._up_requests = np.zeros_like(self._floor_requests)
+        self._down_requests = np.zeros_like(self._floor_requests)
+
+        # Timing
+        self._door_timer = np.zeros(count)
+        self._move_timer = np.zeros(count)
+
+        # Configuration
+        self._capacity = np.array([config.get('capacity', 8)
+                                   for config in elevators_config], dtype=np.int64)
+        self._speed = np.array([config.get('speed', 2.0) for config in elevators_config],
+                               dtype=float)
+        self._time_per_floor = 1.0 / self._speed
+        self._door_open_time = np.array([config.get('door_open_time', 3.0)
+                                         for config in elevators_config])
+        self._door_operation_time = np.array([config.get('door_operation_time', 2.0)
+                                              for config in elevators_config])
+
+        # Floors each car stops at, indexed by [car, floor]
+        self._served = np.zeros_like(self._floor_requests)
+        for car, config in enumerate(elevators_config):
+            served_floors = config.get('served_floors')
+            if served_floors is None:
+                self._served[car, self._min_floor:] = True
+            else:
+                self._served[car, [floor for floor in served_floors
+                                   if self._is_valid_floor(floor)]] = True
+
+            # Cars start at their initial floor or the lowest floor they serve
+            initial_floor = config.get('initial_floor')
+            if initial_floor is None:
+                initial_floor = int(np.argmax(self._served[car]))
+            if not self.serves(car, initial_floor):
+                raise ValueError(f"Elevator {self._ids[car]} does not serve its "
+                                 f"initial floor {initial_floor}")
+            self._current_floor[car] = initial_floor
+
+        self._views = [BankElevator(self, index) for index in range(count)]
+        self._door_open_listeners: List[List[Callable]] = [[] for _ in range(count)]
+        self._service_state_listeners: List[List[Callable]] = [[] for _ in range(count)]
+        self._motion_listeners: List[List[Callable]] = [[] for _ in range(count)]
+        self._has_motion_listeners = False
+
+        logging.info(f"Elevator bank initialized with {count} cars: "
+                    f"floors {self._min_floor}-{self._max_floor}")
+
+    @property
+    def elevators(self) -> List['BankElevator']:
+        """Get per-car views in configuration order."""
+        return list(self._views)
+
+    @property
+    def size(self) -> int:
+        return len(self._views)
+
+    def set_clock(self, clock: SimulationClock) -> None:
+        """
+        Set the clock the bank reads the current time from.
+
+        Args:
+            clock: Clock providing the current time
+        """
+        self._clock = clock
+
+    def update(self, delta_time: float, cars=None) -> None:
+        """
+        Advance cars by one step of the elevator state machine.
+
+        Each car makes at most one state transition per call, exactly as
+        Elevator.update does. Building.update advances cars one after the
+        other, so a car's door open listeners (boarding and the dispatch it
+        triggers) run before the cars after it move. To take the same
+        decisions, the cars are advanced together in runs that end at each
+        car whose doors finish opening, and that car's listeners run before
+        the next run.
+
+        Args:
+            delta_time: Time elapsed since last update in seconds
+            cars: Indices of the cars to update in order (defaults to all cars)
+        """
+        cars = self._all_cars if cars is None else np.asarray(cars)
+
+        while cars.size:
+            opening = np.flatnonzero(self._state[cars] == _DOORS_OPENING)
+            if opening.size:
+                # Same test as _advance_door_timers, before the timers move
+                candidates = cars[opening]
+                opens = (self._door_timer[candidates] + delta_time >=
+                         self._door_operation_time[candidates] - TIMER_EPSILON)
+                if opens.any():
+                    end = opening[np.argmax(opens)] + 1
+                    self._update_cars(cars[:end], delta_time)
+                    cars = cars[end:]
+                    continue
+
+            self._update_cars(cars, delta_time)
+            return
+
+    def _update_cars(self, cars, delta_time: float) -> None:
+        """Advance a run of cars together and notify their listeners."""
+        state = self._state[cars]
+        if self._has_motion_listeners:
+            floor = self._current_floor[cars]
+            direction = self._direction[cars]
+
+        idle = cars[state == _IDLE]
+        moving = cars[(state == _MOVING_UP) | (state == _MOVING_DOWN)]
+        opening = cars[state == _DOORS_OPENING]
+        open_ = cars[state == _DOORS_OPEN]
+        closing = cars[state == _DOORS_CLOSING]
+        opened = opening[:0]
+
+        if idle.size:
+            self._start_idle_cars(idle)
+        if moving.size:
+            self._advance_moving_cars(moving, delta_time)
+        if opening.size:
+            opened = self._advance_door_timers(opening, delta_time, self._door_operation_time)
+            floors = self._current_floor[opened]
+            self._door_open[opened] = True
+            self._state[opened] = _DOORS_OPEN
+            self._floor_requests[opened, floors] = False
+            self._up_requests[opened, floors] = False
+            self._down_requests[opened, floors] = False
+        if open_.size:
+            done = self._advance_door_timers(open_, delta_time, self._door_open_time)
+            self._state[done] = _DOORS_CLOSING
+        if closing.size:
+            done = self._advance_door_timers(closing, delta_time, self._door_operation_time)
+            self._door_open[done] = False
+            self._state[done] = _IDLE
+
+        if self._has_motion_listeners:
+            moved = ((self._current_floor[cars] != floor) | (self._state[cars] != state) |
+                     (self._direction[cars] != direction))
+            self._notify_motion(cars[moved])
+        # Door open listeners run last so they see the run's new positions
+        if opened.size:
+            self._notify_doors_opened(opened)
+
+    def add_door_open_listener(self, car: int, listener: Callable) -> None:
+        """Register a function to call when a car's doors finish opening (see Elevator)."""
+        self._door_open_listeners[car].append(listener)
+
+    def add_motion_listener(self, car: int, listener: Callable) -> None:
+        """Register a function to call when a car's floor, state or direction changes (see Elevator)."""
+        self._motion_listeners[car].append(listener)
+        self._has_motion_listeners = True
+
+    def _notify_motion(self, cars) -> None:
+        """Call the motion listeners of cars whose floor, state or direction changed."""
+        for car in cars.tolist():
+            for listener in self._motion_listeners[car]:
+                listener(self._views[car])
+
+    def add_service_state_listener(self, car: int, listener: Callable) -> None:
+        """Register a function to call when a car leaves or returns to service (see Elevator)."""
+        self._service_state_listeners[car].append(listener)
+
+    def is_in_service(self, car: int) -> bool:
+        """Check if a car can move and take hall calls."""
+        return int(self._state[car]) not in _OUT_OF_SERVICE
+
+    def set_service_state(self, car: int, state: ElevatorState) -> bool:
+        """Take a car out of service or return it to service (see Elevator)."""
+        if state != ElevatorState.IDLE and state not in OUT_OF_SERVICE_STATES:
+            raise ValueError(f"Invalid service state: {state.value}")
+
+        code = _STATE_CODES[state]
+        if code == self._state[car] or (code == _IDLE and self.is_in_service(car)):
+            return False
+
+        self._state[car] = code
+        self._direction[car] = Direction.NONE.value
+        self._door_open[car] = False
+        self._door_timer[car] = 0.0
+        self._move_timer[car] = 0.0
+        if code != _IDLE:
+            self._up_requests[car] = False
+            self._down_requests[car] = False
+
+        logging.info(f"Elevator {self._ids[car]}: Service state set to {state.value} "
+                    f"at floor {self._current_floor[car]}")
+
+        for listener in self._service_state_listeners[car]:
+            listener(self._views[car])
+        return True
+
+    def _notify_doors_opened(self, cars) -> None:
+        """Call the door open listeners of cars whose doors just opened."""
+        for car in cars.tolist():
+            for listener in self._door_open_listeners[car]:
+                listener(self._views[car])
+
+    def _any_requests(self, cars) -> 'np.ndarray':
+        """Get the union of all request matrices for the given cars."""
+        return (self._floor_requests[cars] | self._up_requests[cars] |
+                self._down_requests[cars])
+
+    def _start_idle_cars(self, cars) -> None:
+        """Send idle cars with requests towards their nearest requested floor."""
+        requests = self._any_requests(cars)
+        has_requests = requests.any(axis=1)
+        cars = cars[has_requests]
+        if not cars.size:
+            return
+
+        current = self._current_floor[cars]
+        distance = np.abs(self._floor_numbers[None, :] - current[:, None])
+        distance = np.where(requests[has_requests], distance, self._max_floor + 1)
+        target = distance.argmin(axis=1)  # Ties go to the lower floor
+
+        up = cars[target > current]
+        down = cars[target < current]
+        here = cars[target == current]
+
+        self._direction[up] = Direction.UP.value
+        self._state[up] = _MOVING_UP
+        self._move_timer[up] = 0.0
+        self._direction[down] = Direction.DOWN.value
+        self._state[down] = _MOVING_DOWN
+        self._move_timer[down] = 0.0
+        self._state[here] = _DOORS_OPENING
+        self._door_timer[here] = 0.0
+
+    def _advance_moving_cars(self, cars, delta_time: float) -> None:
+        """Advance moving cars and handle floor crossings."""
+        self._move_timer[cars] += delta_time
+        arrived = cars[self._move_timer[cars] >= self._time_per_floor[cars] - TIMER_EPSILON]
+        if not arrived.size:
+            return
+
+        step = np.where(self._state[arrived] == _MOVING_UP, 1, -1)
+        self._current_floor[arrived] += step
+        self._move_timer[arrived] = 0.0
+        floors = self._current_floor[arrived]
+
+        stop = (self._floor_requests[arrived, floors] | self._up_requests[arrived, floors] |
+                self._down_requests[arrived, floors])
+        stopping = arrived[stop]
+        self._state[stopping] = _DOORS_OPENING
+        self._door_timer[stopping] = 0.0
+        self._direction[stopping] = Direction.NONE.value
+
+        passing = arrived[~stop]
+        if passing.size:
+            step = step[~stop][:, None]
+            floors = floors[~stop][:, None]
+            ahead = np.where(step > 0, self._floor_numbers[None, :] > floors,
+                             self._floor_numbers[None, :] < floors)
+            has_requests_ahead = (self._any_requests(passing) & ahead).any(axis=1)
+
+            finished = passing[~has_requests_ahead]
+            self._state[finished] = _IDLE
+            self._direction[finished] = Direction.NONE.value
+
+    def _advance_door_timers(self, cars, delta_time: float, durations) -> 'np.ndarray':
+        """Advance door timers and return the cars whose phase completed."""
+        self._door_timer[cars] += delta_time
+        done = cars[self._door_timer[cars] >= durations[cars] - TIMER_EPSILON]
+        self._door_timer[done] = 0.0
+        return done
+
+    def get_time_to_next_event(self, car: int) -> Optional[float]:
+        """Get the time until a car's next state transition (see Elevator)."""
+        state = self._state[car]
+
+        if state == _IDLE:
+            return 0.0 if self._any_requests(car).any() else None
+        elif state in (_MOVING_UP, _MOVING_DOWN):
+            return max(0.0, float(self._time_per_floor[car] - self._move_timer[car]))
+        elif state == _DOORS_OPEN:
+            return max(0.0, float(self._door_open_time[car] - self._door_timer[car]))
+        elif state in (_DOORS_OPENING, _DOORS_CLOSING):
+            return max(0.0, float(self._door_operation_time[car] - self._door_timer[car]))
+
+        return None
+
+    def _is_valid_floor(self, floor: int) -> bool:
+        return self._min_floor <= floor <= self._max_floor
+
+    def serves(self, car: int, floor: int) -> bool:
+        """Check if a car stops at a floor (see Elevator)."""
+        return self._is_valid_floor(floor) and bool(self._served[car, floor])
+
+    def get_served_floors(self, car: int) -> List[int]:
+        """Get the floors a car stops at, ascending."""
+        return np.flatnonzero(self._served[car]).tolist()
+
+    def add_floor_request(self, car: int, floor: int) -> bool:
+        """Add an internal floor request for a car (see Elevator)."""
+        if not self.serves(car, floor):
+            return False
+
+        if floor != self._current_floor[car]:
+            self._floor_requests[car, floor] = True
+            logging.debug(f"Elevator {self._ids[car]}: Floor {floor} requested")
+
+        return True
+
+    def add_hall_call(self, car: int, floor: int, direction: Direction) -> bool:
+        """Add a hall call for a car (see Elevator)."""
+        if not self.serves(car, floor) or not self.is_in_service(car):
+            return False
+
+        if isinstance(direction, bool):
+            direction = Direction.UP if direction else Direction.DOWN
+        elif not isinstance(direction, Direction):
+            return False
+
+        if direction == Direction.UP:
+            self._up_requests[car, floor] = True
+        elif direction == Direction.DOWN:
+            self._down_requests[car, floor] = True
+
+        logging.debug(f"Elevator {self._ids[car]}: Hall call floor {floor} {direction.name}")
+        return True
+
+    def has_hall_call(self, car: int, floor: int, direction: Direction) -> bool:
+        """Check if a hall call is assigned to a car (see Elevator)."""
+        if not self._is_valid_floor(floor):
+            return False
+        if direction == Direction.UP:
+            return bool(self._up_requests[car, floor])
+        elif direction == Direction.DOWN:
+            return bool(self._down_requests[car, floor])
+        return False
+
+    def remove_hall_call(self, car: int, floor: int, direction: Direction) -> bool:
+        """Withdraw an unanswered hall call from a car (see Elevator)."""
+        if not self.has_hall_call(car, floor, direction):
+            return False
+
+        if direction == Direction.UP:
+            self._up_requests[car, floor] = False
+        else:
+            self._down_requests[car, floor] = False
+
+        logging.debug(f"Elevator {self._ids[car]}: Hall call floor {floor} {direction.name} withdrawn")
+        return True
+
+    def get_pending_stops(self, car: int) -> List[int]:
+        """Get every floor a car has been asked to stop at, ascending."""
+        return np.flatnonzero(self._any_requests(car)).tolist()
+
+    def add_passenger(self, car: int, passenger_id: str, destination_floor: int) -> bool:
+        """Add a passenger to a car (see Elevator)."""
+        if self._load[car] >= self._capacity[car]:
+            logging.warning(f"Elevator {self._ids[car]} is at capacity")
+            return False
+
+        if not self.serves(car, destination_floor):
+            logging.warning(f"Invalid destination floor {destination_floor}")
+            return False
+
+        self._passengers[car].add(passenger_id)
+        self._load[car] = len(self._passengers[car])
+        self._floor_requests[car, destination_floor] = True
+
+        logging.info(f"Passenger {passenger_id} boarded elevator {self._ids[car]}, "
+                    f"destination: floor {destination_floor}")
+        return True
+
+    def remove_passenger(self, car: int, passenger_id: str) -> bool:
+        """Remove a passenger from a car (see Elevator)."""
+        if passenger_id in self._passengers[car]:
+            self._passengers[car].remove(passenger_id)
+            self._load[car] = len(self._passengers[car])
+            logging.info(f"Passenger {passenger_id} exited elevator {self._ids[car]}")
+            return True
+        return False
+
+    def get_status_dict(self, car: int) -> dict:
+        """Get a car's status in the same format as Elevator.get_status_dict."""
+        return {
+            'id': self._ids[car],
+            'current_floor': int(self._current_floor[car]),
+            'state': _STATES[self._state[car]].value,
+            'direction': Direction(int(self._direction[car])).name,
+            'passenger_count': int(self._load[car]),
+            'capacity': int(self._capacity[car]),
+            'door_open': bool(self._door_open[car]),
+            'passengers': sorted(self._passengers[car]),
+            'floor_requests': np.flatnonzero(self._floor_requests[car]).tolist(),
+            'up_requests': np.flatnonzero(self._up_requests[car]).tolist(),
+            'down_requests': np.flatnonzero(self._down_requests[car]).tolist()
+        }
+
+class BankElevator:
+    """
+    View of a single car in an ElevatorBank.
+
+    Exposes the same interface as Elevator so dispatchers, controllers,
+    the GUI and the logger work unchanged.
+    """
+
+    def __init__(self, bank: ElevatorBank, index: int):
+        """
+        Initialize a view of one car.
+
+        Args:
+            bank: Bank holding the car's state
+            index: Position of the car in the bank's arrays
+        """
+        self._bank = bank
+        self._index = index
+
+    @property
+    def id(self) -> str:
+        return self._bank._ids[self._index]
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def current_floor(self) -> int:
+        return int(self._bank._current_floor[self._index])
+
+    @property
+    def state(self) -> ElevatorState:
+        return _STATES[self._bank._state[self._index]]
+
+    @property
+    def direction(self) -> Direction:
+        return Direction(int(self._bank._direction[self._index]))
+
+    @property
+    def speed(self) -> float:
+        return float(self._bank._speed[self._index])
+
+    @property
+    def door_open_time(self) -> float:
+        return float(self._bank._door_open_time[self._index])
+
+    @property
+    def door_operation_time(self) -> float:
+        return float(self._bank._door_operation_time[self._index])
+
+    @property
+    def service_policy(self) -> str:
+        return 'nearest'
+
+    @property
+    def served_floors(self) -> List[int]:
+        return self._bank.get_served_floors(self._index)
+
+    @property
+    def passenger_count(self) -> int:
+        return int(self._bank._load[self._index])
+
+    @property
+    def capacity(self) -> int:
+        return int(self._bank._capacity[self._index])
+
+    @property
+    def is_door_open(self) -> bool:
+        return bool(self._bank._door_open[self._index])
+
+    @property
+    def in_service(self) -> bool:
+        return self._bank.is_in_service(self._index)
+
+    @property
+    def floor_requests(self) -> Set[int]:
+        return set(np.flatnonzero(self._bank._floor_requests[self._index]).tolist())
+
+    @property
+    def pending_stops(self) -> List[int]:
+        return self._bank.get_pending_stops(self._index)
+
+    def set_clock(self, clock: SimulationClock) -> None:
+        self._bank.set_clock(clock)
+
+    def add_door_open_listener(self, listener: Callable[['BankElevator'], None]) -> None:
+        self._bank.add_door_open_listener(self._index, listener)
+
+    def add_service_state_listener(self, listener: Callable[['BankElevator'], None]) -> None:
+        self._bank.add_service_state_listener(self._index, listener)
+
+    def add_motion_listener(self, listener: Callable[['BankElevator'], None]) -> None:
+        self._bank.add_motion_listener(self._index, listener)
+
+    def set_service_state(self, state: ElevatorState) -> bool:
+        return self._bank.set_service_state(self._index, state)
+
+    def add_floor_request(self, floor: int) -> bool:
+        return self._bank.add_floor_request(self._index, floor)
+
+    def add_hall_call(self, floor: int, direction: Direction) -> bool:
+        return self._bank.add_hall_call(self._index, floor, direction)
+
+    def has_hall_call(self, floor: int, direction: Direction) -> bool:
+        return self._bank.has_hall_call(self._index, floor, direction)
+
+    def remove_hall_call(self, floor: int, direction: Direction) -> bool:
+        return self._bank.remove_hall_call(self._index, floor, direction)
+
+    def get_time_to_next_event(self) -> Optional[float]:
+        return self._bank.get_time_to_next_event(self._index)
+
+    def serves(self, floor: int) -> bool:
+        return self._bank.serves(self._index, floor)
+
+    def update(self, delta_time: float) -> None:
+        self._bank.update(delta_time, [self._index])
+
+    def add_passenger(self, passenger_id: str, destination_floor: int) -> bool:
+        return self._bank.add_passenger(self._index, passenger_id, destination_floor)
+
+    def remove_passenger(self, passenger_id: str) -> bool:
+        return self._bank.remove_passenger(self._index, passenger_id)
+
+    def get_passengers(self) -> Set[str]:
+        return self._bank._passengers[self._index].copy()
+
+    def get_status_dict(self) -> dict:
+        return self._bank.get_status_dict(self._index)
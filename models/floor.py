@@ -2,7 +2,11 @@
 Floor model representing a single floor in the building.
 """
 
-from typing import Set
+import heapq
+from collections import OrderedDict
+from itertools import count, islice
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional
 import logging
 
 class Floor:
@@ -10,6 +14,8 @@ class Floor:
     Represents a single floor in the building.
     
     This class manages floor-specific state and passenger queues.
+    Waiting passengers are kept in first-come-first-served queues per
+    direction and indexed by destination floor.
     """
     
     def __init__(self, floor_number: int):
@@ -22,8 +28,15 @@ class Floor:
         self._number = floor_number
         self._up_button_pressed = False
         self._down_button_pressed = False
-        self._waiting_passengers_up: Set[str] = set()
-        self._waiting_passengers_down: Set[str] = set()
+        
+        # Waiting passenger IDs in arrival order, mapped to their destination
+        self._waiting_passengers_up: 'OrderedDict[str, Optional[int]]' = OrderedDict()
+        self._waiting_passengers_down: 'OrderedDict[str, Optional[int]]' = OrderedDict()
+        
+        # Waiting passenger IDs in arrival order by destination floor,
+        # mapped to their arrival sequence number
+        self._waiting_by_destination: Dict[int, 'OrderedDict[str, int]'] = {}
+        self._arrivals = count()
         
         logging.debug(f"Floor {self._number} initialized")
     
@@ -40,12 +53,24 @@ class Floor:
         return self._down_button_pressed
     
     @property
-    def waiting_passengers_up(self) -> Set[str]:
-        return self._waiting_passengers_up.copy()
+    def waiting_passengers_up(self) -> List[str]:
+        return list(self._waiting_passengers_up)
     
     @property
-    def waiting_passengers_down(self) -> Set[str]:
-        return self._waiting_passengers_down.copy()
+    def waiting_passengers_down(self) -> List[str]:
+        return list(self._waiting_passengers_down)
+    
+    @property
+    def waiting_count_up(self) -> int:
+        return len(self._waiting_passengers_up)
+    
+    @property
+    def waiting_count_down(self) -> int:
+        return len(self._waiting_passengers_down)
+    
+    @property
+    def waiting_count(self) -> int:
+        return len(self._waiting_passengers_up) + len(self._waiting_passengers_down)
     
     def press_up_button(self) -> None:
         """Press the up button on this floor."""
@@ -69,18 +94,24 @@ class Floor:
         self._down_button_pressed = False
         logging.debug(f"Floor {self._number}: Down button cleared")
     
-    def add_waiting_passenger(self, passenger_id: str, going_up: bool) -> None:
+    def add_waiting_passenger(self, passenger_id: str, going_up: bool,
+                              destination_floor: int = None) -> None:
         """
-        Add a passenger waiting on this floor.
+        Add a passenger to the back of a waiting queue on this floor.
         
         Args:
             passenger_id: Unique identifier for the passenger
             going_up: True if passenger wants to go up, False for down
+            destination_floor: Floor the passenger wants to go to (optional)
         """
         if going_up:
-            self._waiting_passengers_up.add(passenger_id)
+            self._waiting_passengers_up[passenger_id] = destination_floor
         else:
-            self._waiting_passengers_down.add(passenger_id)
+            self._waiting_passengers_down[passenger_id] = destination_floor
+        
+        if destination_floor is not None:
+            self._waiting_by_destination.setdefault(
+                destination_floor, OrderedDict())[passenger_id] = next(self._arrivals)
         
         logging.debug(f"Floor {self._number}: Passenger {passenger_id} "
                      f"waiting to go {'up' if going_up else 'down'}")
@@ -95,18 +126,72 @@ class Floor:
         Returns:
             bool: True if passenger was found and removed
         """
-        removed = False
         if passenger_id in self._waiting_passengers_up:
-            self._waiting_passengers_up.remove(passenger_id)
-            removed = True
+            destination_floor = self._waiting_passengers_up.pop(passenger_id)
         elif passenger_id in self._waiting_passengers_down:
-            self._waiting_passengers_down.remove(passenger_id)
-            removed = True
+            destination_floor = self._waiting_passengers_down.pop(passenger_id)
+        else:
+            return False
+        
+        if destination_floor is not None:
+            waiting = self._waiting_by_destination[destination_floor]
+            del waiting[passenger_id]
+            if not waiting:
+                del self._waiting_by_destination[destination_floor]
         
-        if removed:
-            logging.debug(f"Floor {self._number}: Passenger {passenger_id} removed")
+        logging.debug(f"Floor {self._number}: Passenger {passenger_id} removed")
+        return True
+    
+    def next_waiting_passenger(self, going_up: bool, skip: int = 0) -> Optional[str]:
+        """
+        Get the passenger at the front of a waiting queue.
         
-        return removed
+        Args:
+            going_up: True for the up queue, False for the down queue
+            skip: Number of passengers at the front to pass over
+            
+        Returns:
+            Optional[str]: ID of the longest waiting passenger after the
+            skipped ones, or None if there is none
+        """
+        queue = self._waiting_passengers_up if going_up else self._waiting_passengers_down
+        return next(islice(queue, skip, None), None)
+    
+    def get_waiting_passengers_to(self, destination_floor: int) -> List[str]:
+        """
+        Get passengers waiting to go to a floor, in arrival order.
+        
+        Args:
+            destination_floor: Destination floor number
+            
+        Returns:
+            List[str]: IDs of passengers waiting for that destination
+        """
+        return list(self._waiting_by_destination.get(destination_floor, ()))
+    
+    def get_waiting_passengers_to_floors(self, destination_floors: Iterable[int],
+                                         limit: Optional[int] = None) -> List[str]:
+        """
+        Get passengers waiting to go to any of several floors, in arrival order.
+        
+        Only the queues of the given floors are read, so the cost does not
+        depend on how many passengers wait for other floors.
+        
+        Args:
+            destination_floors: Destination floor numbers
+            limit: Largest number of passengers to return (optional)
+            
+        Returns:
+            List[str]: IDs of the longest waiting passengers for those floors
+        """
+        queues = [self._waiting_by_destination[floor].items()
+                  for floor in destination_floors if floor in self._waiting_by_destination]
+        merged = heapq.merge(*queues, key=itemgetter(1))
+        return [passenger_id for passenger_id, _ in islice(merged, limit)]
+    
+    def get_waiting_destinations(self) -> List[int]:
+        """Get the destination floors of passengers waiting on this floor."""
+        return sorted(self._waiting_by_destination)
     
     def get_status_dict(self) -> dict:
         """Get current floor status as a dictionary."""
@@ -115,5 +200,7 @@ class Floor:
             'up_button_pressed': self._up_button_pressed,
             'down_button_pressed': self._down_button_pressed,
             'waiting_up': list(self._waiting_passengers_up),
-            'waiting_down': list(self._waiting_passengers_down)
+            'waiting_down': list(self._waiting_passengers_down),
+            'waiting_up_count': len(self._waiting_passengers_up),
+            'waiting_down_count': len(self._waiting_passengers_down)
         }
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+Building-level registry of hall calls and the cars answering them.
+"""
+
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from .elevator import Direction
+
+class HallCall(NamedTuple):
+    """A hall call waiting to be answered by a car of a zone (None for any car)."""
+    floor: int
+    direction: Direction
+    zone: Optional[str] = None
+
+class HallCallRegistry:
+    """
+    Tracks the unanswered hall calls of a building by floor and direction.
+
+    A call is registered once however many passengers press the same
+    button, and records the car assigned to answer it (None while it waits
+    for a dispatch cycle or for a car in service). Calls are kept in the
+    order they were first made, and the calls of each car are indexed so
+    they can be handed to other cars when it goes out of service.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._calls: Dict[HallCall, Optional[str]] = {}
+        self._calls_by_car: Dict[str, Dict[HallCall, None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, call: HallCall) -> bool:
+        return call in self._calls
+
+    def __iter__(self) -> Iterator[HallCall]:
+        return iter(list(self._calls))
+
+    def items(self) -> List[Tuple[HallCall, Optional[str]]]:
+        """Get every call and its assigned car, oldest call first."""
+        return list(self._calls.items())
+
+    def get_car(self, call: HallCall) -> Optional[str]:
+        """Get the ID of the car assigned to a call, if any."""
+        return self._calls.get(call)
+
+    def get_calls(self, elevator_id: str) -> List[HallCall]:
+        """Get the calls assigned to a car, oldest first."""
+        return list(self._calls_by_car.get(elevator_id, ()))
+
+    def get_unassigned(self) -> List[HallCall]:
+        """Get the calls no car is assigned to, oldest first."""
+        return [call for call, elevator_id in self._calls.items() if elevator_id is None]
+
+    def assign(self, call: HallCall, elevator_id: Optional[str]) -> None:
+        """
+        Record the car answering a call, registering the call if needed.
+
+        Args:
+            call: The hall call
+            elevator_id: ID of the assigned car, or None to leave it unassigned
+        """
+        previous = self._calls.get(call)
+        if previous is not None:
+            self._calls_by_car[previous].pop(call, None)
+
+        self._calls[call] = elevator_id
+        if elevator_id is not None:
+            self._calls_by_car.setdefault(elevator_id, {})[call] = None
+
+    def release(self, call: HallCall) -> Optional[str]:
+        """
+        Remove an answered call.
+
+        Args:
+            call: The hall call
+
+        Returns:
+            Optional[str]: ID of the car that was assigned to it, if any
+        """
+        elevator_id = self._calls.pop(call, None)
+        if elevator_id is not None:
+            self._calls_by_car[elevator_id].pop(call, None)
+        return elevator_id
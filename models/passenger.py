@@ -4,8 +4,8 @@ Passenger model representing individuals using the elevator system.
 
 from enum import Enum
 from typing import Optional
-import time
 import logging
+from .clock import SimulationClock, RealTimeClock
 
 class PassengerState(Enum):
     """Enumeration of possible passenger states."""
@@ -21,7 +21,8 @@ class Passenger:
     """
     
     def __init__(self, passenger_id: str, origin_floor: int, 
-                 destination_floor: int, arrival_time: float = None):
+                 destination_floor: int, arrival_time: float = None,
+                 clock: SimulationClock = None):
         """
         Initialize a passenger instance.
         
@@ -30,7 +31,9 @@ class Passenger:
             origin_floor: Floor where passenger starts
             destination_floor: Floor where passenger wants to go
             arrival_time: When passenger arrived (defaults to current time)
+            clock: Clock providing the current time (defaults to real time)
         """
+        self._clock = clock or RealTimeClock()
         self._id = passenger_id
         self._origin_floor = origin_floor
         self._destination_floor = destination_floor
@@ -38,7 +41,7 @@ class Passenger:
         self._elevator_id: Optional[str] = None
         
         # Timing information
-        self._arrival_time = arrival_time or time.time()
+        self._arrival_time = arrival_time if arrival_time is not None else self._clock.now()
         self._board_time: Optional[float] = None
         self._arrival_at_destination_time: Optional[float] = None
         
@@ -57,6 +60,10 @@ class Passenger:
     def destination_floor(self) -> int:
         return self._destination_floor
     
+    @property
+    def arrival_time(self) -> float:
+        return self._arrival_time
+    
     @property
     def state(self) -> PassengerState:
         return self._state
@@ -73,16 +80,26 @@ class Passenger:
         """
         Mark passenger as having boarded an elevator.
         
+        The board time is only recorded for the first car of a journey, so
+        waiting time excludes the waits at transfer floors.
+        
         Args:
             elevator_id: ID of the elevator being boarded
             board_time: Time of boarding (defaults to current time)
         """
         self._state = PassengerState.IN_ELEVATOR
         self._elevator_id = elevator_id
-        self._board_time = board_time or time.time()
+        if self._board_time is None:
+            self._board_time = board_time if board_time is not None else self._clock.now()
         
         logging.debug(f"Passenger {self._id} boarded elevator {elevator_id}")
     
+    def start_transfer(self) -> None:
+        """Mark passenger as waiting at a transfer floor for their next car."""
+        self._state = PassengerState.WAITING
+        
+        logging.debug(f"Passenger {self._id} is transferring")
+    
     def arrive_at_destination(self, arrival_time: float = None) -> None:
         """
         Mark passenger as having arrived at destination.
@@ -91,25 +108,26 @@ class Passenger:
             arrival_time: Time of arrival (defaults to current time)
         """
         self._state = PassengerState.ARRIVED
-        self._arrival_at_destination_time = arrival_time or time.time()
+        self._arrival_at_destination_time = (arrival_time if arrival_time is not None
+                                             else self._clock.now())
         
         logging.debug(f"Passenger {self._id} arrived at destination")
     
     def get_wait_time(self) -> Optional[float]:
         """Get time spent waiting for elevator."""
-        if self._board_time:
+        if self._board_time is not None:
             return self._board_time - self._arrival_time
         return None
     
     def get_travel_time(self) -> Optional[float]:
         """Get time spent in elevator."""
-        if self._board_time and self._arrival_at_destination_time:
+        if self._board_time is not None and self._arrival_at_destination_time is not None:
             return self._arrival_at_destination_time - self._board_time
         return None
     
     def get_total_time(self) -> Optional[float]:
         """Get total time from arrival to destination."""
-        if self._arrival_at_destination_time:
+        if self._arrival_at_destination_time is not None:
             return self._arrival_at_destination_time - self._arrival_time
         return None
     
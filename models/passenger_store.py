@@ -0,0 +1,420 @@
+"""
+Columnar passenger store holding passenger data in compact arrays.
+"""
+
+import math
+from array import array
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import logging
+from .passenger import PassengerState
+from .clock import SimulationClock, RealTimeClock
+
+# Integer codes used to store passenger states in arrays
+_STATES = list(PassengerState)
+_STATE_CODES = {state: code for code, state in enumerate(_STATES)}
+
+# Elevator index stored for passengers that have not boarded
+_NO_ELEVATOR = -1
+
+# Time stored for events that have not happened yet
+_UNSET = math.nan
+
+class JourneyLog:
+    """
+    Append-only columnar log of completed passenger journeys.
+
+    Each journey takes about 42 bytes across typed arrays.
+    """
+
+    def __init__(self, elevator_ids: List[str], id_prefix: str = "P"):
+        """
+        Initialize an empty journey log.
+
+        Args:
+            elevator_ids: Elevator IDs referenced by index (shared with the store)
+            id_prefix: Prefix of passenger IDs
+        """
+        self._elevator_ids = elevator_ids
+        self._id_prefix = id_prefix
+
+        self._number = array('q')
+        self._origin_floor = array('i')
+        self._destination_floor = array('i')
+        self._elevator = array('h')
+        self._arrival_time = array('d')
+        self._board_time = array('d')
+        self._destination_arrival_time = array('d')
+
+    def __len__(self) -> int:
+        return len(self._number)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self.get_journey(index) for index in range(len(self._number)))
+
+    def append(self, number: int, origin_floor: int, destination_floor: int,
+               elevator: int, arrival_time: float, board_time: float,
+               destination_arrival_time: float) -> int:
+        """
+        Append a completed journey.
+
+        Returns:
+            int: Index of the journey in the log
+        """
+        self._number.append(number)
+        self._origin_floor.append(origin_floor)
+        self._destination_floor.append(destination_floor)
+        self._elevator.append(elevator)
+        self._arrival_time.append(arrival_time)
+        self._board_time.append(board_time)
+        self._destination_arrival_time.append(destination_arrival_time)
+        return len(self._number) - 1
+
+    def get_journey(self, index: int) -> Dict[str, Any]:
+        """
+        Get a completed journey as a dictionary.
+
+        Args:
+            index: Index of the journey in the log
+
+        Returns:
+            Dict[str, Any]: Passenger, floors, elevator, event times and durations
+        """
+        elevator = self._elevator[index]
+        arrival_time = self._arrival_time[index]
+        board_time = self._board_time[index]
+        destination_arrival_time = self._destination_arrival_time[index]
+        boarded = not math.isnan(board_time)
+        return {
+            'passenger_id': f"{self._id_prefix}{self._number[index]:04d}",
+            'origin_floor': self._origin_floor[index],
+            'destination_floor': self._destination_floor[index],
+            'elevator_id': (None if elevator == _NO_ELEVATOR
+                            else self._elevator_ids[elevator]),
+            'arrival_time': arrival_time,
+            'board_time': board_time if boarded else None,
+            'destination_arrival_time': destination_arrival_time,
+            'wait_time': board_time - arrival_time if boarded else None,
+            'travel_time': destination_arrival_time - board_time if boarded else None,
+            'total_time': destination_arrival_time - arrival_time
+        }
+
+    def get_wait_times(self) -> List[float]:
+        """Get the wait times of journeys that boarded an elevator."""
+        return [board - arrival
+                for arrival, board in zip(self._arrival_time, self._board_time)
+                if not math.isnan(board)]
+
+    def get_travel_times(self) -> List[float]:
+        """Get the in-elevator times of journeys that boarded an elevator."""
+        return [alight - board
+                for board, alight in zip(self._board_time, self._destination_arrival_time)
+                if not math.isnan(board)]
+
+    def get_total_times(self) -> List[float]:
+        """Get the times from arrival to destination of all journeys."""
+        return [alight - arrival
+                for arrival, alight in zip(self._arrival_time,
+                                           self._destination_arrival_time)]
+
+class PassengerStore(Mapping):
+    """
+    Stores waiting and riding passengers column by column in typed arrays.
+
+    Each passenger takes one slot in the origin, destination, state,
+    elevator and time arrays instead of a full Python object. When a
+    passenger arrives at their destination the journey is appended to a
+    compact JourneyLog, passed to the journey listeners and the slot is
+    reused, so the store only grows with the number of passengers in the
+    building at once. The store is a read-only mapping from passenger ID
+    to a PassengerView with the same interface as Passenger.
+    """
+
+    def __init__(self, clock: SimulationClock = None, id_prefix: str = "P"):
+        """
+        Initialize an empty passenger store.
+
+        Args:
+            clock: Clock providing the current time (defaults to real time)
+            id_prefix: Prefix of generated passenger IDs
+        """
+        self._clock = clock or RealTimeClock()
+        self._id_prefix = id_prefix
+
+        self._number = array('q')
+        self._origin_floor = array('i')
+        self._destination_floor = array('i')
+        self._state = array('b')
+        self._elevator = array('h')
+        self._arrival_time = array('d')
+        self._board_time = array('d')
+        self._destination_arrival_time = array('d')
+
+        # Live passenger IDs mapped to their slot, and slots free for reuse
+        self._slots: Dict[str, int] = {}
+        self._free_slots: List[int] = []
+        self._total_count = 0
+
+        # Elevator IDs are stored once and referenced by index
+        self._elevator_ids: List[str] = []
+        self._elevator_indices: Dict[str, int] = {}
+
+        self._journeys = JourneyLog(self._elevator_ids, id_prefix)
+        self._journey_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    def set_clock(self, clock: SimulationClock) -> None:
+        """
+        Set the clock used for default event times.
+
+        Args:
+            clock: Clock providing the current time
+        """
+        self._clock = clock
+
+    @property
+    def journeys(self) -> JourneyLog:
+        """Get the log of completed journeys."""
+        return self._journeys
+
+    @property
+    def total_count(self) -> int:
+        """Get the number of passengers ever added."""
+        return self._total_count
+
+    @property
+    def active_count(self) -> int:
+        """Get the number of passengers waiting or riding."""
+        return len(self._slots)
+
+    def add_journey_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Register a function to call with each completed journey.
+
+        Args:
+            listener: Function called with the journey dictionary
+                (see JourneyLog.get_journey)
+        """
+        self._journey_listeners.append(listener)
+
+    def add(self, origin_floor: int, destination_floor: int,
+            arrival_time: float = None) -> str:
+        """
+        Add a waiting passenger.
+
+        Args:
+            origin_floor: Floor where passenger starts
+            destination_floor: Floor where passenger wants to go
+            arrival_time: When passenger arrived (defaults to current time)
+
+        Returns:
+            str: ID of the new passenger
+        """
+        self._total_count += 1
+        if arrival_time is None:
+            arrival_time = self._clock.now()
+        values = (self._total_count, origin_floor, destination_floor,
+                  _STATE_CODES[PassengerState.WAITING], _NO_ELEVATOR,
+                  arrival_time, _UNSET, _UNSET)
+
+        if self._free_slots:
+            index = self._free_slots.pop()
+            for column, value in zip(self._columns(), values):
+                column[index] = value
+        else:
+            index = len(self._number)
+            for column, value in zip(self._columns(), values):
+                column.append(value)
+
+        passenger_id = self.get_id(index)
+        self._slots[passenger_id] = index
+
+        logging.debug(f"Passenger {passenger_id} created: "
+                     f"{origin_floor} -> {destination_floor}")
+        return passenger_id
+
+    def _columns(self) -> tuple:
+        """Get the per-passenger arrays in the order add() fills them."""
+        return (self._number, self._origin_floor, self._destination_floor,
+                self._state, self._elevator, self._arrival_time,
+                self._board_time, self._destination_arrival_time)
+
+    def get_id(self, index: int) -> str:
+        """Get the ID of the passenger in a slot."""
+        return f"{self._id_prefix}{self._number[index]:04d}"
+
+    def get_index(self, passenger_id: str) -> Optional[int]:
+        """
+        Get the slot of a waiting or riding passenger.
+
+        Args:
+            passenger_id: Passenger ID generated by this store
+
+        Returns:
+            Optional[int]: Slot number, or None if the passenger is not live
+        """
+        return self._slots.get(passenger_id)
+
+    def __getitem__(self, passenger_id: str) -> 'PassengerView':
+        index = self._slots.get(passenger_id)
+        if index is None:
+            raise KeyError(passenger_id)
+        return PassengerView(self, index)
+
+    def __contains__(self, passenger_id) -> bool:
+        return passenger_id in self._slots
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._slots)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def board(self, index: int, elevator_id: str, board_time: float = None) -> None:
+        """Mark a passenger as having boarded an elevator (see Passenger)."""
+        elevator_index = self._elevator_indices.get(elevator_id)
+        if elevator_index is None:
+            elevator_index = len(self._elevator_ids)
+            self._elevator_ids.append(elevator_id)
+            self._elevator_indices[elevator_id] = elevator_index
+
+        self._state[index] = _STATE_CODES[PassengerState.IN_ELEVATOR]
+        self._elevator[index] = elevator_index
+        if math.isnan(self._board_time[index]):
+            self._board_time[index] = board_time if board_time is not None else self._clock.now()
+
+        logging.debug(f"Passenger {self.get_id(index)} boarded elevator {elevator_id}")
+
+    def start_transfer(self, index: int) -> None:
+        """Mark a passenger as waiting for their next car (see Passenger)."""
+        self._state[index] = _STATE_CODES[PassengerState.WAITING]
+
+        logging.debug(f"Passenger {self.get_id(index)} is transferring")
+
+    def arrive(self, index: int, arrival_time: float = None) -> None:
+        """
+        Mark a passenger as arrived and retire them to the journey log.
+
+        The slot is reused afterwards, so views of the passenger must not
+        be used once this returns.
+
+        Args:
+            index: Slot of the passenger
+            arrival_time: Time of arrival (defaults to current time)
+        """
+        passenger_id = self.get_id(index)
+        if arrival_time is None:
+            arrival_time = self._clock.now()
+
+        journey = self._journeys.append(
+            self._number[index], self._origin_floor[index],
+            self._destination_floor[index], self._elevator[index],
+            self._arrival_time[index], self._board_time[index], arrival_time)
+
+        self._state[index] = _STATE_CODES[PassengerState.ARRIVED]
+        del self._slots[passenger_id]
+        self._free_slots.append(index)
+
+        logging.debug(f"Passenger {passenger_id} arrived at destination")
+
+        if self._journey_listeners:
+            journey_data = self._journeys.get_journey(journey)
+            for listener in self._journey_listeners:
+                listener(journey_data)
+
+class PassengerView:
+    """
+    View of one passenger in a PassengerStore.
+
+    Exposes the same interface as Passenger so controllers and the GUI
+    work unchanged. A view is only valid until the passenger arrives.
+    """
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: PassengerStore, index: int):
+        """
+        Initialize a view of one passenger.
+
+        Args:
+            store: Store holding the passenger's data
+            index: Slot of the passenger in the store's arrays
+        """
+        self._store = store
+        self._index = index
+
+    @property
+    def id(self) -> str:
+        return self._store.get_id(self._index)
+
+    @property
+    def origin_floor(self) -> int:
+        return self._store._origin_floor[self._index]
+
+    @property
+    def destination_floor(self) -> int:
+        return self._store._destination_floor[self._index]
+
+    @property
+    def arrival_time(self) -> float:
+        return self._store._arrival_time[self._index]
+
+    @property
+    def state(self) -> PassengerState:
+        return _STATES[self._store._state[self._index]]
+
+    @property
+    def elevator_id(self) -> Optional[str]:
+        elevator_index = self._store._elevator[self._index]
+        if elevator_index == _NO_ELEVATOR:
+            return None
+        return self._store._elevator_ids[elevator_index]
+
+    @property
+    def wants_to_go_up(self) -> bool:
+        return self.destination_floor > self.origin_floor
+
+    def board_elevator(self, elevator_id: str, board_time: float = None) -> None:
+        self._store.board(self._index, elevator_id, board_time)
+
+    def start_transfer(self) -> None:
+        self._store.start_transfer(self._index)
+
+    def arrive_at_destination(self, arrival_time: float = None) -> None:
+        self._store.arrive(self._index, arrival_time)
+
+    def get_wait_time(self) -> Optional[float]:
+        board_time = self._store._board_time[self._index]
+        if math.isnan(board_time):
+            return None
+        return board_time - self._store._arrival_time[self._index]
+
+    def get_travel_time(self) -> Optional[float]:
+        board_time = self._store._board_time[self._index]
+        destination_arrival_time = self._store._destination_arrival_time[self._index]
+        if math.isnan(board_time) or math.isnan(destination_arrival_time):
+            return None
+        return destination_arrival_time - board_time
+
+    def get_total_time(self) -> Optional[float]:
+        destination_arrival_time = self._store._destination_arrival_time[self._index]
+        if math.isnan(destination_arrival_time):
+            return None
+        return destination_arrival_time - self._store._arrival_time[self._index]
+
+    def get_status_dict(self) -> dict:
+        board_time = self._store._board_time[self._index]
+        destination_arrival_time = self._store._destination_arrival_time[self._index]
+        return {
+            'id': self.id,
+            'origin_floor': self.origin_floor,
+            'destination_floor': self.destination_floor,
+            'state': self.state.value,
+            'elevator_id': self.elevator_id,
+            'arrival_time': self._store._arrival_time[self._index],
+            'board_time': None if math.isnan(board_time) else board_time,
+            'destination_arrival_time': (None if math.isnan(destination_arrival_time)
+                                         else destination_arrival_time),
+            'wait_time': self.get_wait_time(),
+            'travel_time': self.get_travel_time(),
+            'total_time': self.get_total_time()
+        }
@@ -0,0 +1,193 @@
+"""
+Ordered index of the floors an elevator has been asked to stop at.
+"""
+
+from typing import List, Optional
+
+class FloorRequestIndex:
+    """
+    Per-floor bitmasks of car calls and up/down hall calls.
+
+    Each kind of request is an integer bitmask with bit n set when floor n
+    is requested, and a union mask tracks every requested floor. Stop
+    checks are a single bit test, and the next request above or below a
+    floor is found with shifts and bit_length on the union mask instead of
+    rebuilding and scanning sets of floors. Floor numbers must not be
+    negative.
+    """
+
+    def __init__(self):
+        """Initialize an empty request index."""
+        self._car_calls = 0
+        self._up_calls = 0
+        self._down_calls = 0
+        self._all_calls = 0
+
+    def __bool__(self) -> bool:
+        return self._all_calls != 0
+
+    @staticmethod
+    def _floors(mask: int) -> List[int]:
+        """Get the floors set in a mask in ascending order."""
+        floors = []
+        while mask:
+            lowest = mask & -mask
+            floors.append(lowest.bit_length() - 1)
+            mask ^= lowest
+        return floors
+
+    @property
+    def floors(self) -> List[int]:
+        """Get every requested floor in ascending order."""
+        return self._floors(self._all_calls)
+
+    @property
+    def car_calls(self) -> List[int]:
+        return self._floors(self._car_calls)
+
+    @property
+    def up_calls(self) -> List[int]:
+        return self._floors(self._up_calls)
+
+    @property
+    def down_calls(self) -> List[int]:
+        return self._floors(self._down_calls)
+
+    def add_car_call(self, floor: int) -> None:
+        """Add a request from a button inside the car."""
+        bit = 1 << floor
+        self._car_calls |= bit
+        self._all_calls |= bit
+
+    def add_up_call(self, floor: int) -> None:
+        """Add an up hall call."""
+        bit = 1 << floor
+        self._up_calls |= bit
+        self._all_calls |= bit
+
+    def add_down_call(self, floor: int) -> None:
+        """Add a down hall call."""
+        bit = 1 << floor
+        self._down_calls |= bit
+        self._all_calls |= bit
+
+    def clear_car_call(self, floor: int) -> None:
+        """Clear the car call for a floor."""
+        self._car_calls &= ~(1 << floor)
+        self._update_all_calls(floor)
+
+    def clear_up_call(self, floor: int) -> None:
+        """Clear the up hall call for a floor."""
+        self._up_calls &= ~(1 << floor)
+        self._update_all_calls(floor)
+
+    def clear_down_call(self, floor: int) -> None:
+        """Clear the down hall call for a floor."""
+        self._down_calls &= ~(1 << floor)
+        self._update_all_calls(floor)
+
+    def _update_all_calls(self, floor: int) -> None:
+        """Recompute the union bit of one floor."""
+        bit = 1 << floor
+        if (self._car_calls | self._up_calls | self._down_calls) & bit:
+            self._all_calls |= bit
+        else:
+            self._all_calls &= ~bit
+
+    def clear_hall_calls(self) -> None:
+        """Clear every up and down hall call, keeping car calls."""
+        self._up_calls = 0
+        self._down_calls = 0
+        self._all_calls = self._car_calls
+
+    def clear_floor(self, floor: int) -> None:
+        """Clear every request for a floor."""
+        bit = ~(1 << floor)
+        self._car_calls &= bit
+        self._up_calls &= bit
+        self._down_calls &= bit
+        self._all_calls &= bit
+
+    def has_request(self, floor: int) -> bool:
+        """Check if a floor has any request."""
+        return (self._all_calls >> floor) & 1 == 1
+
+    def has_car_call(self, floor: int) -> bool:
+        return (self._car_calls >> floor) & 1 == 1
+
+    def has_up_call(self, floor: int) -> bool:
+        return (self._up_calls >> floor) & 1 == 1
+
+    def has_down_call(self, floor: int) -> bool:
+        return (self._down_calls >> floor) & 1 == 1
+
+    def has_requests_above(self, floor: int) -> bool:
+        """Check if any floor above the given floor is requested."""
+        return (self._all_calls >> (floor + 1)) != 0
+
+    def has_requests_below(self, floor: int) -> bool:
+        """Check if any floor below the given floor is requested."""
+        return (self._all_calls & ((1 << floor) - 1)) != 0
+
+    def next_above(self, floor: int) -> Optional[int]:
+        """
+        Get the closest requested floor above a floor.
+
+        Args:
+            floor: Reference floor (excluded)
+
+        Returns:
+            Optional[int]: Closest requested floor above, or None
+        """
+        above = self._all_calls >> (floor + 1)
+        if not above:
+            return None
+        return floor + (above & -above).bit_length()
+
+    def next_below(self, floor: int) -> Optional[int]:
+        """
+        Get the closest requested floor below a floor.
+
+        Args:
+            floor: Reference floor (excluded)
+
+        Returns:
+            Optional[int]: Closest requested floor below, or None
+        """
+        below = self._all_calls & ((1 << floor) - 1)
+        if not below:
+            return None
+        return below.bit_length() - 1
+
+    def nearest(self, floor: int) -> Optional[int]:
+        """
+        Get the requested floor closest to a floor, preferring lower floors on ties.
+
+        Args:
+            floor: Reference floor (included)
+
+        Returns:
+            Optional[int]: Closest requested floor, or None if there are no requests
+        """
+        if self.has_request(floor):
+            return floor
+
+        above = self.next_above(floor)
+        below = self.next_below(floor)
+        if above is None:
+            return below
+        if below is None:
+            return above
+        return below if floor - below <= above - floor else above
+
+    def lowest(self) -> Optional[int]:
+        """Get the lowest requested floor."""
+        if not self._all_calls:
+            return None
+        return (self._all_calls & -self._all_calls).bit_length() - 1
+
+    def highest(self) -> Optional[int]:
+        """Get the highest requested floor."""
+        if not self._all_calls:
+            return None
+        return self._all_calls.bit_length() - 1
@@ -0,0 +1,226 @@
+"""
+Service zones of a building and passenger routes across them.
+"""
+
+import bisect
+import heapq
+import itertools
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+def parse_floor_set(text: str) -> List[int]:
+    """
+    Parse a served floor set such as "1-20;40".
+
+    Args:
+        text: Floors and inclusive floor ranges separated by ';'
+
+    Returns:
+        List[int]: Distinct floors in ascending order
+
+    Raises:
+        ValueError: If a part is not a floor or a range of floors
+    """
+    floors = set()
+    for part in text.split(';'):
+        part = part.strip()
+        if not part:
+            continue
+        low, separator, high = part.partition('-')
+        try:
+            first = int(low)
+            last = int(high) if separator else first
+        except ValueError:
+            raise ValueError(f"Invalid served floors: {text!r}") from None
+        if last < first:
+            raise ValueError(f"Invalid floor range in served floors: {part!r}")
+        floors.update(range(first, last + 1))
+
+    if not floors:
+        raise ValueError(f"No floors in served floors: {text!r}")
+    return sorted(floors)
+
+def format_floor_set(floors: Iterable[int]) -> str:
+    """
+    Format floors in the notation read by parse_floor_set.
+
+    Args:
+        floors: Floor numbers
+
+    Returns:
+        str: Runs of consecutive floors as ranges, e.g. "1-20;40"
+    """
+    parts = []
+    ordered = sorted(set(floors))
+    start = 0
+    for index, floor in enumerate(ordered):
+        if index + 1 == len(ordered) or ordered[index + 1] != floor + 1:
+            first = ordered[start]
+            parts.append(str(first) if first == floor else f"{first}-{floor}")
+            start = index + 1
+    return ';'.join(parts)
+
+class Leg(NamedTuple):
+    """One ride of a passenger's route, taken in a car of one zone."""
+    origin: int
+    destination: int
+    zone: Optional[str]
+
+class ZoneMap:
+    """
+    Groups cars into service zones by the floors they serve.
+
+    Cars serving exactly the same floors form a zone, named after its
+    floors (e.g. "1-20;40"), and answer the hall calls made for that zone.
+    A building whose cars all serve every floor has a single unnamed zone
+    (None), so hall calls and routes are the same as without zoning.
+    Passengers whose origin and destination share no zone transfer at
+    floors served by several zones, such as sky lobbies, choosing the
+    rides with the fewest stops, so express zones carry passengers past
+    the floors they skip.
+    """
+
+    def __init__(self, num_floors: int, served_floors: Sequence[Tuple[str, Iterable[int]]]):
+        """
+        Initialize the zones of a building.
+
+        Args:
+            num_floors: Number of floors in the building
+            served_floors: (car ID, served floors) for every car in
+                configuration order
+        """
+        all_floors = frozenset(range(1, num_floors + 1))
+        self._zone_of: Dict[str, Optional[str]] = {}
+        self._cars: Dict[Optional[str], List[str]] = {}
+        self._floors: Dict[Optional[str], frozenset] = {}
+        self._sorted_floors: Dict[Optional[str], List[int]] = {}
+
+        floor_sets = [(car_id, frozenset(floors)) for car_id, floors in served_floors]
+        self._zoned = any(floors != all_floors for _, floors in floor_sets)
+        for car_id, floors in floor_sets:
+            zone = format_floor_set(floors) if self._zoned else None
+            self._zone_of[car_id] = zone
+            self._cars.setdefault(zone, []).append(car_id)
+            self._floors[zone] = floors
+            self._sorted_floors[zone] = sorted(floors)
+
+        # Floors where passengers can change between zones
+        served_by = {}
+        for floors in self._floors.values():
+            for floor in floors:
+                served_by[floor] = served_by.get(floor, 0) + 1
+        self._transfer_floors = sorted(floor for floor, count in served_by.items()
+                                       if count > 1)
+        self._routes: Dict[Tuple[int, int], Optional[List[Leg]]] = {}
+
+    @property
+    def is_zoned(self) -> bool:
+        """Check if any car serves only some of the floors."""
+        return self._zoned
+
+    @property
+    def zones(self) -> List[Optional[str]]:
+        """Get the zone names in configuration order."""
+        return list(self._cars)
+
+    @property
+    def transfer_floors(self) -> List[int]:
+        """Get the floors served by more than one zone, ascending."""
+        return list(self._transfer_floors)
+
+    def get_zone(self, elevator_id: str) -> Optional[str]:
+        """Get the zone of a car."""
+        return self._zone_of.get(elevator_id)
+
+    def get_cars(self, zone: Optional[str]) -> List[str]:
+        """Get the IDs of the cars in a zone, in configuration order."""
+        return list(self._cars.get(zone, ()))
+
+    def get_floors(self, zone: Optional[str]) -> frozenset:
+        """Get the floors served by the cars of a zone."""
+        return self._floors.get(zone, frozenset())
+
+    def zones_serving(self, floor: int) -> List[Optional[str]]:
+        """Get the zones whose cars stop at a floor, in configuration order."""
+        return [zone for zone, floors in self._floors.items() if floor in floors]
+
+    def default_zone(self, floor: int) -> Optional[str]:
+        """Get the first zone serving a floor, which answers hall calls made without a zone."""
+        return next(iter(self.zones_serving(floor)), None)
+
+    def spread_floors(self, zone: Optional[str]) -> List[int]:
+        """
+        Space the cars of a zone evenly over the floors it serves.
+
+        The first car parks at the zone's lowest floor, its lobby, and the
+        others at equal steps above it, so a warm-started bank starts with
+        a car near every part of the zone.
+
+        Args:
+            zone: Zone whose cars to place
+
+        Returns:
+            List[int]: Parking floor of each car of the zone, in
+            configuration order
+        """
+        floors = sorted(self.get_floors(zone))
+        count = len(self._cars.get(zone, ()))
+        return [floors[car * len(floors) // count] for car in range(count)]
+
+    def route(self, origin: int, destination: int) -> Optional[List[Leg]]:
+        """
+        Plan the rides taking a passenger from one floor to another.
+
+        Routes make as few stops as possible, counting every floor a ride
+        passes that its zone serves, since the car may stop there; then
+        as few rides and floors of travel as possible. Ties go to the
+        zone configured first.
+
+        Args:
+            origin: Floor where the passenger starts
+            destination: Floor the passenger wants to go to
+
+        Returns:
+            Optional[List[Leg]]: Rides in order, or None if no combination
+            of zones connects the floors
+        """
+        if not self._zoned or origin == destination:
+            return [Leg(origin, destination, self.default_zone(origin))]
+
+        key = (origin, destination)
+        if key not in self._routes:
+            self._routes[key] = self._plan_route(origin, destination)
+        route = self._routes[key]
+        return list(route) if route is not None else None
+
+    def _count_stops(self, zone: Optional[str], origin: int, destination: int) -> int:
+        """Count the floors a ride's zone serves after its origin, up to its destination."""
+        floors = self._sorted_floors.get(zone, [])
+        low, high = min(origin, destination), max(origin, destination)
+        return bisect.bisect_left(floors, high) - bisect.bisect_right(floors, low) + 1
+
+    def _plan_route(self, origin: int, destination: int) -> Optional[List[Leg]]:
+        """Find the best route with a shortest-path search over transfer floors."""
+        stops = sorted(set(self._transfer_floors) | {origin, destination})
+        sequence = itertools.count()
+        agenda = [(0, 0, 0, next(sequence), origin, [])]
+        settled = set()
+
+        while agenda:
+            cost, rides, distance, _, floor, legs = heapq.heappop(agenda)
+            if floor == destination:
+                return legs
+            if floor in settled:
+                continue
+            settled.add(floor)
+
+            for zone, floors in self._floors.items():
+                if floor not in floors:
+                    continue
+                for stop in stops:
+                    if stop != floor and stop in floors and stop not in settled:
+                        heapq.heappush(agenda, (cost + self._count_stops(zone, floor, stop),
+                                                rides + 1, distance + abs(stop - floor),
+                                                next(sequence), stop,
+                                                legs + [Leg(floor, stop, zone)]))
+
+        return None
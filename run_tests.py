@@ -105,6 +105,1229 @@ def run_basic_tests():
     except Exception as e:
         print(f"❌ Logging test failed: {e}")
     
+    # Test 5: Discrete-event engine
+    try:
+        from simulation.discrete_event import DiscreteEventEngine
+        from controllers.simulation_controller import SimulationController
+        from simulation.logger import SimulationLogger
+        from models.clock import VirtualClock
+        import random
+        import tempfile
+        import shutil
+        
+        temp_dir = tempfile.mkdtemp()
+        clock = VirtualClock()
+        building = Building("des_building", 10, [
+            {'id': 'car_1', 'capacity': 8, 'speed': 2.0},
+            {'id': 'car_2', 'capacity': 8, 'speed': 2.0}
+        ], clock)
+        controller = SimulationController(building, SimulationLogger(temp_dir, clock),
+                                          clock)
+        sim_config_path = os.path.join(temp_dir, "quiet_simulation.csv")
+        with open(sim_config_path, "w") as f:
+            f.write("section,duration,passenger_arrival_rate\nsimulation,120,0\n")
+        
+        engine = DiscreteEventEngine(building, controller,
+                                     SimulationConfig(sim_config_path),
+                                     rng=random.Random(1), clock=clock)
+        engine.schedule_passenger(5.0, 1, 8)
+        engine.run(120)
+        
+        journeys = list(controller.journeys)
+        if (len(journeys) == 1 and journeys[0]['passenger_id'] == "P0001" and
+                journeys[0]['total_time'] > 0 and "P0001" not in controller.passengers):
+            print("✅ Discrete-event engine passed")
+        else:
+            print("❌ Discrete-event engine failed")
+        
+        shutil.rmtree(temp_dir)
+        
+    except Exception as e:
+        print(f"❌ Discrete-event test failed: {e}")
+    
+    # Test 6: Vectorized elevator bank
+    try:
+        import numpy
+    except ImportError:
+        print("⏭️  Vectorized elevator bank skipped (NumPy not installed)")
+    else:
+        try:
+            elevators = [{'id': f'car_{i}', 'capacity': 8, 'speed': 1.0 + i}
+                         for i in range(3)]
+            scalar = Building("scalar", 12, elevators)
+            vectorized = Building("vectorized", 12, elevators, vectorized=True)
+            
+            for building in (scalar, vectorized):
+                building.get_elevator('car_0').add_floor_request(9)
+                building.get_elevator('car_1').add_floor_request(4)
+                building.get_elevator('car_2').add_passenger("P1", 12)
+            
+            matches = True
+            for _ in range(400):
+                scalar.update(0.1)
+                vectorized.update(0.1)
+                for elevator_id in scalar.elevators:
+                    if (scalar.get_elevator(elevator_id).get_status_dict() !=
+                            vectorized.get_elevator(elevator_id).get_status_dict()):
+                        matches = False
+            
+            if matches:
+                print("✅ Vectorized elevator bank passed")
+            else:
+                print("❌ Vectorized elevator bank diverged from scalar elevators")
+            
+        except Exception as e:
+            print(f"❌ Vectorized elevator bank test failed: {e}")
+    
+    # Test 7: Destination dispatch
+    try:
+        from simulation.discrete_event import DiscreteEventEngine
+        from controllers.simulation_controller import SimulationController
+        from simulation.logger import SimulationLogger
+        from models.clock import VirtualClock
+        
+        clock = VirtualClock()
+        building = Building("destination_building", 12, [
+            {'id': 'car_1', 'capacity': 8, 'speed': 2.0},
+            {'id': 'car_2', 'capacity': 8, 'speed': 2.0}
+        ], clock)
+        controller = SimulationController(building, SimulationLogger(clock=clock), clock,
+                                          dispatch_mode="destination")
+        config = SimulationConfig()
+        config.update_simulation_params({'passenger_arrival_rate': 0})
+        engine = DiscreteEventEngine(building, controller, config, clock=clock)
+        for i, destination in enumerate([9, 5, 9, 5, 9, 5]):
+            engine.schedule_passenger(1.0 + i * 0.5, 1, destination)
+        engine.run(120)
+        
+        # Riders sharing a destination share a car and a stop
+        stops_saved = controller.elevator_controller.get_stops_saved()
+        if len(controller.journeys) == 6 and sum(stops_saved.values()) == 4:
+            print("✅ Destination dispatch passed")
+        else:
+            print(f"❌ Destination dispatch failed: {len(controller.journeys)} journeys, "
+                  f"stops saved {stops_saved}")
+        
+    except Exception as e:
+        print(f"❌ Destination dispatch test failed: {e}")
+    
+    # Test 8: Batch hall call assignment
+    try:
+        from controllers.assignment import solve_assignment
+        from simulation.discrete_event import DiscreteEventEngine
+        from controllers.simulation_controller import SimulationController
+        from simulation.logger import SimulationLogger
+        from models.clock import VirtualClock
+        
+        pairs = solve_assignment([[4, 1, 3], [2, 0, 5], [3, 2, 2]])
+        
+        clock = VirtualClock()
+        building = Building("batch_building", 15, [
+            {'id': 'car_1', 'capacity': 8, 'speed': 2.0},
+            {'id': 'car_2', 'capacity': 8, 'speed': 2.0}
+        ], clock)
+        controller = SimulationController(building, SimulationLogger(clock=clock), clock,
+                                          algorithm="eta", dispatch_cycle=0.5)
+        config = SimulationConfig()
+        config.update_simulation_params({'passenger_arrival_rate': 0})
+        engine = DiscreteEventEngine(building, controller, config, clock=clock)
+        for i, (origin, destination) in enumerate([(1, 12), (14, 2), (6, 9), (10, 3)]):
+            engine.schedule_passenger(1.0 + i * 0.1, origin, destination)
+        engine.run(180)
+        
+        if (pairs == [(0, 1), (1, 0), (2, 2)] and len(controller.journeys) == 4 and
+                engine.event_counts['dispatch_cycle'] > 0):
+            print("✅ Batch hall call assignment passed")
+        else:
+            print(f"❌ Batch hall call assignment failed: {pairs}, "
+                  f"{len(controller.journeys)} journeys")
+        
+    except Exception as e:
+        print(f"❌ Batch hall call assignment test failed: {e}")
+    
+    # Test 9: Hall call registry
+    try:
+        from controllers.elevator_controller import ElevatorController
+        from models.elevator import Direction, ElevatorState
+        from models.hall_calls import HallCall
+        
+        building = Building("registry_building", 10, [
+            {'id': 'car_1', 'capacity': 8, 'speed': 2.0},
+            {'id': 'car_2', 'capacity': 8, 'speed': 2.0}
+        ])
+        controller = ElevatorController(building)
+        for _ in range(3):
+            controller.request_elevator(6, Direction.UP)
+        
+        call = HallCall(6, Direction.UP)
+        first_car = building.hall_calls.get_car(call)
+        building.get_elevator(first_car).set_service_state(ElevatorState.MAINTENANCE)
+        second_car = building.hall_calls.get_car(call)
+        
+        if (len(building.hall_calls) == 1 and
+                controller.get_performance_metrics()['dispatch_decisions'] == 2 and
+                second_car not in (None, first_car) and
+                building.get_elevator(second_car).has_hall_call(6, Direction.UP) and
+                not building.get_elevator(first_car).has_hall_call(6, Direction.UP)):
+            print("✅ Hall call registry passed")
+        else:
+            print("❌ Hall call registry failed")
+        
+    except Exception as e:
+        print(f"❌ Hall call registry test failed: {e}")
+    
+    # Test 10: Car position index
+    try:
+        from models.elevator import Direction, ElevatorState
+        
+        building = Building("index_building", 20, [
+            {'id': 'car_1', 'capacity': 8, 'speed': 1.0},
+            {'id': 'car_2', 'capacity': 8, 'speed': 1.0},
+            {'id': 'car_3', 'capacity': 8, 'speed': 1.0}
+        ])
+        positions = building.car_positions
+        car_1 = building.get_elevator('car_1')
+        car_1.add_floor_request(10)
+        for _ in range(4):
+            car_1.update(1.0)
+        moving = positions.nearest(15, [(False, Direction.UP, 'any')])
+        building.get_elevator('car_2').set_service_state(ElevatorState.MAINTENANCE)
+        idle = positions.nearest(2, [(True, d, 'any') for d in Direction])
+        
+        if (moving == (15 - car_1.current_floor, 0, 'car_1') and car_1.current_floor > 1 and
+                idle == (1, 2, 'car_3') and 'car_2' not in positions and len(positions) == 2):
+            print("✅ Car position index passed")
+        else:
+            print(f"❌ Car position index failed: {moving}, {idle}")
+        
+    except Exception as e:
+        print(f"❌ Car position index test failed: {e}")
+    
+    # Test 11: Zoned banks and sky lobby transfers
+    try:
+        from simulation.discrete_event import DiscreteEventEngine
+        from controllers.simulation_controller import SimulationController
+        from controllers.dispatch import BankView
+        from simulation.logger import SimulationLogger
+        from models.clock import VirtualClock
+        from models.hall_calls import HallCall
+        from models.elevator import Direction
+        
+        clock = VirtualClock()
+        building = Building("zoned_building", 30, [
+            {'id': 'low', 'capacity': 8, 'speed': 1.0, 'served_floors': list(range(1, 11))},
+            {'id': 'shuttle', 'capacity': 8, 'speed': 2.0, 'served_floors': [1, 10, 20]},
+            {'id': 'high', 'capacity': 8, 'speed': 1.0, 'served_floors': list(range(20, 31))}
+        ], clock)
+        route = building.zones.route(5, 25)
+        express = building.zones.route(1, 25)
+        shuttle_riders = set()
+        building.get_elevator('shuttle').add_door_open_listener(
+            lambda car: shuttle_riders.update(car.get_passengers()))
+        eligible = [car.id for car in BankView(building).eligible(
+            HallCall(10, Direction.UP, building.zones.get_zone('shuttle')))]
+        
+        controller = SimulationController(building, SimulationLogger(clock=clock), clock)
+        config = SimulationConfig()
+        config.update_simulation_params({'passenger_arrival_rate': 0})
+        engine = DiscreteEventEngine(building, controller, config, clock=clock)
+        engine.schedule_passenger(1.0, 5, 25)
+        engine.schedule_passenger(1.0, 1, 25)
+        engine.run(300)
+        
+        if ([(leg.origin, leg.destination) for leg in route] == [(5, 10), (10, 20), (20, 25)] and
+                [leg.zone for leg in express] == [building.zones.get_zone('shuttle'),
+                                                  building.zones.get_zone('high')] and
+                eligible == ['shuttle'] and len(controller.journeys) == 2 and
+                'P0002' in shuttle_riders and controller.transfers == 3):
+            print("✅ Zoned banks passed")
+        else:
+            print(f"❌ Zoned banks failed: {route}, {express}, {eligible}, "
+                  f"{len(controller.journeys)} journeys, {controller.transfers} transfers")
+        
+    except Exception as e:
+        print(f"❌ Zoned banks test failed: {e}")
+
+    # Test 12: Initial car positions and parking policies
+    try:
+        elevators = [{'id': f'car_{i}', 'capacity': 8, 'speed': 1.0} for i in range(3)]
+        elevators[2]['initial_floor'] = 7
+        configured = Building("configured", 12, elevators)
+        spread = Building("spread", 12, elevators, parking='spread')
+        lobby = Building("lobby", 30, [{'id': 'high', 'served_floors': list(range(20, 31))}],
+                         parking='lobby')
+        
+        configured_floors = [car.current_floor for car in configured.elevators.values()]
+        spread_floors = [car.current_floor for car in spread.elevators.values()]
+        if (configured_floors == [1, 1, 7] and spread_floors == [1, 5, 9] and
+                lobby.get_elevator('high').current_floor == 20 and
+                configured.car_positions.nearest(8, [(True, Direction.NONE, 'any')])[2] == 'car_2'):
+            print("✅ Parking policies passed")
+        else:
+            print(f"❌ Parking policies failed: {configured_floors}, {spread_floors}")
+        
+    except Exception as e:
+        print(f"❌ Parking policies test failed: {e}")
+
+    # Test 13: Buffered background CSV writer
+    try:
+        from simulation.csv_writer import BufferedCSVWriter
+        import csv
+        import tempfile
+        import shutil
+        
+        temp_dir = tempfile.mkdtemp()
+        file_path = os.path.join(temp_dir, "rows.csv")
+        writer = BufferedCSVWriter(file_path, ['timestamp', 'floor'], max_queued=8,
+                                   batch_size=64, flush_interval=60.0)
+        for i in range(5000):
+            writer.write({'timestamp': i * 0.1, 'floor': i % 12 + 1, 'extra': 'ignored'})
+        writer.close()
+        
+        with open(file_path, newline='') as csvfile:
+            rows = list(csv.DictReader(csvfile))
+        shutil.rmtree(temp_dir)
+        
+        if (len(rows) == 5000 and writer.rows_written == 5000 and
+                list(rows[-1]) == ['timestamp', 'floor'] and rows[-1]['floor'] == '8'):
+            print("✅ Buffered CSV writer passed")
+        else:
+            print(f"❌ Buffered CSV writer failed: {len(rows)} rows")
+        
+    except Exception as e:
+        print(f"❌ Buffered CSV writer test failed: {e}")
+
+    # Test 14: Session summaries from streaming aggregates
+    try:
+        from simulation.logger import SimulationLogger
+        from models.clock import VirtualClock
+        import csv
+        import glob
+        import tempfile
+        import shutil
+        
+        temp_dir = tempfile.mkdtemp()
+        clock = VirtualClock()
+        logger = SimulationLogger(temp_dir, clock)
+        logger.start_logging()
+        for step in range(1000):
+            logger.log_elevator_state("car_1", {'current_floor': step % 5 + 1,
+                                                'state': 'idle' if step % 4 else 'moving_up',
+                                                'passenger_count': step % 7})
+            logger.log_system_metrics({'active_elevators': step % 2, 'pending_requests': step})
+            # A quarter of the records, but half of the time, is spent moving
+            clock.advance(1.0 if step % 4 else 3.0)
+        for number in range(1, 4):
+            logger.log_passenger_journey({
+                'passenger_id': f"P{number:04d}", 'origin_floor': 1, 'destination_floor': 5,
+                'elevator_id': 'car_1', 'arrival_time': 0.0,
+                'board_time': None if number == 3 else 2.0 * number,
+                'destination_arrival_time': 20.0,
+                'wait_time': None if number == 3 else 2.0 * number,
+                'travel_time': None if number == 3 else 20.0 - 2.0 * number,
+                'total_time': 20.0})
+        logger.stop_logging()
+        
+        def read_summary(name):
+            with open(glob.glob(os.path.join(temp_dir, f"{name}_*.csv"))[0], newline='') as csvfile:
+                return list(csv.DictReader(csvfile))
+        
+        elevator_summary = read_summary("elevator_summary")
+        system_summary = read_summary("system_summary")
+        passenger_summary = read_summary("passenger_summary")
+        shutil.rmtree(temp_dir)
+        
+        if (elevator_summary[0]['total_records'] == '1000' and
+                elevator_summary[0]['unique_floors'] == '5' and
+                float(elevator_summary[0]['time_moving_pct']) == 50.0 and
+                float(elevator_summary[0]['time_idle_pct']) == 50.0 and
+                [row['wait_time'] for row in passenger_summary] == ['2.0', '4.0', '20.0'] and
+                passenger_summary[2]['travel_time'] == '0.0' and
+                float(system_summary[0]['avg_pending_requests']) == 499.5 and
+                system_summary[0]['max_pending_requests'] == '999'):
+            print("✅ Streaming summaries passed")
+        else:
+            print(f"❌ Streaming summaries failed: {elevator_summary}, {system_summary}, "
+                  f"{passenger_summary}")
+        
+    except Exception as e:
+        print(f"❌ Streaming summaries test failed: {e}")
+
+    # Test 15: Online statistics and mergeable quantile sketches
+    try:
+        from simulation.statistics import JourneyStatistics, TimeDistribution
+        import random
+        
+        rng = random.Random(5)
+        values = [rng.expovariate(0.05) for _ in range(5000)]
+        combined, first, second = TimeDistribution(), TimeDistribution(), TimeDistribution()
+        for i, value in enumerate(values):
+            combined.add(value)
+            (first if i % 2 else second).add(value)
+        first.merge(second)
+        
+        mean = sum(values) / len(values)
+        variance = sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+        exact_p95 = sorted(values)[round(0.95 * (len(values) - 1))]
+        
+        statistics = JourneyStatistics()
+        statistics.add_journey({'elevator_id': 'car_1', 'origin_floor': 3, 'wait_time': 4.0,
+                                'travel_time': 10.0, 'total_time': 14.0})
+        
+        if (abs(first.stats.mean - mean) < 1e-9 and
+                abs(first.stats.variance - variance) < 1e-6 and
+                first.sketch.quantile(0.5) == combined.sketch.quantile(0.5) and
+                abs(first.quantile(0.95) / exact_p95 - 1) < 0.02 and
+                statistics.get('ride_time', floor=3).stats.mean == 10.0):
+            print("✅ Online statistics passed")
+        else:
+            print(f"❌ Online statistics failed: {first.get_summary()}")
+        
+    except Exception as e:
+        print(f"❌ Online statistics test failed: {e}")
+
+    # Test 16: Change-only elevator state logging
+    try:
+        from simulation.logger import SimulationLogger
+        from simulation.log_reader import (read_state_changes, read_tick_timestamps,
+                                           expand_state_changes)
+        from controllers.simulation_controller import SimulationController
+        from models.clock import VirtualClock
+        import glob
+        import tempfile
+        import shutil
+        
+        temp_dir = tempfile.mkdtemp()
+        logged = {}
+        for mode in ('every_tick', 'changes'):
+            clock = VirtualClock()
+            building = Building("logged", 10, [{'id': 'A'}, {'id': 'B'}], clock)
+            logger = SimulationLogger(os.path.join(temp_dir, mode), clock, mode)
+            controller = SimulationController(building, logger, clock)
+            logger.start_logging()
+            controller.add_passenger(5, 2)
+            for _ in range(300):
+                clock.advance(0.1)
+                building.update(0.1)
+                logger.log_simulation_state(controller.get_simulation_status())
+            logger.stop_logging()
+            logged[mode] = lambda name, mode=mode: glob.glob(
+                os.path.join(temp_dir, mode, f"{name}_*.csv"))[0]
+        
+        full = [{**row, 'timestamp': float(row['timestamp'])}
+                for row in read_state_changes(logged['every_tick']("elevator_states"))]
+        changes = list(read_state_changes(logged['changes']("elevator_states")))
+        rebuilt = list(expand_state_changes(logged['changes']("elevator_states"),
+                                            read_tick_timestamps(logged['changes']("system_metrics"))))
+        shutil.rmtree(temp_dir)
+        
+        if len(full) == 600 and len(changes) < 60 and rebuilt == full:
+            print("✅ Change-only state logging passed")
+        else:
+            print(f"❌ Change-only state logging failed: {len(full)} rows, "
+                  f"{len(changes)} changes, {len(rebuilt)} rebuilt")
+        
+    except Exception as e:
+        print(f"❌ Change-only state logging test failed: {e}")
+
+    # Test 17: Binary columnar logs
+    try:
+        from simulation.columnar import ColumnarWriter, ColumnarLog, convert_to_csv
+        import csv
+        import math
+        import threading
+        import tempfile
+        import shutil
+        
+        temp_dir = tempfile.mkdtemp()
+        file_path = os.path.join(temp_dir, "elevator_states.col")
+        writer = ColumnarWriter(file_path, "elevator_states",
+                                [('timestamp', 'float'), ('elevator_id', 'category'),
+                                 ('current_floor', 'int'), ('door_open', 'bool'),
+                                 ('board_time', 'float'), ('passenger_id', 'string')],
+                                buffer_rows=16)
+        for i in range(100):
+            writer.write({'timestamp': i * 0.1, 'elevator_id': f"car_{i % 3}",
+                          'current_floor': i % 10 + 1, 'door_open': i % 2 == 0,
+                          'board_time': None if i % 5 else float(i),
+                          'passenger_id': f"P{i:04d}" if i % 2 else None})
+        writer.close()
+        
+        # Rows written from two threads at once all reach the file
+        threaded_path = os.path.join(temp_dir, "passenger_events.col")
+        threaded = ColumnarWriter(threaded_path, "passenger_events",
+                                  [('passenger_id', 'string'), ('floor', 'int')], buffer_rows=7)
+        threads = [threading.Thread(target=lambda start=start: [
+            threaded.write({'passenger_id': f"P{number:05d}", 'floor': number % 10})
+            for number in range(start, start + 500)]) for start in (0, 500)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        threaded.close()
+        threaded_ids = sorted(ColumnarLog(threaded_path).decode('passenger_id'))
+        
+        log = ColumnarLog(file_path)
+        floors = log['current_floor']
+        csv_path = convert_to_csv(file_path)
+        with open(csv_path, newline='') as csvfile:
+            rows = list(csv.DictReader(csvfile))
+        
+        passed = (len(log) == 100 and log.stream == "elevator_states" and
+                  floors.base is not None and int(floors.sum()) == 550 and
+                  log.decode('elevator_id')[4] == "car_1" and
+                  math.isnan(log['board_time'][1]) and
+                  rows[5] == {'timestamp': '0.5', 'elevator_id': 'car_2',
+                              'current_floor': '6', 'door_open': 'False',
+                              'board_time': '5.0', 'passenger_id': 'P0005'} and
+                  rows[6]['board_time'] == '' and rows[6]['passenger_id'] == '' and
+                  log.decode('passenger_id')[:2] == [None, 'P0001'] and
+                  log.get_categories('passenger_id') == [] and
+                  threaded_ids == [f"P{number:05d}" for number in range(1000)])
+        del log, floors
+        shutil.rmtree(temp_dir)
+        
+        if passed:
+            print("✅ Columnar logs passed")
+        else:
+            print("❌ Columnar logs failed")
+        
+    except ImportError:
+        print("⏭️  Columnar logs skipped (NumPy not installed)")
+    except Exception as e:
+        print(f"❌ Columnar logs test failed: {e}")
+    
+    # Test 18: Riders left behind by full cars
+    try:
+        from simulation.discrete_event import DiscreteEventEngine
+        from controllers.simulation_controller import SimulationController
+        from simulation.logger import SimulationLogger
+        from models.clock import VirtualClock
+        
+        undelivered = []
+        for policy in ('nearest', 'look', 'collective'):
+            for algorithm in ('nearest_car', 'scan', 'fcfs', 'eta'):
+                clock = VirtualClock()
+                building = Building("full_cars", 10, [
+                    {'id': 'car_1', 'capacity': 2, 'speed': 2.0, 'service_policy': policy},
+                    {'id': 'car_2', 'capacity': 2, 'speed': 2.0, 'service_policy': policy}
+                ], clock)
+                controller = SimulationController(building, SimulationLogger(clock=clock),
+                                                  clock, algorithm=algorithm)
+                config = SimulationConfig()
+                config.update_simulation_params({'passenger_arrival_rate': 0})
+                engine = DiscreteEventEngine(building, controller, config, clock=clock)
+                for i in range(7):
+                    engine.schedule_passenger(1.0 + i * 0.1, 1, 6 + i % 4)
+                for i in range(3):
+                    engine.schedule_passenger(2.0, 9, 2)
+                engine.run(600)
+                
+                if len(controller.journeys) != 10 or building.get_floor(1).waiting_count:
+                    undelivered.append((policy, algorithm, 10 - len(controller.journeys)))
+        
+        if not undelivered:
+            print("✅ Riders left behind by full cars passed")
+        else:
+            print(f"❌ Riders left behind by full cars were not delivered: {undelivered}")
+        
+    except Exception as e:
+        print(f"❌ Full car test failed: {e}")
+    
+    # Test 19: Sweep grid validation and cell identifiers
+    try:
+        import tempfile
+        from pathlib import Path
+        from simulation.sweep import expand_grid, build_cell_elevators, get_cell_id, get_file_digest
+        
+        cells = expand_grid({'elevator_count': [2, 2, 3], 'dispatch_algorithm': ['scan', 'scan']})
+        rejected = []
+        for grid in ({'elevator_count': [0]}, {'capacity': [-1]}, {'speed': ['fast']},
+                     {'elevator_count': [True]}, {'capacity': []},
+                     {'dispatch_algorithm': ['unknown']}):
+            try:
+                expand_grid(grid)
+            except ValueError:
+                rejected.append(True)
+        try:
+            build_cell_elevators([{'id': 'car_1'}], {'elevator_count': 0})
+        except ValueError:
+            rejected.append(True)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_path = Path(tmp_dir) / "building.csv"
+            config_path.write_text("floors\n10\n")
+            digest = get_file_digest(str(config_path))
+            config_path.write_text("floors\n12\n")
+            changed_digest = get_file_digest(str(config_path))
+        settings = {'duration': 60, 'replications': 1, 'base_seed': 0}
+        ids = {get_cell_id(cells[0], {**settings, 'building_config': file_digest})
+               for file_digest in (digest, changed_digest)}
+        
+        if (cells == [{'elevator_count': 2, 'dispatch_algorithm': 'scan'},
+                      {'elevator_count': 3, 'dispatch_algorithm': 'scan'}] and
+                len(rejected) == 7 and len(ids) == 2 and get_file_digest(None) == ''):
+            print("✅ Sweep grid validation and cell identifiers passed")
+        else:
+            print(f"❌ Sweep grid check failed: {cells}, {len(rejected)} rejected, {len(ids)} ids")
+        
+    except Exception as e:
+        print(f"❌ Sweep grid test failed: {e}")
+    
+    # Test 20: ETA estimates and hall call reassignment
+    try:
+        from controllers.dispatch import EtaDispatcher
+        from models.elevator import Direction, ElevatorState
+        from models.hall_calls import HallCall
+        
+        class StubCar:
+            """Car view with fixed attributes that counts reads of its stops."""
+            def __init__(self, car_id, floor, state, direction, stops, remaining=0.0):
+                self.id, self.current_floor, self.state = car_id, floor, state
+                self.direction, self._stops = direction, stops
+                self.time_to_next_event = remaining
+                self.speed, self.door_open_time, self.door_operation_time = 1.0, 3.0, 2.0
+                self.service_policy, self.passenger_count, self.capacity = "nearest", 0, 8
+                self.in_service, self.stop_reads = True, 0
+            @property
+            def pending_stops(self):
+                self.stop_reads += 1
+                return self._stops
+            def serves(self, floor):
+                return True
+        
+        class StubBank:
+            def __init__(self, cars):
+                self.cars = cars
+            def __iter__(self):
+                return iter(self.cars)
+            def eligible(self, call):
+                return self.cars
+        
+        dispatcher = EtaDispatcher()
+        idle = StubCar('car_1', 1, ElevatorState.IDLE, Direction.NONE, [])
+        moving = StubCar('car_2', 2, ElevatorState.MOVING_UP, Direction.UP, [4, 8], 0.5)
+        estimates = [dispatcher.estimate_arrival_time(idle, HallCall(5, Direction.UP)),
+                     dispatcher.estimate_arrival_time(moving, HallCall(6, Direction.UP)),
+                     dispatcher.estimate_arrival_time(moving, HallCall(2, Direction.DOWN))]
+        moving.stop_reads = 0
+        dispatcher.get_cost(moving, HallCall(6, Direction.UP))
+        
+        # A call queued behind many stops moves to an idle car next to it
+        busy = StubCar('car_3', 1, ElevatorState.MOVING_UP, Direction.UP, list(range(2, 10)))
+        near = StubCar('car_4', 9, ElevatorState.IDLE, Direction.NONE, [])
+        bank = StubBank([busy, near])
+        moves = dispatcher.reassign(bank, {HallCall(10, Direction.DOWN): 'car_3',
+                                           HallCall(8, Direction.DOWN): 'car_4'})
+        
+        if (estimates == [4.0, 10.5, 32.5] and moving.stop_reads == 1 and
+                moves == {HallCall(10, Direction.DOWN): 'car_4'}):
+            print("✅ ETA estimates and hall call reassignment passed")
+        else:
+            print(f"❌ ETA check failed: {estimates}, {moving.stop_reads} stop reads, {moves}")
+        
+    except Exception as e:
+        print(f"❌ ETA test failed: {e}")
+    
+    # Test 21: Passenger, button and metrics logs of headless runs
+    try:
+        import csv
+        import tempfile
+        from pathlib import Path
+        from simulation.discrete_event import DiscreteEventEngine
+        from controllers.simulation_controller import SimulationController
+        from simulation.logger import SimulationLogger
+        from models.clock import VirtualClock
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            clock = VirtualClock()
+            building = Building("headless", 6, [{'id': 'car_1', 'capacity': 8, 'speed': 2.0}],
+                                clock)
+            logger = SimulationLogger(tmp_dir, clock)
+            controller = SimulationController(building, logger, clock)
+            config = SimulationConfig()
+            config.update_simulation_params({'passenger_arrival_rate': 0,
+                                             'metrics_interval': 10.0})
+            engine = DiscreteEventEngine(building, controller, config, logger, clock=clock)
+            engine.schedule_passenger(1.0, 1, 4)
+            logger.start_logging()
+            engine.run(60)
+            logger.stop_logging()
+            
+            def read_log(stream):
+                path = next(Path(tmp_dir).glob(f"{stream}_*.csv"))
+                with open(path, newline='') as csvfile:
+                    return list(csv.DictReader(csvfile))
+            
+            events = [row['event_type'] for row in read_log('passenger_events')]
+            buttons = [(row['button_type'], row['location'], row['target'])
+                       for row in read_log('button_presses')]
+            timestamps = [float(row['timestamp']) for row in read_log('system_metrics')]
+        
+        if (events == ['arrival', 'boarding', 'departure'] and
+                buttons == [('hall_call', 'floor_1', 'up'), ('elevator_floor', 'car_1', '4')] and
+                timestamps == [0.0, 10.0, 20.0, 30.0, 40.0, 50.0, 60.0]):
+            print("✅ Headless passenger, button and metrics logs passed")
+        else:
+            print(f"❌ Headless log check failed: {events}, {buttons}, {timestamps}")
+        
+    except Exception as e:
+        print(f"❌ Headless log test failed: {e}")
+    
+    # Test 22: Floor request index against a set-based reference
+    try:
+        import random
+        from models.request_index import FloorRequestIndex
+        
+        rng = random.Random(11)
+        index = FloorRequestIndex()
+        reference = {'car': set(), 'up': set(), 'down': set()}
+        mismatches = []
+        
+        for step in range(3000):
+            floor = rng.randint(0, 40)
+            operation = rng.choice(['add_car_call', 'add_up_call', 'add_down_call',
+                                    'clear_car_call', 'clear_up_call', 'clear_down_call',
+                                    'clear_floor', 'clear_hall_calls'])
+            if operation == 'clear_hall_calls':
+                if rng.random() < 0.05:
+                    index.clear_hall_calls()
+                    reference['up'].clear()
+                    reference['down'].clear()
+                continue
+            if operation == 'clear_floor':
+                index.clear_floor(floor)
+                for floors in reference.values():
+                    floors.discard(floor)
+                continue
+            
+            getattr(index, operation)(floor)
+            kind = operation.split('_')[1]
+            if operation.startswith('add'):
+                reference[kind].add(floor)
+            else:
+                reference[kind].discard(floor)
+            
+            requested = reference['car'] | reference['up'] | reference['down']
+            probe = rng.randint(0, 40)
+            above = [f for f in requested if f > probe]
+            below = [f for f in requested if f < probe]
+            nearest = min(requested, key=lambda f: (abs(f - probe), f)) if requested else None
+            expected = (sorted(requested), sorted(reference['car']), sorted(reference['up']),
+                        sorted(reference['down']), min(above) if above else None,
+                        max(below) if below else None, nearest, bool(requested),
+                        min(requested) if requested else None,
+                        max(requested) if requested else None, probe in requested)
+            actual = (index.floors, index.car_calls, index.up_calls, index.down_calls,
+                      index.next_above(probe), index.next_below(probe), index.nearest(probe),
+                      bool(index), index.lowest(), index.highest(), index.has_request(probe))
+            if actual != expected:
+                mismatches.append((step, operation, floor, probe))
+        
+        if not mismatches:
+            print("✅ Floor request index matches the set-based reference")
+        else:
+            print(f"❌ Floor request index differs from the reference: {mismatches[:3]}")
+        
+    except Exception as e:
+        print(f"❌ Floor request index test failed: {e}")
+    
+    # Test 23: Dispatcher registry and entry point plugins
+    try:
+        import tempfile
+        import importlib
+        from pathlib import Path
+        from controllers import dispatch
+        from controllers.dispatch import (Dispatcher, FcfsDispatcher, register_dispatcher,
+                                          get_dispatcher, is_dispatcher_available)
+        
+        checks = []
+        try:
+            get_dispatcher("no_such_algorithm")
+            checks.append(False)
+        except ValueError:
+            checks.append(not is_dispatcher_available("no_such_algorithm"))
+        
+        @register_dispatcher("test_first_car")
+        class FirstCarDispatcher(Dispatcher):
+            def assign(self, bank, call):
+                cars = bank.eligible(call)
+                return cars[0].id if cars else None
+        
+        checks.append(isinstance(get_dispatcher("test_first_car"), FirstCarDispatcher))
+        checks.append(register_dispatcher("test_first_car")(FirstCarDispatcher)
+                      is FirstCarDispatcher)
+        for name, cls in (("test_first_car", FcfsDispatcher), ("eta", FirstCarDispatcher)):
+            try:
+                register_dispatcher(name)(cls)
+                checks.append(False)
+            except ValueError:
+                checks.append(True)
+        checks.append(get_dispatcher("eta").name == "eta")
+        try:
+            register_dispatcher("test_not_a_dispatcher")(object)
+            checks.append(False)
+        except TypeError:
+            checks.append(True)
+        dispatch._DISPATCHERS.pop("test_first_car")
+        
+        # An installed package advertising a dispatcher in the entry point group
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            Path(tmp_dir, "plugin_dispatch.py").write_text(
+                "from controllers.dispatch import FcfsDispatcher\n"
+                "class PluginDispatcher(FcfsDispatcher):\n"
+                "    pass\n")
+            dist_info = Path(tmp_dir, "plugin_dispatch-1.0.dist-info")
+            dist_info.mkdir()
+            (dist_info / "METADATA").write_text(
+                "Metadata-Version: 2.1\nName: plugin-dispatch\nVersion: 1.0\n")
+            (dist_info / "entry_points.txt").write_text(
+                f"[{dispatch.ENTRY_POINT_GROUP}]\n"
+                "test_plugin = plugin_dispatch:PluginDispatcher\n")
+            sys.path.insert(0, tmp_dir)
+            importlib.invalidate_caches()
+            try:
+                plugin = get_dispatcher("test_plugin")
+                checks.append(type(plugin).__name__ == "PluginDispatcher" and
+                              plugin.name == "test_plugin")
+            finally:
+                sys.path.remove(tmp_dir)
+                dispatch._DISPATCHERS.pop("test_plugin", None)
+                sys.modules.pop("plugin_dispatch", None)
+        
+        if all(checks):
+            print("✅ Dispatcher registry and entry point plugins passed")
+        else:
+            print(f"❌ Dispatcher registry check failed: {checks}")
+        
+    except Exception as e:
+        print(f"❌ Dispatcher registry test failed: {e}")
+    
+    # Test 24: Boarding on door-open notifications
+    try:
+        from controllers.simulation_controller import SimulationController
+        from simulation.logger import SimulationLogger
+        from models.clock import VirtualClock
+        from models.passenger import PassengerState
+        
+        clock = VirtualClock()
+        building = Building("doors", 8, [{'id': 'car_A', 'capacity': 8, 'speed': 2.0},
+                                         {'id': 'car_B', 'capacity': 8, 'speed': 2.0}], clock)
+        controller = SimulationController(building, SimulationLogger(clock=clock), clock)
+        
+        # Count status rebuilds and passenger exchanges during the run
+        calls = {'building_status': 0, 'elevator_status': 0, 'exchanges': 0}
+        def counted(name, function):
+            def wrapper(*args, **kwargs):
+                calls[name] += 1
+                return function(*args, **kwargs)
+            return wrapper
+        building.get_building_status = counted('building_status', building.get_building_status)
+        for elevator in building.elevators.values():
+            elevator.get_status_dict = counted('elevator_status', elevator.get_status_dict)
+        controller.service_floor = counted('exchanges', controller.service_floor)
+        
+        openings = []
+        passenger_id = controller.add_passenger(3, 6)
+        passenger = controller.passengers[passenger_id]
+        for elevator in building.elevators.values():
+            elevator.add_door_open_listener(
+                lambda car: openings.append((car.id, car.current_floor,
+                                             passenger_id in car.get_passengers())))
+        
+        boarded_early = False
+        for step in range(600):
+            clock.advance(0.1)
+            building.update(0.1)
+            if (passenger_id in controller.passengers and
+                    passenger.state == PassengerState.IN_ELEVATOR and
+                    not any(floor == 3 for _, floor, _ in openings)):
+                boarded_early = True
+        
+        journeys = list(controller.journeys)
+        first_at_origin = next((opening for opening in openings if opening[1] == 3), None)
+        if (not boarded_early and first_at_origin is not None and first_at_origin[2] and
+                len(journeys) == 1 and journeys[0]['destination_floor'] == 6 and
+                calls['exchanges'] == len(openings) and
+                calls['building_status'] == 0 and calls['elevator_status'] == 0):
+            print("✅ Boarding on door-open notifications passed")
+        else:
+            print(f"❌ Door-open boarding check failed: {openings}, {calls}, "
+                  f"{len(journeys)} journeys, boarded early {boarded_early}")
+        
+    except Exception as e:
+        print(f"❌ Door-open boarding test failed: {e}")
+    
+    # Test 25: Floor FIFO queues and per-destination indexes
+    try:
+        from models.floor import Floor
+        from controllers.simulation_controller import SimulationController
+        from simulation.logger import SimulationLogger
+        from models.clock import VirtualClock
+        
+        floor = Floor(5)
+        for passenger_id, going_up, destination in [('a', True, 9), ('b', False, 1), ('c', True, 7),
+                                                    ('d', True, 9), ('e', False, 2), ('f', True, 7)]:
+            floor.add_waiting_passenger(passenger_id, going_up, destination)
+        
+        order_before = ([floor.next_waiting_passenger(True, skip) for skip in range(5)],
+                        floor.get_waiting_passengers_to(9),
+                        floor.get_waiting_passengers_to_floors([9, 7]),
+                        floor.get_waiting_passengers_to_floors([7, 9, 3], limit=3),
+                        floor.get_waiting_destinations(),
+                        (floor.waiting_count_up, floor.waiting_count_down, floor.waiting_count))
+        removed = floor.remove_waiting_passenger('a'), floor.remove_waiting_passenger('a')
+        floor.add_waiting_passenger('a', True, 9)
+        order_after = (floor.waiting_passengers_up, floor.get_waiting_passengers_to(9),
+                       floor.get_waiting_passengers_to_floors([7, 9]))
+        
+        # A car with room for two takes the two longest-waiting riders
+        clock = VirtualClock()
+        building = Building("fifo", 6, [{'id': 'car_1', 'capacity': 2, 'speed': 2.0}], clock)
+        controller = SimulationController(building, SimulationLogger(clock=clock), clock)
+        passenger_ids = [controller.add_passenger(2, destination) for destination in (5, 3, 4)]
+        first_load = []
+        building.get_elevator('car_1').add_door_open_listener(
+            lambda car: first_load or first_load.append(sorted(car.get_passengers())))
+        for step in range(100):
+            clock.advance(0.1)
+            building.update(0.1)
+        
+        expected_before = (['a', 'c', 'd', 'f', None], ['a', 'd'], ['a', 'c', 'd', 'f'],
+                           ['a', 'c', 'd'], [1, 2, 7, 9], (4, 2, 6))
+        expected_after = (['c', 'd', 'f', 'a'], ['d', 'a'], ['c', 'd', 'f', 'a'])
+        if (order_before == expected_before and removed == (True, False) and
+                order_after == expected_after and first_load == [sorted(passenger_ids[:2])]):
+            print("✅ Floor FIFO queues and per-destination indexes passed")
+        else:
+            print(f"❌ Floor queue check failed: {order_before}, {removed}, {order_after}, "
+                  f"{first_load}")
+        
+    except Exception as e:
+        print(f"❌ Floor queue test failed: {e}")
+    
+    # Test 26: Passenger store slot reuse and journey log
+    try:
+        from models.passenger_store import PassengerStore
+        from models.passenger import PassengerState
+        from models.clock import VirtualClock
+        from controllers.simulation_controller import SimulationController
+        from simulation.logger import SimulationLogger
+        
+        clock = VirtualClock()
+        store = PassengerStore(clock)
+        completed = []
+        store.add_journey_listener(completed.append)
+        
+        first = store.add(1, 8)
+        clock.advance(1.0)
+        second = store.add(3, 2)
+        first_slot = store.get_index(first)
+        clock.advance(1.0)
+        store[first].board_elevator('car_1')
+        clock.advance(3.0)
+        store[first].arrive_at_destination()
+        
+        # The arrived passenger's slot is reused with fresh values
+        third = store.add(6, 4, arrival_time=4.5)
+        view = store[third]
+        reused = (store.get_index(third) == first_slot and first not in store and
+                  view.state == PassengerState.WAITING and view.elevator_id is None and
+                  view.get_wait_time() is None and view.arrival_time == 4.5 and
+                  (view.origin_floor, view.destination_floor) == (6, 4))
+        
+        store[second].arrive_at_destination(10.0)
+        journeys = list(store.journeys)
+        expected = [
+            {'passenger_id': first, 'origin_floor': 1, 'destination_floor': 8,
+             'elevator_id': 'car_1', 'arrival_time': 0.0, 'board_time': 2.0,
+             'destination_arrival_time': 5.0, 'wait_time': 2.0, 'travel_time': 3.0,
+             'total_time': 5.0},
+            {'passenger_id': second, 'origin_floor': 3, 'destination_floor': 2,
+             'elevator_id': None, 'arrival_time': 1.0, 'board_time': None,
+             'destination_arrival_time': 10.0, 'wait_time': None, 'travel_time': None,
+             'total_time': 9.0}
+        ]
+        
+        # The controller exposes its live store as a read-only mapping
+        controller = SimulationController(
+            Building("store", 8, [{'id': 'car_1'}], clock),
+            SimulationLogger(clock=clock), clock)
+        passenger_id = controller.add_passenger(2, 5)
+        try:
+            controller.passengers[passenger_id] = None
+            read_only = False
+        except TypeError:
+            read_only = list(controller.passengers) == [passenger_id]
+        
+        if (reused and read_only and journeys == expected and completed == expected and
+                len({first, second, third}) == 3 and list(store) == [third] and
+                (store.total_count, store.active_count) == (3, 1) and
+                store.journeys.get_wait_times() == [2.0] and
+                store.journeys.get_total_times() == [5.0, 9.0]):
+            print("✅ Passenger store slot reuse and journey log passed")
+        else:
+            print(f"❌ Passenger store check failed: reused {reused}, "
+                  f"read-only {read_only}, {journeys}")
+        
+    except Exception as e:
+        print(f"❌ Passenger store test failed: {e}")
+    
+    # Test 27: Look and collective service policies
+    try:
+        from models.elevator import Elevator, Direction
+        from models.clock import VirtualClock
+        
+        def stop_sequence(policy, initial_floor, requests, later_requests=()):
+            """Run a car until it is idle and return the floors it opened its doors at."""
+            clock = VirtualClock()
+            elevator = Elevator('car_1', floors_range=(1, 10), clock=clock,
+                                service_policy=policy, initial_floor=initial_floor)
+            stops = []
+            elevator.add_door_open_listener(lambda car: stops.append(car.current_floor))
+            for floor, direction in requests:
+                if direction is None:
+                    elevator.add_floor_request(floor)
+                else:
+                    elevator.add_hall_call(floor, direction)
+            for step in range(2000):
+                clock.advance(0.05)
+                elevator.update(0.05)
+                if step == 0:
+                    # Calls made once the car is on its way
+                    for floor in later_requests:
+                        elevator.add_floor_request(floor)
+            return stops, elevator.pending_stops
+        
+        # Car calls to 4 and 9 arrive while the car heads up to 6
+        reversal = {policy: stop_sequence(policy, 5, [(6, None)], [4, 9])
+                    for policy in ('nearest', 'look', 'collective')}
+        # Going up to 8 past an up call at 3 and a down call at 5
+        mixed = {policy: stop_sequence(policy, 1, [(8, None), (3, Direction.UP),
+                                                   (5, Direction.DOWN)])
+                 for policy in ('look', 'collective')}
+        
+        expected_reversal = {'nearest': ([6, 4, 9], []), 'look': ([6, 9, 4], []),
+                             'collective': ([6, 9, 4], [])}
+        expected_mixed = {'look': ([3, 5, 8], []), 'collective': ([3, 8, 5], [])}
+        if reversal == expected_reversal and mixed == expected_mixed:
+            print("✅ Look and collective service policies passed")
+        else:
+            print(f"❌ Service policy check failed: {reversal}, {mixed}")
+        
+    except Exception as e:
+        print(f"❌ Service policy test failed: {e}")
+    
+    # Test 28: Vectorized bank in lockstep with elevator objects
+    try:
+        import numpy
+    except ImportError:
+        print("⏭️  Vectorized bank lockstep skipped (NumPy not installed)")
+    else:
+        try:
+            import random
+            from models.building import Building
+            from models.clock import VirtualClock
+            from controllers.simulation_controller import SimulationController
+            from simulation.logger import SimulationLogger
+            
+            def make_simulation(vectorized):
+                """Build a six car building with a controller on a virtual clock."""
+                clock = VirtualClock()
+                building = Building("lockstep", 20, [
+                    {'id': f'car_{i}', 'capacity': 8, 'speed': 2.0} for i in range(6)
+                ], clock, vectorized=vectorized)
+                temp_dir = tempfile.mkdtemp()
+                controller = SimulationController(
+                    building, SimulationLogger(temp_dir, clock), clock, algorithm='scan')
+                return clock, building, controller, temp_dir
+            
+            def car_states(building):
+                """Get the position, state and passengers of every car."""
+                return [(car.current_floor, car.state, car.direction,
+                         sorted(car.get_passengers()))
+                        for car in building.elevators.values()]
+            
+            rng = random.Random(5)
+            arrivals = []
+            arrival_time = rng.expovariate(0.5)
+            while arrival_time < 300:
+                origin = rng.randint(1, 20)
+                destination = rng.randint(1, 19)
+                arrivals.append((arrival_time, origin,
+                                 destination + (destination >= origin)))
+                arrival_time += rng.expovariate(0.5)
+            
+            simulations = [make_simulation(False), make_simulation(True)]
+            next_arrival = 0
+            diverged_at = None
+            for step in range(1, 4001):
+                for clock, building, controller, _ in simulations:
+                    clock.advance(0.1)
+                while (next_arrival < len(arrivals) and
+                       arrivals[next_arrival][0] <= step * 0.1):
+                    for _, _, controller, _ in simulations:
+                        controller.add_passenger(*arrivals[next_arrival][1:])
+                    next_arrival += 1
+                for clock, building, controller, _ in simulations:
+                    controller.elevator_controller.update(clock.now())
+                    building.update(0.1)
+                if car_states(simulations[0][1]) != car_states(simulations[1][1]):
+                    diverged_at = step
+                    break
+            
+            objects, bank = (list(simulation[2].journeys) for simulation in simulations)
+            for simulation in simulations:
+                shutil.rmtree(simulation[3])
+            if diverged_at is None and objects and objects == bank:
+                print("✅ Vectorized bank lockstep passed")
+            else:
+                print(f"❌ Vectorized bank diverged at step {diverged_at}")
+            
+        except Exception as e:
+            print(f"❌ Vectorized bank lockstep test failed: {e}")
+    
+    # Test 29: Replication KPIs, confidence intervals and pooling
+    try:
+        from config.building_config import BuildingConfig
+        from config.simulation_config import SimulationConfig
+        from simulation.batch import create_headless_simulator
+        from simulation.replication import (percentile, confidence_interval,
+                                            collect_kpis, run_replications)
+        
+        percentiles_ok = (percentile([], 0.5) is None and
+                          percentile([5.0], 0.95) == 5.0 and
+                          percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.5 and
+                          abs(percentile([0.0, 10.0], 0.95) - 9.5) < 1e-9 and
+                          percentile([1.0, 2.0, 3.0], 1.0) == 3.0)
+        
+        # t(0.975, 2) = 4.303, so the half-width is 4.303 * 1 / sqrt(3)
+        interval = confidence_interval([1.0, 2.0, 3.0])
+        single = confidence_interval([7.0])
+        intervals_ok = (interval['mean'] == 2.0 and interval['std'] == 1.0 and
+                        abs(interval['half_width'] - 2.484) < 1e-3 and
+                        abs(interval['ci_low'] - (2.0 - interval['half_width'])) < 1e-12 and
+                        single['mean'] == 7.0 and single['half_width'] is None and
+                        confidence_interval([])['mean'] is None)
+        
+        # One passenger boards at 2s; the other is still waiting at 6s
+        temp_dir = tempfile.mkdtemp()
+        sim_config_path = os.path.join(temp_dir, "quiet_simulation.csv")
+        with open(sim_config_path, "w") as f:
+            f.write("section,duration,passenger_arrival_rate\nsimulation,120,0\n")
+        simulator = create_headless_simulator(
+            {'id': 'kpi_building', 'num_floors': 10},
+            [{'id': 'car_1', 'capacity': 8, 'speed': 2.0}],
+            SimulationConfig(sim_config_path), 1, temp_dir)
+        simulator.add_manual_passenger(1, 5)
+        simulator.add_manual_passenger(10, 1)
+        simulator.run_discrete_event(6.0)
+        kpis = collect_kpis(simulator, 6.0)
+        censored_ok = (kpis['completed_passengers'] == 0 and
+                       kpis['waiting_passengers'] == 1 and
+                       abs(kpis['mean_wait_time'] - 4.0) < 1e-9)
+        
+        building_config_path = os.path.join(temp_dir, "building.csv")
+        BuildingConfig.create_sample_config(building_config_path)
+        busy_config_path = os.path.join(temp_dir, "busy_simulation.csv")
+        with open(busy_config_path, "w") as f:
+            f.write("section,duration,passenger_arrival_rate\nsimulation,300,0.3\n")
+        results = run_replications(building_config_path, busy_config_path,
+                                   replications=3, base_seed=0, max_workers=2)
+        shutil.rmtree(temp_dir)
+        completed = sum(result['completed_passengers'] for result in results['replications'])
+        pooled_ok = completed > 0 and all(
+            summary['count'] == completed for summary in results['pooled'].values())
+        
+        if percentiles_ok and intervals_ok and censored_ok and pooled_ok:
+            print("✅ Replication statistics passed")
+        else:
+            print(f"❌ Replication statistics failed: percentiles {percentiles_ok}, "
+                  f"intervals {intervals_ok}, censored waits {censored_ok}, "
+                  f"pooled counts {pooled_ok}")
+        
+    except Exception as e:
+        print(f"❌ Replication statistics test failed: {e}")
+    
+    # Test 30: Seeded discrete-event runs are reproducible
+    try:
+        from config.simulation_config import SimulationConfig
+        from simulation.batch import create_headless_simulator
+        
+        temp_dir = tempfile.mkdtemp()
+        sim_config_path = os.path.join(temp_dir, "busy_simulation.csv")
+        with open(sim_config_path, "w") as f:
+            f.write("section,duration,passenger_arrival_rate\nsimulation,600,0.3\n")
+        
+        def seeded_journeys(seed):
+            """Run a fresh simulator with a seed and return its journeys."""
+            simulator = create_headless_simulator(
+                {'id': 'seeded_building', 'num_floors': 10},
+                [{'id': 'car_1', 'capacity': 8, 'speed': 2.0},
+                 {'id': 'car_2', 'capacity': 8, 'speed': 2.0}],
+                SimulationConfig(sim_config_path), output_dir=temp_dir)
+            simulator.run_discrete_event(600, seed=seed, write_output=False)
+            return list(simulator.journeys)
+        
+        first, second, other = seeded_journeys(7), seeded_journeys(7), seeded_journeys(8)
+        shutil.rmtree(temp_dir)
+        
+        if first and first == second and first != other:
+            print("✅ Seeded discrete-event runs passed")
+        else:
+            print(f"❌ Seeded runs failed: {len(first)} and {len(second)} journeys "
+                  f"with the same seed, {len(other)} with another")
+        
+    except Exception as e:
+        print(f"❌ Seeded run test failed: {e}")
+    
+    # Test 31: Resuming a sweep and dropping a partial last row
+    try:
+        import csv
+        from config.building_config import BuildingConfig
+        from simulation.sweep import run_sweep, RESULT_COLUMNS
+        
+        temp_dir = tempfile.mkdtemp()
+        building_config_path = os.path.join(temp_dir, "building.csv")
+        BuildingConfig.create_sample_config(building_config_path)
+        sim_config_path = os.path.join(temp_dir, "simulation.csv")
+        with open(sim_config_path, "w") as f:
+            f.write("section,duration,passenger_arrival_rate\nsimulation,120,0.2\n")
+        output_path = os.path.join(temp_dir, "sweep.csv")
+        grid = {'elevator_count': [1, 2], 'capacity': [6, 10]}
+        
+        def sweep():
+            """Run the grid into the shared results file."""
+            return run_sweep(building_config_path, grid, output_path,
+                             sim_config_path, max_workers=2)
+        
+        first = sweep()
+        resumed = sweep()
+        
+        # Cut the last row off mid-way, as an interrupted append would
+        with open(output_path, 'rb+') as f:
+            f.truncate(os.path.getsize(output_path) - 10)
+        repaired = sweep()
+        
+        with open(output_path, 'rb') as f:
+            content = f.read()
+        with open(output_path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        shutil.rmtree(temp_dir)
+        
+        if (first['completed_cells'] == first['total_cells'] == 4 and
+                resumed['skipped_cells'] == resumed['total_cells'] and
+                resumed['completed_cells'] == 0 and
+                repaired['completed_cells'] == 1 and content.endswith(b'\n') and
+                len(rows) == 4 and len({row['cell_id'] for row in rows}) == 4 and
+                all(len(row) == len(RESULT_COLUMNS) for row in rows)):
+            print("✅ Sweep resume passed")
+        else:
+            print(f"❌ Sweep resume failed: {first}, {resumed}, {repaired}, {len(rows)} rows")
+        
+    except Exception as e:
+        print(f"❌ Sweep resume test failed: {e}")
+    
     print("\nTest Summary Complete!")
     print("Run 'python main.py' to start the GUI application.")
 
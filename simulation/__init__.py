@@ -4,5 +4,17 @@ Simulation package for elevator simulation.
 
 from .simulator import ElevatorSimulator
 from .logger import SimulationLogger, setup_logging
+from .csv_writer import BufferedCSVWriter
+from .statistics import RunningStats, QuantileSketch, TimeDistribution, JourneyStatistics
+from .log_reader import read_state_changes, read_tick_timestamps, expand_state_changes
+from .columnar import ColumnarWriter, ColumnarLog, convert_to_csv
+from .discrete_event import DiscreteEventEngine, EventType
+from .batch import run_batch
+from .replication import run_replications
+from .sweep import run_sweep
 
-__all__ = ['ElevatorSimulator', 'SimulationLogger', 'setup_logging']
\ No newline at end of file
+__all__ = ['ElevatorSimulator', 'SimulationLogger', 'BufferedCSVWriter', 'setup_logging',
+           'DiscreteEventEngine', 'EventType', 'run_batch', 'run_replications',
+           'run_sweep', 'RunningStats', 'QuantileSketch', 'TimeDistribution',
+           'JourneyStatistics', 'read_state_changes', 'read_tick_timestamps',
+           'expand_state_changes', 'ColumnarWriter', 'ColumnarLog', 'convert_to_csv']
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""
+Headless batch runs of the discrete-event simulation.
+"""
+
+import time
+import logging
+from typing import Any, Dict, List
+from config.building_config import BuildingConfig
+from config.simulation_config import SimulationConfig
+from models.building import Building
+from models.clock import VirtualClock
+from .simulator import ElevatorSimulator
+
+def create_headless_simulator(building_data: Dict[str, Any],
+                              elevators_data: List[Dict[str, Any]],
+                              simulation_config: SimulationConfig = None,
+                              seed: int = None,
+                              output_dir: str = "simulation_output") -> ElevatorSimulator:
+    """
+    Create a simulator on a virtual clock from plain configuration data.
+
+    Args:
+        building_data: Building configuration (id, num_floors, parking,
+            vectorized)
+        elevators_data: Elevator configuration dictionaries
+        simulation_config: Simulation configuration (optional)
+        seed: Seed for random passenger generation (optional)
+        output_dir: Directory for output files
+
+    Returns:
+        ElevatorSimulator: Simulator ready for run_discrete_event()
+    """
+    clock = VirtualClock()
+    building = Building(building_data['id'], building_data['num_floors'],
+                        elevators_data, clock,
+                        vectorized=building_data.get('vectorized', False),
+                        parking=building_data.get('parking', 'initial'))
+    return ElevatorSimulator(building, simulation_config, clock, seed, output_dir)
+
+def run_batch(building_config_file: str, simulation_config_file: str = None,
+              duration: float = None, seed: int = None,
+              output_dir: str = "simulation_output",
+              vectorized: bool = False) -> Dict[str, Any]:
+    """
+    Run a simulation as fast as possible without a GUI.
+
+    The usual CSV logs, summaries and JSON report are written to the
+    output directory.
+
+    Args:
+        building_config_file: Path to the building configuration CSV file
+        simulation_config_file: Path to the simulation configuration CSV file (optional)
+        duration: Simulated duration in seconds (defaults to the configured duration)
+        seed: Seed for random passenger generation (optional)
+        output_dir: Directory for output files
+        vectorized: Use the vectorized elevator bank even if the building
+            configuration does not ask for it
+
+    Returns:
+        Dict[str, Any]: Summary of the completed run
+
+    Raises:
+        ValueError: If the building configuration is invalid
+    """
+    building_config = BuildingConfig(building_config_file)
+    errors = building_config.validate_configuration()
+    if errors:
+        raise ValueError("Invalid building configuration: " + "; ".join(errors))
+
+    simulation_config = SimulationConfig(simulation_config_file)
+    if duration is None:
+        duration = simulation_config.get_simulation_duration()
+
+    building_data = building_config.building_data
+    if vectorized:
+        building_data['vectorized'] = True
+
+    simulator = create_headless_simulator(building_data,
+                                          building_config.elevators_data,
+                                          simulation_config, seed, output_dir)
+
+    wall_start = time.perf_counter()
+    events_processed = simulator.run_discrete_event(duration)
+    wall_time = time.perf_counter() - wall_start
+
+    status = simulator.get_simulation_status()
+    summary = {
+        'building_id': simulator.building.id,
+        'seed': seed,
+        'simulated_time': status.get('elapsed_time', 0),
+        'wall_time': wall_time,
+        'events_processed': events_processed,
+        'total_passengers': status.get('passenger_count', 0),
+        'active_passengers': status.get('active_passengers', 0),
+        'output_dir': output_dir
+    }
+
+    logging.info(f"Batch run finished: {events_processed} events, "
+                f"{summary['simulated_time']:.0f}s simulated in {wall_time:.2f}s")
+    return summary
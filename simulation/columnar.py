@@ -0,0 +1,344 @@
+"""
+Binary columnar log files with a memory-mapped reader.
+
+A log file holds one stream (e.g. elevator_states) as fixed-width typed
+records:
+
+- magic bytes, then three little-endian uint64s: the length of the JSON
+  header, the row count and the offset of the JSON trailer (both zero
+  until the file is closed)
+- the JSON header naming the stream and its (column, kind) pairs,
+  padded so the records start on an 8-byte boundary
+- the records, one field per column
+- the JSON trailer with the values of the categorical columns
+
+Column kinds are 'float' (float64, NaN when missing), 'int' (int32, -1
+when missing), 'bool', 'category' (int32 codes into the trailer's
+values, -1 when missing) for columns with few distinct values, and
+'string' (UTF-8 bytes of fixed width, empty when missing) for columns
+such as passenger IDs whose values rarely repeat. The reader maps the
+records into memory, so a column is a NumPy view into the file rather
+than a parsed copy.
+"""
+
+import csv
+import json
+import math
+import struct
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional dependency
+    np = None
+
+_MAGIC = b'ELVCOL1\n'
+_PREFIX = struct.Struct('<8sQQQ')
+
+# Bytes of a 'string' value
+STRING_WIDTH = 16
+
+# NumPy type of each column kind
+COLUMN_KINDS = {
+    'float': '<f8',
+    'int': '<i4',
+    'bool': '?',
+    'category': '<i4',
+    'string': f'S{STRING_WIDTH}'
+}
+
+def _record_dtype(columns: Sequence[Tuple[str, str]]):
+    """Build the record type of a stream's columns."""
+    return np.dtype([(name, COLUMN_KINDS[kind]) for name, kind in columns])
+
+class ColumnarWriter:
+    """
+    Appends rows of one stream to a binary columnar log file.
+
+    Rows are stored in a preallocated NumPy record buffer that is written
+    to the file whenever it fills, so writing a row only converts its
+    values. Strings in categorical columns are replaced by integer codes.
+    The file is complete once close() has written the remaining rows, the
+    categories and the row count; a file that was never closed can still
+    be read, but without category values. Writes are serialized by a
+    lock, so rows may come from several threads.
+    """
+
+    def __init__(self, file_path: Union[str, Path], stream: str,
+                 columns: Sequence[Tuple[str, str]], buffer_rows: int = 4096):
+        """
+        Create the file and write its header.
+
+        Args:
+            file_path: Path of the log file to create
+            stream: Name of the logged stream
+            columns: (column name, kind) pairs (see COLUMN_KINDS)
+            buffer_rows: Rows held in memory between writes to the file
+
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If a column kind is unknown
+            OSError: If the file cannot be created
+        """
+        if np is None:
+            raise ImportError("NumPy is required for columnar logs")
+        for name, kind in columns:
+            if kind not in COLUMN_KINDS:
+                raise ValueError(f"Unknown kind {kind!r} of column {name}")
+
+        self._file_path = Path(file_path)
+        self._columns = [(name, kind) for name, kind in columns]
+        self._buffer = np.zeros(max(1, buffer_rows), dtype=_record_dtype(self._columns))
+        self._buffered = 0
+        self._rows = 0
+        self._categories: Dict[str, Dict[str, int]] = {
+            name: {} for name, kind in self._columns if kind == 'category'}
+        self._closed = False
+        self._lock = threading.Lock()
+
+        header = json.dumps({'stream': stream, 'columns': self._columns}).encode()
+        header += b' ' * (-(_PREFIX.size + len(header)) % 8)
+        self._header_length = len(header)
+        self._file = open(self._file_path, 'wb')
+        self._file.write(_PREFIX.pack(_MAGIC, self._header_length, 0, 0))
+        self._file.write(header)
+
+    @property
+    def file_path(self) -> Path:
+        return self._file_path
+
+    @property
+    def rows_written(self) -> int:
+        """Get the number of rows written, including buffered rows."""
+        return self._rows + self._buffered
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """
+        Add a row.
+
+        Args:
+            row: Values by column name; other keys are ignored
+
+        Raises:
+            ValueError: If the writer has been closed, or a string value is
+                longer than STRING_WIDTH bytes
+        """
+        with self._lock:
+            if self._closed:
+                raise ValueError(f"Write to closed columnar log {self._file_path}")
+
+            values = []
+            for name, kind in self._columns:
+                value = row.get(name)
+                if kind == 'float':
+                    values.append(math.nan if value is None else value)
+                elif kind == 'int':
+                    values.append(-1 if value is None else value)
+                elif kind == 'bool':
+                    values.append(bool(value))
+                elif kind == 'string':
+                    encoded = b'' if value is None else str(value).encode()
+                    if len(encoded) > STRING_WIDTH:
+                        raise ValueError(f"Value of column {name} is longer than "
+                                         f"{STRING_WIDTH} bytes: {value!r}")
+                    values.append(encoded)
+                elif value is None:
+                    values.append(-1)
+                else:
+                    codes = self._categories[name]
+                    values.append(codes.setdefault(str(value), len(codes)))
+
+            self._buffer[self._buffered] = tuple(values)
+            self._buffered += 1
+            if self._buffered == len(self._buffer):
+                self._flush_buffer()
+
+    def close(self) -> None:
+        """Write the buffered rows and the trailer, then close the file."""
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+            try:
+                self._flush_buffer()
+                trailer_offset = self._file.tell()
+                categories = {name: list(codes) for name, codes in self._categories.items()}
+                self._file.write(json.dumps({'categories': categories}).encode())
+
+                self._file.seek(0)
+                self._file.write(_PREFIX.pack(_MAGIC, self._header_length, self._rows,
+                                              trailer_offset))
+            finally:
+                self._file.close()
+
+    def _flush_buffer(self) -> None:
+        """Append the buffered rows to the file; the caller holds the lock."""
+        if self._buffered:
+            self._file.write(self._buffer[:self._buffered].tobytes())
+            self._rows += self._buffered
+            self._buffered = 0
+
+class ColumnarLog:
+    """
+    Memory-mapped view of a binary columnar log file.
+
+    Columns are returned as read-only NumPy views into the mapped file;
+    categorical columns hold codes and string columns hold bytes, which
+    decode() turns into values.
+    """
+
+    def __init__(self, file_path: Union[str, Path]):
+        """
+        Map a log file into memory.
+
+        Args:
+            file_path: Path of a file written by ColumnarWriter
+
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If the file is not a columnar log
+        """
+        if np is None:
+            raise ImportError("NumPy is required for columnar logs")
+
+        self._file_path = Path(file_path)
+        with open(self._file_path, 'rb') as f:
+            prefix = f.read(_PREFIX.size)
+            if len(prefix) < _PREFIX.size or prefix[:len(_MAGIC)] != _MAGIC:
+                raise ValueError(f"Not a columnar log file: {self._file_path}")
+            _, header_length, rows, trailer_offset = _PREFIX.unpack(prefix)
+            header = json.loads(f.read(header_length))
+
+            categories = {}
+            if trailer_offset:
+                f.seek(trailer_offset)
+                categories = json.loads(f.read())['categories']
+
+        self._stream = header['stream']
+        self._columns = [(name, kind) for name, kind in header['columns']]
+        self._categories: Dict[str, List[str]] = categories
+        dtype = _record_dtype(self._columns)
+        data_offset = _PREFIX.size + header_length
+
+        if not trailer_offset:
+            # The writer did not close the file; count the complete records
+            size = self._file_path.stat().st_size
+            rows = (size - data_offset) // dtype.itemsize
+            logging.warning(f"Columnar log {self._file_path} was not closed; "
+                            f"reading {rows} rows without category values")
+
+        if rows:
+            self._records = np.memmap(self._file_path, dtype=dtype, mode='r',
+                                      offset=data_offset, shape=(rows,))
+        else:
+            self._records = np.zeros(0, dtype=dtype)
+
+    @property
+    def stream(self) -> str:
+        return self._stream
+
+    @property
+    def columns(self) -> List[str]:
+        return [name for name, _ in self._columns]
+
+    @property
+    def records(self):
+        """Get all rows as a read-only NumPy record array view."""
+        return self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, column: str):
+        """Get a column as a NumPy view without copying."""
+        return self._records[column]
+
+    def get_kind(self, column: str) -> str:
+        """Get the kind of a column (see COLUMN_KINDS)."""
+        return dict(self._columns)[column]
+
+    def get_categories(self, column: str) -> List[str]:
+        """Get the values of a categorical column, indexed by code."""
+        return list(self._categories.get(column, ()))
+
+    def decode(self, column: str) -> List[Optional[str]]:
+        """
+        Get the values of a categorical or string column.
+
+        Args:
+            column: Categorical or string column name
+
+        Returns:
+            List[Optional[str]]: Value of every row (None where missing)
+        """
+        if self.get_kind(column) == 'string':
+            return [value.decode() if value else None
+                    for value in self._records[column].tolist()]
+
+        categories = self._categories.get(column, [])
+        return [categories[code] if 0 <= code < len(categories) else None
+                for code in self._records[column].tolist()]
+
+    def to_csv(self, csv_path: Union[str, Path], chunk_rows: int = 65536) -> int:
+        """
+        Convert the log to a CSV file with the same columns.
+
+        Missing values are written as empty fields and booleans as
+        True/False, as SimulationLogger writes them. Rows are converted
+        in chunks, so memory use does not grow with the file.
+
+        Args:
+            csv_path: Path of the CSV file to write
+            chunk_rows: Rows converted at a time
+
+        Returns:
+            int: Number of rows written
+        """
+        with open(csv_path, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(self.columns)
+
+            for start in range(0, len(self._records), chunk_rows):
+                chunk = self._records[start:start + chunk_rows]
+                columns = []
+                for name, kind in self._columns:
+                    values = chunk[name].tolist()
+                    if kind == 'category':
+                        categories = self._categories.get(name, [])
+                        values = [categories[code] if 0 <= code < len(categories) else None
+                                  for code in values]
+                    elif kind == 'float':
+                        values = [None if math.isnan(value) else value for value in values]
+                    elif kind == 'int':
+                        values = [None if value == -1 else value for value in values]
+                    elif kind == 'string':
+                        values = [value.decode() if value else None for value in values]
+                    columns.append(values)
+                writer.writerows(zip(*columns))
+
+        return len(self._records)
+
+def convert_to_csv(file_path: Union[str, Path], csv_path: Union[str, Path] = None) -> Path:
+    """
+    Convert a columnar log file to CSV.
+
+    Args:
+        file_path: Path of the columnar log file
+        csv_path: Path of the CSV file (defaults to the log path with a
+            .csv suffix)
+
+    Returns:
+        Path: Path of the CSV file written
+    """
+    csv_path = Path(csv_path) if csv_path is not None else Path(file_path).with_suffix('.csv')
+    rows = ColumnarLog(file_path).to_csv(csv_path)
+    logging.info(f"Converted {rows} rows of {file_path} to {csv_path}")
+    return csv_path
@@ -0,0 +1,144 @@
+"""
+Buffered CSV output written by a background thread.
+"""
+
+import csv
+import queue
+import threading
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+# Queue entry telling the writer thread to drain and close the file
+_CLOSE = object()
+
+class BufferedCSVWriter:
+    """
+    Writes dictionary rows to a CSV file from a background thread.
+
+    write() only puts the row on a bounded queue, so the simulation thread
+    never formats rows or touches the file. The writer thread collects
+    rows into batches, writes each batch with writerows() and flushes the
+    file when a batch reaches batch_size rows or flush_interval seconds
+    have passed since the last flush. When the queue is full, write()
+    blocks until the thread catches up, so no rows are dropped; close()
+    drains every queued row before closing the file.
+    """
+
+    def __init__(self, file_path: Union[str, Path], fieldnames: List[str],
+                 max_queued: int = 10000, batch_size: int = 1000,
+                 flush_interval: float = 1.0):
+        """
+        Open the file, write the header and start the writer thread.
+
+        Args:
+            file_path: Path of the CSV file to create
+            fieldnames: Column names; other keys of a row are ignored
+            max_queued: Rows that can wait for the writer thread before
+                write() blocks
+            batch_size: Rows written and flushed together
+            flush_interval: Longest time in seconds a written row waits
+                before the file is flushed
+
+        Raises:
+            OSError: If the file cannot be opened
+        """
+        self._file_path = Path(file_path)
+        self._fieldnames = list(fieldnames)
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+
+        self._file = open(self._file_path, 'w', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=self._fieldnames,
+                                      extrasaction='ignore')
+        self._writer.writeheader()
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_queued))
+        self._closed = False
+        self._rows_written = 0
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name=f"csv-writer-{self._file_path.stem}")
+        self._thread.start()
+
+    @property
+    def file_path(self) -> Path:
+        return self._file_path
+
+    @property
+    def fieldnames(self) -> List[str]:
+        return list(self._fieldnames)
+
+    @property
+    def rows_written(self) -> int:
+        """Get the number of rows the writer thread has written so far."""
+        return self._rows_written
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """
+        Queue a row for writing.
+
+        Args:
+            row: Row values by column name; the row must not be changed
+                after it is queued
+
+        Raises:
+            ValueError: If the writer has been closed
+        """
+        if self._closed:
+            raise ValueError(f"Write to closed CSV writer {self._file_path}")
+        self._queue.put(row)
+
+    def close(self) -> None:
+        """Write all queued rows, then flush and close the file."""
+        if self._closed:
+            return
+
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Write queued rows in batches until the writer is closed."""
+        batch = []
+        last_flush = time.monotonic()
+
+        while True:
+            timeout = max(0.0, self._flush_interval - (time.monotonic() - last_flush))
+            try:
+                row = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                row = None
+
+            if row is _CLOSE:
+                break
+            if row is not None:
+                batch.append(row)
+
+            if (len(batch) >= self._batch_size or
+                    time.monotonic() - last_flush >= self._flush_interval):
+                self._write_batch(batch)
+                batch = []
+                last_flush = time.monotonic()
+
+        self._write_batch(batch)
+        try:
+            self._file.close()
+        except Exception as e:
+            logging.error(f"Error closing CSV file {self._file_path}: {e}")
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Write and flush a batch of rows."""
+        if not batch:
+            return
+
+        try:
+            self._writer.writerows(batch)
+            self._file.flush()
+            self._rows_written += len(batch)
+        except Exception as e:
+            logging.error(f"Error writing to CSV file {self._file_path}: {e}")
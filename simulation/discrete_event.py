@@ -0,0 +1,314 @@
+"""
+Discrete-event simulation engine for headless elevator simulation.
+"""
+
+import heapq
+import itertools
+import random
+import logging
+from enum import Enum
+from typing import Any, Dict, List, Tuple
+from models.building import Building
+from models.elevator import Elevator, ElevatorState
+from models.clock import VirtualClock
+from controllers.simulation_controller import SimulationController
+from config.simulation_config import SimulationConfig
+from .logger import SimulationLogger
+
+class EventType(Enum):
+    """Enumeration of events that can be scheduled on the agenda."""
+    ELEVATOR_DEPARTURE = "elevator_departure"
+    FLOOR_ARRIVAL = "floor_arrival"
+    DOORS_OPENED = "doors_opened"
+    DOORS_CLOSING = "doors_closing"
+    DOORS_CLOSED = "doors_closed"
+    PASSENGER_ARRIVAL = "passenger_arrival"
+    DISPATCH_CYCLE = "dispatch_cycle"
+    SERVICE_CHANGE = "service_change"
+    METRICS_SAMPLE = "metrics_sample"
+
+# Event raised when an elevator in a given state completes its current phase
+_ELEVATOR_EVENTS = {
+    ElevatorState.IDLE: EventType.ELEVATOR_DEPARTURE,
+    ElevatorState.MOVING_UP: EventType.FLOOR_ARRIVAL,
+    ElevatorState.MOVING_DOWN: EventType.FLOOR_ARRIVAL,
+    ElevatorState.DOORS_OPENING: EventType.DOORS_OPENED,
+    ElevatorState.DOORS_OPEN: EventType.DOORS_CLOSING,
+    ElevatorState.DOORS_CLOSING: EventType.DOORS_CLOSED,
+}
+
+class DiscreteEventEngine:
+    """
+    Advances the simulation from event to event using a priority-queue agenda.
+
+    Instead of polling every elevator at a fixed rate, each elevator has at
+    most one pending event (the completion of its current phase) and
+    passengers are scheduled at their arrival times. Simulated time jumps
+    straight to the next event, so runs are limited only by CPU. While the
+    logger is logging, system metrics are sampled every metrics_interval
+    simulated seconds (see SimulationConfig.get_metrics_interval).
+    """
+
+    def __init__(self, building: Building, controller: SimulationController,
+                 config: SimulationConfig = None, logger: SimulationLogger = None,
+                 rng: random.Random = None, clock: VirtualClock = None):
+        """
+        Initialize the discrete-event engine.
+
+        Args:
+            building: The building to simulate
+            controller: Controller handling dispatch and passenger exchange
+            config: Simulation configuration for passenger generation (optional)
+            logger: Logger for elevator state transitions and system
+                metrics (optional)
+            rng: Random number generator for passenger generation (optional)
+            clock: Virtual clock advanced from event to event; should be the
+                clock shared by the building, controller and logger
+        """
+        self._building = building
+        self._controller = controller
+        self._config = config or SimulationConfig()
+        self._logger = logger
+        self._rng = rng or random.Random()
+
+        self._clock = clock or VirtualClock()
+        self._agenda: List[Tuple[float, int, EventType, Any]] = []
+        self._sequence = itertools.count()
+        self._elevators: Dict[str, Elevator] = building.elevators
+        self._elevator_versions = {eid: 0 for eid in self._elevators}
+        for elevator in self._elevators.values():
+            elevator.add_service_state_listener(self._on_service_state_changed)
+
+        self._arrivals_started = False
+        self._dispatch_scheduled = False
+        self._metrics_scheduled = False
+
+        self._events_processed = 0
+        self._event_counts = {event_type: 0 for event_type in EventType}
+
+        logging.info("Discrete-event engine initialized")
+
+    @property
+    def now(self) -> float:
+        """Get the current simulated time in seconds."""
+        return self._clock.now()
+
+    @property
+    def events_processed(self) -> int:
+        """Get the total number of events processed."""
+        return self._events_processed
+
+    @property
+    def event_counts(self) -> Dict[str, int]:
+        """Get the number of processed events by type."""
+        return {event_type.value: count
+                for event_type, count in self._event_counts.items()}
+
+    @property
+    def pending_events(self) -> int:
+        """Get the number of events on the agenda (including stale ones)."""
+        return len(self._agenda)
+
+    def schedule_passenger(self, arrival_time: float, origin_floor: int,
+                           destination_floor: int) -> None:
+        """
+        Schedule a passenger to arrive at a floor.
+
+        Args:
+            arrival_time: Simulated arrival time
+            origin_floor: Starting floor
+            destination_floor: Target floor
+        """
+        self._push(max(arrival_time, self._clock.now()), EventType.PASSENGER_ARRIVAL,
+                   (origin_floor, destination_floor))
+
+    def schedule_service_state(self, event_time: float, elevator_id: str,
+                               state: ElevatorState) -> None:
+        """
+        Schedule an elevator to leave or return to service.
+
+        Args:
+            event_time: Simulated time of the change
+            elevator_id: ID of the elevator
+            state: MAINTENANCE or EMERGENCY to take it out of service, IDLE
+                to return it to service
+
+        Raises:
+            ValueError: If the elevator does not exist
+        """
+        if elevator_id not in self._elevators:
+            raise ValueError(f"Unknown elevator: {elevator_id}")
+        self._push(max(event_time, self._clock.now()), EventType.SERVICE_CHANGE,
+                   (elevator_id, state))
+
+    def run(self, until: float) -> int:
+        """
+        Process events until the agenda is empty or the given time is reached.
+
+        Args:
+            until: Simulated time at which to stop
+
+        Returns:
+            int: Number of events processed during this call
+        """
+        processed_before = self._events_processed
+
+        if not self._arrivals_started:
+            self._schedule_configured_passengers()
+            self._arrivals_started = True
+        self._wake_idle_elevators()
+        self._schedule_metrics_sample(self._clock.now())
+
+        clock = self._clock
+        agenda = self._agenda
+        while agenda and agenda[0][0] <= until:
+            event_time, _, event_type, payload = heapq.heappop(agenda)
+
+            if event_type == EventType.PASSENGER_ARRIVAL:
+                clock.advance_to(event_time)
+                if payload is None:
+                    payload = self._generate_passenger()
+                self._handle_passenger_arrival(*payload)
+            elif event_type == EventType.DISPATCH_CYCLE:
+                clock.advance_to(event_time)
+                self._handle_dispatch_cycle()
+            elif event_type == EventType.SERVICE_CHANGE:
+                clock.advance_to(event_time)
+                elevator_id, state = payload
+                self._elevators[elevator_id].set_service_state(state)
+            elif event_type == EventType.METRICS_SAMPLE:
+                clock.advance_to(event_time)
+                self._handle_metrics_sample()
+            else:
+                elevator_id, version, delay = payload
+                if version != self._elevator_versions[elevator_id]:
+                    continue  # Superseded by a later reschedule
+                clock.advance_to(event_time)
+                self._handle_elevator_event(self._elevators[elevator_id], delay)
+
+            self._events_processed += 1
+            self._event_counts[event_type] += 1
+
+        if until > clock.now():
+            clock.advance_to(until)
+
+        processed = self._events_processed - processed_before
+        logging.info(f"Discrete-event run reached t={clock.now():.1f}s "
+                    f"after {processed} events")
+        return processed
+
+    def _push(self, event_time: float, event_type: EventType, payload: Any) -> None:
+        """Add an event to the agenda."""
+        heapq.heappush(self._agenda,
+                       (event_time, next(self._sequence), event_type, payload))
+
+    def _schedule_elevator(self, elevator: Elevator) -> None:
+        """Schedule the completion of an elevator's current phase."""
+        self._elevator_versions[elevator.id] += 1
+        delay = elevator.get_time_to_next_event()
+
+        if delay is not None:
+            self._push(self._clock.now() + delay, _ELEVATOR_EVENTS[elevator.state],
+                       (elevator.id, self._elevator_versions[elevator.id], delay))
+
+    def _wake_idle_elevators(self) -> None:
+        """Reschedule idle elevators that may have received new requests."""
+        for elevator in self._elevators.values():
+            if elevator.state == ElevatorState.IDLE:
+                self._schedule_elevator(elevator)
+
+    def _handle_elevator_event(self, elevator: Elevator, delay: float) -> None:
+        """Advance an elevator through its completed phase."""
+        previous_state = elevator.state
+        elevator.update(delay)  # Door openings notify the controller
+
+        if (self._logger and self._logger.is_logging and
+                elevator.state != previous_state):
+            self._logger.log_elevator_state(elevator.id, elevator.get_status_dict())
+
+        self._schedule_elevator(elevator)
+        if previous_state == ElevatorState.DOORS_OPENING:
+            # Riders left behind by a full car, or changing zones here,
+            # may have called idle cars
+            self._wake_idle_elevators()
+
+    def _handle_passenger_arrival(self, origin_floor: int,
+                                  destination_floor: int) -> None:
+        """Add an arriving passenger, who boards any car with open doors."""
+        self._controller.add_passenger(origin_floor, destination_floor,
+                                       self._clock.now())
+        self._wake_idle_elevators()
+        self._schedule_dispatch_cycle()
+
+    def _on_service_state_changed(self, elevator: Elevator) -> None:
+        """Reschedule a car leaving or returning to service and the cars given its calls."""
+        self._schedule_elevator(elevator)
+        self._wake_idle_elevators()
+        self._schedule_dispatch_cycle()
+
+    def _handle_dispatch_cycle(self) -> None:
+        """Assign collected hall calls and wake the cars that received them."""
+        self._dispatch_scheduled = False
+        self._controller.elevator_controller.run_dispatch_cycle()
+        self._wake_idle_elevators()
+        self._schedule_dispatch_cycle()
+
+    def _schedule_dispatch_cycle(self) -> None:
+        """Schedule the next dispatch cycle if hall calls are waiting for one."""
+        if self._dispatch_scheduled:
+            return
+
+        cycle_time = self._controller.elevator_controller.next_dispatch_time(self._clock.now())
+        if cycle_time is not None:
+            self._push(cycle_time, EventType.DISPATCH_CYCLE, None)
+            self._dispatch_scheduled = True
+
+    def _handle_metrics_sample(self) -> None:
+        """Log the system metrics and schedule the next sample."""
+        self._metrics_scheduled = False
+        if not self._logger.is_logging:
+            return
+
+        self._logger.log_system_metrics(
+            self._controller.elevator_controller.get_performance_metrics())
+        self._schedule_metrics_sample(self._clock.now() + self._config.get_metrics_interval())
+
+    def _schedule_metrics_sample(self, sample_time: float) -> None:
+        """Schedule a system metrics sample while the logger is logging."""
+        if (self._metrics_scheduled or self._logger is None or
+                not self._logger.is_logging or self._config.get_metrics_interval() <= 0):
+            return
+
+        self._push(sample_time, EventType.METRICS_SAMPLE, None)
+        self._metrics_scheduled = True
+
+    def _schedule_configured_passengers(self) -> None:
+        """Schedule predefined passengers and the first generated arrival."""
+        for passenger_config in self._config.passengers:
+            self.schedule_passenger(self._clock.now() + passenger_config['arrival_time'],
+                                    passenger_config['origin_floor'],
+                                    passenger_config['destination_floor'])
+
+        self._schedule_next_generated_arrival()
+
+    def _schedule_next_generated_arrival(self) -> None:
+        """Schedule the next arrival of the Poisson passenger process."""
+        arrival_rate = self._config.get_passenger_arrival_rate()
+        if arrival_rate <= 0 or self._building.num_floors < 2:
+            return
+
+        # Exponential inter-arrival times give a Poisson arrival process
+        arrival_time = self._clock.now() + self._rng.expovariate(arrival_rate)
+        self._push(arrival_time, EventType.PASSENGER_ARRIVAL, None)
+
+    def _generate_passenger(self) -> Tuple[int, int]:
+        """Draw a random origin and destination for a generated arrival."""
+        num_floors = self._building.num_floors
+
+        origin = self._rng.randint(1, num_floors)
+        destination = self._rng.randint(1, num_floors - 1)
+        if destination >= origin:
+            destination += 1
+
+        self._schedule_next_generated_arrival()
+        return origin, destination
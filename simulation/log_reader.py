@@ -0,0 +1,68 @@
+"""
+Readers for simulation CSV logs.
+"""
+
+import csv
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+def read_state_changes(file_path: Union[str, Path]) -> Iterator[Dict[str, str]]:
+    """
+    Read the rows of an elevator states log in file order.
+
+    Args:
+        file_path: Path of an elevator_states CSV file
+
+    Yields:
+        Dict[str, str]: One row, with values as written
+    """
+    with open(file_path, 'r', newline='') as csvfile:
+        yield from csv.DictReader(csvfile)
+
+def read_tick_timestamps(file_path: Union[str, Path]) -> List[float]:
+    """
+    Read the times at which the simulation state was logged.
+
+    log_simulation_state writes one system_metrics row per call, so the
+    rows' timestamps are the ticks of the elevator states series.
+
+    Args:
+        file_path: Path of a system_metrics CSV file
+
+    Returns:
+        List[float]: Tick timestamps in file order
+    """
+    with open(file_path, 'r', newline='') as csvfile:
+        return [float(row['timestamp']) for row in csv.DictReader(csvfile)]
+
+def expand_state_changes(file_path: Union[str, Path],
+                         timestamps: Iterable[float]) -> Iterator[Dict[str, Any]]:
+    """
+    Reconstruct the per-tick elevator states from a change-only log.
+
+    A log written with state_logging='changes' holds a car's row only when
+    the car's state changed, so the car's state at any time is its latest
+    row at or before that time. The file is read once, alongside the
+    ticks, and only the latest row of each car is kept in memory.
+
+    Args:
+        file_path: Path of an elevator_states CSV file
+        timestamps: Tick times in ascending order, e.g. from
+            read_tick_timestamps
+
+    Yields:
+        Dict[str, Any]: One row per car and tick, in the order cars first
+        appear in the log, with the tick as its float timestamp and the
+        other values as written
+    """
+    rows = read_state_changes(file_path)
+    pending = next(rows, None)
+    latest: Dict[str, Dict[str, str]] = {}
+
+    for timestamp in timestamps:
+        while pending is not None and float(pending['timestamp']) <= timestamp:
+            latest[pending['elevator_id']] = pending
+            pending = next(rows, None)
+
+        for row in latest.values():
+            yield {**row, 'timestamp': timestamp}
@@ -4,17 +4,58 @@ Simulation logging and data collection system.
 
 import csv
 import json
-import time
 import logging
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from models.clock import SimulationClock, RealTimeClock
+from .csv_writer import BufferedCSVWriter
+from .statistics import JourneyStatistics, SUMMARY_QUANTILES
+from .columnar import ColumnarWriter
 
-def setup_logging() -> None:
-    """Set up application logging configuration."""
+# Output formats of the log streams: CSV text, or binary columnar files
+# read with columnar.ColumnarLog and convertible to CSV
+LOG_FORMATS = ('csv', 'columnar')
+
+# Columns of each log stream and their kinds in columnar files
+LOG_COLUMNS = {
+    'elevator_states': [('timestamp', 'float'), ('elevator_id', 'category'),
+                        ('current_floor', 'int'), ('state', 'category'),
+                        ('direction', 'category'), ('passenger_count', 'int'),
+                        ('door_open', 'bool')],
+    'passenger_events': [('timestamp', 'float'), ('passenger_id', 'string'),
+                         ('event_type', 'category'), ('floor', 'int'),
+                         ('elevator_id', 'category'), ('origin_floor', 'int'),
+                         ('destination_floor', 'int')],
+    'passenger_journeys': [('passenger_id', 'string'), ('origin_floor', 'int'),
+                           ('destination_floor', 'int'), ('elevator_id', 'category'),
+                           ('arrival_time', 'float'), ('board_time', 'float'),
+                           ('destination_arrival_time', 'float'), ('wait_time', 'float'),
+                           ('travel_time', 'float'), ('total_time', 'float')],
+    'button_presses': [('timestamp', 'float'), ('button_type', 'category'),
+                       ('location', 'category'), ('target', 'category')],
+    'system_metrics': [('timestamp', 'float'), ('total_elevators', 'int'),
+                       ('active_elevators', 'int'), ('idle_elevators', 'int'),
+                       ('pending_requests', 'int')]
+}
+
+# How elevator states are written: a row per car on every log call, or
+# only when a logged field changes (see log_reader.expand_state_changes)
+STATE_LOGGING_MODES = ('every_tick', 'changes')
+
+# Elevator state columns compared to detect a change
+STATE_CHANGE_FIELDS = ('current_floor', 'state', 'direction', 'passenger_count', 'door_open')
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """
+    Set up application logging configuration.
+    
+    Args:
+        level: Minimum severity of messages to record
+    """
     log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     logging.basicConfig(
-        level=logging.INFO,
+        level=level,
         format=log_format,
         handlers=[
             logging.FileHandler('elevator_simulation.log'),
@@ -30,47 +71,104 @@ class SimulationLogger:
     solely on data collection and persistence.
     """
     
-    def __init__(self, output_dir: str = "simulation_output"):
+    def __init__(self, output_dir: str = "simulation_output",
+                 clock: SimulationClock = None, state_logging: str = 'every_tick',
+                 log_format: str = 'csv'):
         """
         Initialize the simulation logger.
         
         Args:
             output_dir: Directory for output files
+            clock: Clock used to timestamp log entries (defaults to real time)
+            state_logging: How elevator states are written (see
+                STATE_LOGGING_MODES); 'changes' writes a car's row only when
+                its floor, state, direction, load or door status changes
+            log_format: Format of the log streams (see LOG_FORMATS);
+                'columnar' requires NumPy
+            
+        Raises:
+            ValueError: If the state logging mode or log format is unknown
         """
+        if state_logging not in STATE_LOGGING_MODES:
+            raise ValueError(f"Unknown state logging mode: {state_logging}")
+        if log_format not in LOG_FORMATS:
+            raise ValueError(f"Unknown log format: {log_format}")
+        
+        self._clock = clock or RealTimeClock()
+        self._state_logging = state_logging
+        self._log_format = log_format
         self._output_dir = Path(output_dir)
-        self._output_dir.mkdir(exist_ok=True)
         
         self._session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         self._is_logging = False
         
-        # Data buffers
-        self._elevator_states = []
-        self._passenger_events = []
-        self._system_metrics = []
-        self._button_presses = []
+        # Running aggregates for the end-of-session summaries; log entries
+        # themselves are only kept in the log files
+        self._elevator_stats: Dict[str, Dict[str, Any]] = {}
+        self._metric_keys: Optional[List[str]] = None
+        self._metric_stats: Dict[str, Dict[str, float]] = {}
+        self._journey_stats = JourneyStatistics()
+        
+        # Writers by stream: BufferedCSVWriter or ColumnarWriter
+        self._log_files: Dict[str, Any] = {}
+        
+        # Passenger summary rows are written as journeys complete
+        self._passenger_summary: Optional[BufferedCSVWriter] = None
         
-        # File handles
-        self._csv_files = {}
+        # Last written state of each car in 'changes' mode
+        self._last_states: Dict[str, tuple] = {}
         
         logging.info(f"Simulation logger initialized for session {self._session_id}")
     
+    def set_clock(self, clock: SimulationClock) -> None:
+        """
+        Set the clock used to timestamp log entries.
+        
+        Args:
+            clock: Clock providing the current time
+        """
+        self._clock = clock
+    
+    @property
+    def journey_statistics(self) -> JourneyStatistics:
+        """Get the wait, ride and journey time distributions of logged journeys."""
+        return self._journey_stats
+    
+    @property
+    def log_format(self) -> str:
+        """Get the format of the log streams (see LOG_FORMATS)."""
+        return self._log_format
+    
+    @property
+    def state_logging(self) -> str:
+        """Get how elevator states are written (see STATE_LOGGING_MODES)."""
+        return self._state_logging
+    
+    @property
+    def is_logging(self) -> bool:
+        """Check whether a logging session is active."""
+        return self._is_logging
+    
     def start_logging(self) -> None:
         """Start logging session and open output files."""
         if self._is_logging:
             return
         
+        self._output_dir.mkdir(parents=True, exist_ok=True)
         self._is_logging = True
-        self._open_csv_files()
+        self._last_states.clear()
+        self._open_log_files()
         
         logging.info("Logging session started")
     
     def stop_logging(self) -> None:
-        """Stop logging session and close output files."""
+        """Stop logging session, write all buffered rows and close output files."""
         if not self._is_logging:
             return
         
         self._is_logging = False
-        self._close_csv_files()
+        self._close_log_files()
+        self._close_elevator_intervals(self._clock.now())
         self._write_summary_files()
         
         logging.info("Logging session stopped")
@@ -79,6 +177,10 @@ class SimulationLogger:
         """
         Log elevator state information.
         
+        Every state counts towards the elevator summary; in 'changes' mode
+        only states that differ from the car's last written row are
+        written to the log file.
+        
         Args:
             elevator_id: Elevator identifier
             state_data: Dictionary containing elevator state
@@ -86,30 +188,37 @@ class SimulationLogger:
         if not self._is_logging:
             return
         
-        timestamp = time.time()
+        timestamp = self._clock.now()
         log_entry = {
             'timestamp': timestamp,
             'elevator_id': elevator_id,
             **state_data
         }
         
-        self._elevator_states.append(log_entry)
-        self._write_to_csv('elevator_states', log_entry)
+        self._aggregate_elevator_state(log_entry)
+        
+        if self._state_logging == 'changes':
+            state = tuple(log_entry.get(field) for field in STATE_CHANGE_FIELDS)
+            if self._last_states.get(elevator_id) == state:
+                return
+            self._last_states[elevator_id] = state
+        
+        self._write_row('elevator_states', log_entry)
     
     def log_passenger_event(self, passenger_id: str, event_type: str, 
                            event_data: Dict[str, Any]) -> None:
         """
-        Log passenger events (arrival, boarding, departure).
+        Log passenger events (arrival, boarding, transfer, departure).
         
         Args:
             passenger_id: Passenger identifier
-            event_type: Type of event (arrival, boarding, departure)
+            event_type: Type of event (arrival, boarding, transfer, departure)
             event_data: Additional event data
         """
         if not self._is_logging:
             return
         
-        timestamp = time.time()
+        timestamp = self._clock.now()
         log_entry = {
             'timestamp': timestamp,
             'passenger_id': passenger_id,
@@ -117,8 +226,25 @@ class SimulationLogger:
             **event_data
         }
         
-        self._passenger_events.append(log_entry)
-        self._write_to_csv('passenger_events', log_entry)
+        self._write_row('passenger_events', log_entry)
+    
+    def log_passenger_journey(self, journey: Dict[str, Any]) -> None:
+        """
+        Log a completed passenger journey.
+        
+        Journeys are written straight to the journeys log file and the
+        passenger summary and are not kept in memory; their times are
+        added to the journey statistics.
+        
+        Args:
+            journey: Completed journey (see JourneyLog.get_journey)
+        """
+        if not self._is_logging:
+            return
+        
+        self._journey_stats.add_journey(journey)
+        self._write_row('passenger_journeys', journey)
+        self._write_passenger_summary_row(journey)
     
     def log_button_press(self, button_type: str, location: str, 
                         target: str, timestamp: float = None) -> None:
@@ -126,7 +252,8 @@ class SimulationLogger:
         Log button press events.
         
         Args:
-            button_type: Type of button (hall_call, elevator_floor)
+            button_type: Type of button (hall_call, elevator_floor,
+                destination_entry)
             location: Location of button press
             target: Target floor or direction
             timestamp: Event timestamp (defaults to current time)
@@ -135,7 +262,7 @@ class SimulationLogger:
             return
         
         if timestamp is None:
-            timestamp = time.time()
+            timestamp = self._clock.now()
         
         log_entry = {
             'timestamp': timestamp,
@@ -144,8 +271,7 @@ class SimulationLogger:
             'target': target
         }
         
-        self._button_presses.append(log_entry)
-        self._write_to_csv('button_presses', log_entry)
+        self._write_row('button_presses', log_entry)
     
     def log_system_metrics(self, metrics: Dict[str, Any]) -> None:
         """
@@ -157,14 +283,14 @@ class SimulationLogger:
         if not self._is_logging:
             return
         
-        timestamp = time.time()
+        timestamp = self._clock.now()
         log_entry = {
             'timestamp': timestamp,
             **metrics
         }
         
-        self._system_metrics.append(log_entry)
-        self._write_to_csv('system_metrics', log_entry)
+        self._aggregate_system_metrics(log_entry)
+        self._write_row('system_metrics', log_entry)
     
     def log_simulation_state(self, simulation_state: Dict[str, Any]) -> None:
         """
@@ -198,6 +324,7 @@ class SimulationLogger:
         report_file = self._output_dir / f"simulation_report_{self._session_id}.json"
         
         try:
+            self._output_dir.mkdir(parents=True, exist_ok=True)
             with open(report_file, 'w') as f:
                 json.dump(report, f, indent=2, default=str)
             
@@ -206,77 +333,167 @@ class SimulationLogger:
         except Exception as e:
             logging.error(f"Error saving simulation report: {e}")
     
-    def _open_csv_files(self) -> None:
-        """Open CSV files for logging."""
-        csv_configs = {
-            'elevator_states': ['timestamp', 'elevator_id', 'current_floor', 'state', 
-                               'direction', 'passenger_count', 'door_open'],
-            'passenger_events': ['timestamp', 'passenger_id', 'event_type', 'floor', 
-                                'elevator_id', 'origin_floor', 'destination_floor'],
-            'button_presses': ['timestamp', 'button_type', 'location', 'target'],
-            'system_metrics': ['timestamp', 'total_elevators', 'active_elevators', 
-                              'idle_elevators', 'pending_requests']
-        }
-        
-        for file_type, headers in csv_configs.items():
-            file_path = self._output_dir / f"{file_type}_{self._session_id}.csv"
+    def _open_log_files(self) -> None:
+        """Open a CSV or columnar file for each log stream."""
+        for file_type, columns in LOG_COLUMNS.items():
+            if self._log_format == 'columnar':
+                file_path = self._output_dir / f"{file_type}_{self._session_id}.col"
+            else:
+                file_path = self._output_dir / f"{file_type}_{self._session_id}.csv"
             
             try:
-                csvfile = open(file_path, 'w', newline='')
-                writer = csv.DictWriter(csvfile, fieldnames=headers)
-                writer.writeheader()
-                
-                self._csv_files[file_type] = {
-                    'file': csvfile,
-                    'writer': writer,
-                    'headers': headers
-                }
+                if self._log_format == 'columnar':
+                    writer = ColumnarWriter(file_path, file_type, columns)
+                else:
+                    writer = BufferedCSVWriter(file_path, [name for name, _ in columns])
+                self._log_files[file_type] = writer
                 
             except Exception as e:
-                logging.error(f"Error opening CSV file {file_path}: {e}")
+                logging.error(f"Error opening log file {file_path}: {e}")
     
-    def _close_csv_files(self) -> None:
-        """Close all CSV files."""
-        for file_type, file_info in self._csv_files.items():
+    def _close_log_files(self) -> None:
+        """Write out buffered rows and close all log files."""
+        for file_type, writer in self._log_files.items():
             try:
-                file_info['file'].close()
+                writer.close()
             except Exception as e:
-                logging.error(f"Error closing CSV file for {file_type}: {e}")
+                logging.error(f"Error closing log file for {file_type}: {e}")
         
-        self._csv_files.clear()
+        self._log_files.clear()
     
-    def _write_to_csv(self, file_type: str, data: Dict[str, Any]) -> None:
-        """Write data to specific CSV file."""
-        if file_type not in self._csv_files:
+    def _write_row(self, file_type: str, data: Dict[str, Any]) -> None:
+        """Pass data to the writer of a specific log stream."""
+        writer = self._log_files.get(file_type)
+        if writer is None:
             return
         
         try:
-            writer = self._csv_files[file_type]['writer']
-            headers = self._csv_files[file_type]['headers']
-            
-            # Filter data to only include known headers
-            filtered_data = {k: v for k, v in data.items() if k in headers}
-            
-            writer.writerow(filtered_data)
-            self._csv_files[file_type]['file'].flush()
+            # Columns are selected by the writer
+            writer.write(data)
             
         except Exception as e:
-            logging.error(f"Error writing to CSV file {file_type}: {e}")
+            logging.error(f"Error writing to log file {file_type}: {e}")
+    
+    def _aggregate_elevator_state(self, state: Dict[str, Any]) -> None:
+        """
+        Add an elevator state record to the per-elevator summary.
+        
+        A car stays in a logged state until its next record, so the time
+        between records is added to the previous record's state. This
+        weights states by duration whether the car is logged every tick,
+        only on changes or at the discrete-event engine's event times.
+        """
+        elevator_id = state['elevator_id']
+        
+        if elevator_id not in self._elevator_stats:
+            self._elevator_stats[elevator_id] = {
+                'total_records': 0,
+                'floors_visited': set(),
+                'time_moving': 0.0,
+                'time_idle': 0.0,
+                'time_total': 0.0,
+                'last_timestamp': None,
+                'last_state': None,
+                'total_passengers': 0
+            }
+        
+        stats = self._elevator_stats[elevator_id]
+        self._close_elevator_interval(stats, state['timestamp'])
+        stats['last_timestamp'] = state['timestamp']
+        stats['last_state'] = state.get('state')
+        
+        stats['total_records'] += 1
+        stats['floors_visited'].add(state.get('current_floor', 0))
+        stats['total_passengers'] = max(stats['total_passengers'], 
+                                      state.get('passenger_count', 0))
+    
+    @staticmethod
+    def _close_elevator_interval(stats: Dict[str, Any], timestamp: float) -> None:
+        """Add the time since a car's last record to the state it was in."""
+        if stats['last_timestamp'] is None:
+            return
+        
+        duration = max(0.0, timestamp - stats['last_timestamp'])
+        stats['time_total'] += duration
+        if stats['last_state'] in ('moving_up', 'moving_down'):
+            stats['time_moving'] += duration
+        elif stats['last_state'] == 'idle':
+            stats['time_idle'] += duration
+        stats['last_timestamp'] = timestamp
+    
+    def _close_elevator_intervals(self, timestamp: float) -> None:
+        """Count every car's last logged state until the end of the session."""
+        for stats in self._elevator_stats.values():
+            self._close_elevator_interval(stats, timestamp)
+            stats['last_timestamp'] = None
+    
+    def _write_passenger_summary_row(self, journey: Dict[str, Any]) -> None:
+        """Write a completed journey's row of the passenger summary."""
+        if self._passenger_summary is None:
+            summary_file = self._output_dir / f"passenger_summary_{self._session_id}.csv"
+            try:
+                self._passenger_summary = BufferedCSVWriter(
+                    summary_file, ['passenger_id', 'origin_floor', 'destination_floor',
+                                   'wait_time', 'travel_time', 'total_time'])
+            except Exception as e:
+                logging.error(f"Error opening passenger summary {summary_file}: {e}")
+                return
+        
+        # Without a boarding the whole time counts as waiting
+        total_time = journey['total_time']
+        wait_time = journey.get('wait_time')
+        if wait_time is None:
+            wait_time = total_time
+        
+        self._passenger_summary.write({
+            'passenger_id': journey['passenger_id'],
+            'origin_floor': journey['origin_floor'],
+            'destination_floor': journey['destination_floor'],
+            'wait_time': wait_time,
+            'travel_time': total_time - wait_time,
+            'total_time': total_time
+        })
+    
+    def _aggregate_system_metrics(self, metrics: Dict[str, Any]) -> None:
+        """Add a metrics record to the running averages, maxima and minima."""
+        # Metrics named in the first record are summarized
+        if self._metric_keys is None:
+            self._metric_keys = [key for key in metrics if key != 'timestamp']
+        
+        for key in self._metric_keys:
+            value = metrics.get(key)
+            if not isinstance(value, (int, float)):
+                continue
+            
+            stats = self._metric_stats.get(key)
+            if stats is None:
+                self._metric_stats[key] = {'count': 1, 'total': value,
+                                           'max': value, 'min': value}
+            else:
+                stats['count'] += 1
+                stats['total'] += value
+                stats['max'] = max(stats['max'], value)
+                stats['min'] = min(stats['min'], value)
     
     def _write_summary_files(self) -> None:
         """Write summary statistics files."""
         try:
             # Elevator summary
-            if self._elevator_states:
+            if self._elevator_stats:
                 self._write_elevator_summary()
             
-            # Passenger summary
-            if self._passenger_events:
-                self._write_passenger_summary()
+            # Passenger summary, written as journeys completed
+            if self._passenger_summary is not None:
+                self._passenger_summary.close()
+                self._passenger_summary = None
             
             # System summary
-            if self._system_metrics:
+            if self._metric_keys is not None:
                 self._write_system_summary()
+            
+            # Wait, ride and journey time distributions
+            if self._journey_stats.journey_count:
+                self._write_journey_summary()
                 
         except Exception as e:
             logging.error(f"Error writing summary files: {e}")
@@ -285,33 +502,6 @@ class SimulationLogger:
         """Write elevator performance summary."""
         summary_file = self._output_dir / f"elevator_summary_{self._session_id}.csv"
         
-        # Calculate per-elevator statistics
-        elevator_stats = {}
-        
-        for state in self._elevator_states:
-            elevator_id = state['elevator_id']
-            
-            if elevator_id not in elevator_stats:
-                elevator_stats[elevator_id] = {
-                    'total_records': 0,
-                    'floors_visited': set(),
-                    'time_moving': 0,
-                    'time_idle': 0,
-                    'total_passengers': 0
-                }
-            
-            stats = elevator_stats[elevator_id]
-            stats['total_records'] += 1
-            stats['floors_visited'].add(state.get('current_floor', 0))
-            
-            if state.get('state') in ['moving_up', 'moving_down']:
-                stats['time_moving'] += 1
-            elif state.get('state') == 'idle':
-                stats['time_idle'] += 1
-            
-            stats['total_passengers'] = max(stats['total_passengers'], 
-                                          state.get('passenger_count', 0))
-        
         # Write summary CSV
         with open(summary_file, 'w', newline='') as csvfile:
             headers = ['elevator_id', 'total_records', 'unique_floors', 
@@ -319,76 +509,47 @@ class SimulationLogger:
             writer = csv.DictWriter(csvfile, fieldnames=headers)
             writer.writeheader()
             
-            for elevator_id, stats in elevator_stats.items():
-                total_time = stats['time_moving'] + stats['time_idle']
+            for elevator_id, stats in self._elevator_stats.items():
+                # Shares of the time between the car's first record and
+                # the end of the session
+                total_time = stats['time_total']
                 
                 writer.writerow({
                     'elevator_id': elevator_id,
                     'total_records': stats['total_records'],
                     'unique_floors': len(stats['floors_visited']),
-                    'time_moving_pct': (stats['time_moving'] / max(total_time, 1)) * 100,
-                    'time_idle_pct': (stats['time_idle'] / max(total_time, 1)) * 100,
+                    'time_moving_pct': (stats['time_moving'] / total_time * 100
+                                        if total_time > 0 else 0.0),
+                    'time_idle_pct': (stats['time_idle'] / total_time * 100
+                                      if total_time > 0 else 0.0),
                     'max_passengers': stats['total_passengers']
                 })
     
-    def _write_passenger_summary(self) -> None:
-        """Write passenger statistics summary."""
-        # Group events by passenger
-        passenger_journeys = {}
-        
-        for event in self._passenger_events:
-            passenger_id = event['passenger_id']
-            
-            if passenger_id not in passenger_journeys:
-                passenger_journeys[passenger_id] = []
-            
-            passenger_journeys[passenger_id].append(event)
-        
-        # Calculate journey statistics
-        summary_file = self._output_dir / f"passenger_summary_{self._session_id}.csv"
-        
-        with open(summary_file, 'w', newline='') as csvfile:
-            headers = ['passenger_id', 'origin_floor', 'destination_floor', 
-                      'wait_time', 'travel_time', 'total_time']
-            writer = csv.DictWriter(csvfile, fieldnames=headers)
-            writer.writeheader()
-            
-            for passenger_id, events in passenger_journeys.items():
-                if len(events) >= 2:  # At least arrival and departure
-                    arrival_event = min(events, key=lambda e: e['timestamp'])
-                    departure_event = max(events, key=lambda e: e['timestamp'])
-                    
-                    wait_time = departure_event['timestamp'] - arrival_event['timestamp']
-                    
-                    writer.writerow({
-                        'passenger_id': passenger_id,
-                        'origin_floor': arrival_event.get('origin_floor', ''),
-                        'destination_floor': arrival_event.get('destination_floor', ''),
-                        'wait_time': wait_time,
-                        'travel_time': 0,  # Would need boarding event to calculate
-                        'total_time': wait_time
-                    })
-    
     def _write_system_summary(self) -> None:
         """Write system performance summary."""
-        if not self._system_metrics:
-            return
-        
         summary_file = self._output_dir / f"system_summary_{self._session_id}.csv"
         
         # Calculate averages
         avg_metrics = {}
-        metric_keys = self._system_metrics[0].keys()
-        
-        for key in metric_keys:
-            if key != 'timestamp':
-                values = [m.get(key, 0) for m in self._system_metrics if isinstance(m.get(key), (int, float))]
-                if values:
-                    avg_metrics[f'avg_{key}'] = sum(values) / len(values)
-                    avg_metrics[f'max_{key}'] = max(values)
-                    avg_metrics[f'min_{key}'] = min(values)
+        for key in self._metric_keys:
+            stats = self._metric_stats.get(key)
+            if stats:
+                avg_metrics[f'avg_{key}'] = stats['total'] / stats['count']
+                avg_metrics[f'max_{key}'] = stats['max']
+                avg_metrics[f'min_{key}'] = stats['min']
         
         with open(summary_file, 'w', newline='') as csvfile:
             writer = csv.DictWriter(csvfile, fieldnames=avg_metrics.keys())
             writer.writeheader()
-            writer.writerow(avg_metrics)
\ No newline at end of file
+            writer.writerow(avg_metrics)
+    
+    def _write_journey_summary(self) -> None:
+        """Write wait, ride and journey time statistics overall, per elevator and per floor."""
+        summary_file = self._output_dir / f"journey_summary_{self._session_id}.csv"
+        
+        with open(summary_file, 'w', newline='') as csvfile:
+            headers = (['scope', 'key', 'metric', 'count', 'mean', 'std', 'min', 'max'] +
+                       [f'p{round(fraction * 100)}' for fraction in SUMMARY_QUANTILES])
+            writer = csv.DictWriter(csvfile, fieldnames=headers)
+            writer.writeheader()
+            writer.writerows(self._journey_stats.get_rows())
@@ -0,0 +1,224 @@
+"""
+Monte Carlo replication runner fanning seeded runs across processes.
+"""
+
+import math
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from config.building_config import BuildingConfig
+from config.simulation_config import SimulationConfig
+from .simulator import ElevatorSimulator
+from .batch import create_headless_simulator
+from .statistics import JourneyStatistics
+
+# Key performance indicators reported for every replication
+KPI_NAMES = ['mean_wait_time', 'p95_wait_time', 'mean_travel_time',
+             'mean_journey_time', 'throughput_per_hour', 'waiting_passengers']
+
+# Two-sided 95% Student's t critical values by degrees of freedom
+_T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+    8: 2.306, 9: 2.262, 10: 2.228, 11: 2.201, 12: 2.179, 13: 2.160,
+    14: 2.145, 15: 2.131, 16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093,
+    20: 2.086, 21: 2.080, 22: 2.074, 23: 2.069, 24: 2.064, 25: 2.060,
+    26: 2.056, 27: 2.052, 28: 2.048, 29: 2.045, 30: 2.042, 40: 2.021,
+    60: 2.000, 120: 1.980
+}
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """
+    Get a percentile of sorted values using linear interpolation.
+
+    Args:
+        sorted_values: Values in ascending order
+        fraction: Percentile as a fraction between 0 and 1
+
+    Returns:
+        Optional[float]: The percentile, or None if there are no values
+    """
+    if not sorted_values:
+        return None
+
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+def collect_kpis(simulator: ElevatorSimulator, duration: float) -> Dict[str, Any]:
+    """
+    Calculate passenger KPIs for a completed run.
+
+    Passengers still waiting at the end of the run count towards the wait
+    time KPIs with their wait so far, so a run that leaves passengers
+    behind does not report shorter waits; waiting_passengers counts them.
+
+    Args:
+        simulator: Simulator after its run
+        duration: Simulated duration of the run in seconds
+
+    Returns:
+        Dict[str, Any]: KPI values keyed by name (None when undefined)
+    """
+    journeys = simulator.journeys
+    wait_times = journeys.get_wait_times()
+    travel_times = journeys.get_travel_times()
+    journey_times = journeys.get_total_times()
+
+    # Passengers still riding have waited too, and those still waiting
+    # have waited at least until now
+    now = simulator.clock.now()
+    waiting = 0
+    for passenger in simulator.passengers.values():
+        wait_time = passenger.get_wait_time()
+        if wait_time is None:
+            wait_time = now - passenger.arrival_time
+            waiting += 1
+        wait_times.append(wait_time)
+
+    wait_times.sort()
+
+    def mean(values):
+        return sum(values) / len(values) if values else None
+
+    return {
+        'total_passengers': simulator.get_simulation_status()['passenger_count'],
+        'completed_passengers': len(journey_times),
+        'mean_wait_time': mean(wait_times),
+        'p95_wait_time': percentile(wait_times, 0.95),
+        'mean_travel_time': mean(travel_times),
+        'mean_journey_time': mean(journey_times),
+        'throughput_per_hour': len(journey_times) * 3600.0 / duration if duration > 0 else None,
+        'waiting_passengers': waiting
+    }
+
+def confidence_interval(values: List[float]) -> Dict[str, Any]:
+    """
+    Calculate the mean and 95% confidence interval of replication results.
+
+    Args:
+        values: One value per replication
+
+    Returns:
+        Dict[str, Any]: n, mean, std, half_width, ci_low and ci_high
+    """
+    n = len(values)
+    if n == 0:
+        return {'n': 0, 'mean': None, 'std': None, 'half_width': None,
+                'ci_low': None, 'ci_high': None}
+
+    mean = sum(values) / n
+    if n == 1:
+        return {'n': 1, 'mean': mean, 'std': None, 'half_width': None,
+                'ci_low': None, 'ci_high': None}
+
+    std = math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1))
+    df = n - 1
+    if df > 120:
+        t_value = 1.960
+    else:
+        # Round down to the nearest tabulated df, which is conservative
+        t_value = _T_CRITICAL_95[max(k for k in _T_CRITICAL_95 if k <= df)]
+
+    half_width = t_value * std / math.sqrt(n)
+    return {'n': n, 'mean': mean, 'std': std, 'half_width': half_width,
+            'ci_low': mean - half_width, 'ci_high': mean + half_width}
+
+def run_replication_task(task: Tuple) -> Dict[str, Any]:
+    """
+    Run one replication in a worker process from plain configuration data.
+
+    Args:
+        task: Tuple of (building_data, elevators_data, simulation_config_file,
+            simulation_param_overrides, duration, seed)
+
+    Returns:
+        Dict[str, Any]: KPIs of the replication, and its journey_statistics
+        for pooling across replications
+    """
+    (building_data, elevators_data, simulation_config_file,
+     simulation_params, duration, seed) = task
+
+    simulation_config = SimulationConfig(simulation_config_file)
+    if simulation_params:
+        simulation_config.update_simulation_params(simulation_params)
+    simulator = create_headless_simulator(building_data, elevators_data,
+                                          simulation_config, seed)
+
+    wall_start = time.perf_counter()
+    events_processed = simulator.run_discrete_event(duration, write_output=False)
+
+    result = collect_kpis(simulator, duration)
+    result['seed'] = seed
+    result['events_processed'] = events_processed
+    result['wall_time'] = time.perf_counter() - wall_start
+
+    journey_statistics = JourneyStatistics()
+    journey_statistics.add_journeys(simulator.journeys)
+    result['journey_statistics'] = journey_statistics
+    return result
+
+def run_replications(building_config_file: str, simulation_config_file: str = None,
+                     replications: int = 10, duration: float = None,
+                     base_seed: int = 0, max_workers: int = None) -> Dict[str, Any]:
+    """
+    Run seeded replications of one scenario in parallel worker processes.
+
+    Only configuration data and file paths are sent to the workers; each
+    builds its own building and simulator, and returns a small KPI
+    dictionary.
+
+    Args:
+        building_config_file: Path to the building configuration CSV file
+        simulation_config_file: Path to the simulation configuration CSV file (optional)
+        replications: Number of replications to run
+        duration: Simulated duration per replication (defaults to the configured duration)
+        base_seed: Seed of the first replication; replication i uses base_seed + i
+        max_workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        Dict[str, Any]: Per-replication KPIs, their confidence intervals and
+        the pooled wait, ride and journey time distributions of all
+        replications
+
+    Raises:
+        ValueError: If the building configuration is invalid
+    """
+    building_config = BuildingConfig(building_config_file)
+    errors = building_config.validate_configuration()
+    if errors:
+        raise ValueError("Invalid building configuration: " + "; ".join(errors))
+
+    if duration is None:
+        duration = SimulationConfig(simulation_config_file).get_simulation_duration()
+
+    tasks = [(building_config.building_data, building_config.elevators_data,
+              simulation_config_file, None, duration, base_seed + i)
+             for i in range(replications)]
+
+    wall_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(run_replication_task, tasks))
+    wall_time = time.perf_counter() - wall_start
+
+    # Journey time sketches of the workers merge into pooled quantiles
+    pooled = JourneyStatistics()
+    for result in results:
+        pooled.merge(result.pop('journey_statistics'))
+
+    summary = {}
+    for kpi in KPI_NAMES:
+        values = [result[kpi] for result in results if result[kpi] is not None]
+        summary[kpi] = confidence_interval(values)
+
+    logging.info(f"Completed {replications} replications in {wall_time:.2f}s")
+
+    return {
+        'replications': results,
+        'summary': summary,
+        'pooled': pooled.get_summary(),
+        'duration': duration,
+        'wall_time': wall_time
+    }
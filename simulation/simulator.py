@@ -2,15 +2,17 @@
 Main simulation engine orchestrating all simulation components.
 """
 
-import time
 import random
-from typing import List, Dict, Optional
+from typing import List, Mapping, Optional
 import logging
 from models.building import Building
 from models.elevator import Direction
+from models.clock import SimulationClock, RealTimeClock, VirtualClock
+from models.passenger_store import PassengerView, JourneyLog
 from controllers.simulation_controller import SimulationController
 from config.simulation_config import SimulationConfig
 from .logger import SimulationLogger
+from .discrete_event import DiscreteEventEngine
 
 class ElevatorSimulator:
     """
@@ -20,20 +22,34 @@ class ElevatorSimulator:
     interface to the complex simulation subsystem.
     """
     
-    def __init__(self, building: Building, config: SimulationConfig = None):
+    def __init__(self, building: Building, config: SimulationConfig = None,
+                 clock: SimulationClock = None, seed: int = None,
+                 output_dir: str = "simulation_output"):
         """
         Initialize the elevator simulator.
         
         Args:
             building: The building to simulate
             config: Simulation configuration (optional)
+            clock: Clock shared by all components (defaults to real time)
+            seed: Seed for random passenger generation (optional)
+            output_dir: Directory for log and report files
         """
         self._building = building
         self._config = config or SimulationConfig()
-        self._logger = SimulationLogger()
-        self._controller = SimulationController(building, self._logger)
+        self._clock = clock or RealTimeClock()
+        self._rng = random.Random(seed)
+        self._logger = SimulationLogger(output_dir, self._clock,
+                                        self._config.get_state_logging(),
+                                        self._config.get_log_format())
+        self._controller = SimulationController(building, self._logger, self._clock,
+                                                self._config.get_dispatch_algorithm(),
+                                                self._config.get_dispatch_mode(),
+                                                self._config.get_dispatch_cycle())
+        building.set_clock(self._clock)
         
         self._simulation_start_time: Optional[float] = None
+        self._engine: Optional[DiscreteEventEngine] = None
         self._passenger_generation_active = True
         self._last_passenger_generation = 0.0
         
@@ -44,6 +60,23 @@ class ElevatorSimulator:
         """Get the simulation controller."""
         return self._controller
     
+    @property
+    def clock(self) -> SimulationClock:
+        """Get the clock shared by all simulation components."""
+        return self._clock
+    
+    def set_clock(self, clock: SimulationClock) -> None:
+        """
+        Replace the clock shared by the building, controller and logger.
+        
+        Args:
+            clock: New simulation clock
+        """
+        self._clock = clock
+        self._building.set_clock(clock)
+        self._controller.set_clock(clock)
+        self._logger.set_clock(clock)
+    
     @property
     def building(self) -> Building:
         """Get the building."""
@@ -55,9 +88,14 @@ class ElevatorSimulator:
         return self._logger
     
     @property
-    def passengers(self) -> Dict[str, 'Passenger']:
-        """Get the passengers dictionary from the controller."""
-        return self._controller._passengers
+    def passengers(self) -> Mapping[str, PassengerView]:
+        """Get the waiting and riding passengers by ID from the controller."""
+        return self._controller.passengers
+    
+    @property
+    def journeys(self) -> JourneyLog:
+        """Get the log of completed passenger journeys."""
+        return self._controller.journeys
     
     def start_simulation(self) -> bool:
         """
@@ -66,7 +104,7 @@ class ElevatorSimulator:
         Returns:
             bool: True if simulation started successfully
         """
-        self._simulation_start_time = time.time()
+        self._simulation_start_time = self._clock.now()
         self._logger.start_logging()
         
         # Add predefined passengers from configuration
@@ -78,6 +116,43 @@ class ElevatorSimulator:
         
         return self._controller.start_simulation()
     
+    def run_discrete_event(self, duration: float, seed: int = None,
+                           write_output: bool = True) -> int:
+        """
+        Run the simulation headlessly with the discrete-event engine.
+        
+        Simulated time jumps from event to event instead of following
+        the wall clock, so long scenarios complete in seconds. A virtual
+        clock replaces the real-time clock if one is in use.
+        
+        Args:
+            duration: Simulated duration in seconds
+            seed: Reseeds passenger generation if given (optional)
+            write_output: Whether to write CSV logs and the JSON report
+            
+        Returns:
+            int: Number of events processed
+        """
+        if not isinstance(self._clock, VirtualClock):
+            self.set_clock(VirtualClock())
+        if seed is not None:
+            self._rng.seed(seed)
+        
+        self._engine = DiscreteEventEngine(self._building, self._controller,
+                                           self._config, self._logger,
+                                           self._rng, self._clock)
+        self._simulation_start_time = self._clock.now()
+        if write_output:
+            self._logger.start_logging()
+        
+        events_processed = self._engine.run(self._simulation_start_time + duration)
+        
+        if write_output:
+            self._logger.stop_logging()
+            self._generate_simulation_report()
+        
+        return events_processed
+    
     def stop_simulation(self) -> None:
         """Stop the simulation and finalize logging."""
         self._controller.stop_simulation()
@@ -129,8 +204,11 @@ class ElevatorSimulator:
         """Get comprehensive simulation status."""
         status = self._controller.get_simulation_status()
         
-        if self._simulation_start_time:
-            status['elapsed_time'] = time.time() - self._simulation_start_time
+        if self._simulation_start_time is not None:
+            status['elapsed_time'] = self._clock.now() - self._simulation_start_time
+        
+        if self._engine:
+            status['events_processed'] = self._engine.events_processed
         
         return status
     
@@ -148,7 +226,7 @@ class ElevatorSimulator:
         if not self._passenger_generation_active:
             return
         
-        current_time = time.time()
+        current_time = self._clock.now()
         if not hasattr(self, '_last_passenger_check'):
             self._last_passenger_check = current_time
         
@@ -156,7 +234,7 @@ class ElevatorSimulator:
         arrival_rate = self._config.get_passenger_arrival_rate()
         
         # Poisson arrival process
-        if random.random() < (arrival_rate * time_since_last):
+        if self._rng.random() < (arrival_rate * time_since_last):
             self._generate_random_passenger()
             self._last_passenger_check = current_time
     
@@ -164,12 +242,12 @@ class ElevatorSimulator:
         """Generate a passenger with random origin and destination."""
         num_floors = self._building.num_floors
         
-        origin = random.randint(1, num_floors)
-        destination = random.randint(1, num_floors)
+        origin = self._rng.randint(1, num_floors)
+        destination = self._rng.randint(1, num_floors)
         
         # Ensure origin != destination
         while destination == origin:
-            destination = random.randint(1, num_floors)
+            destination = self._rng.randint(1, num_floors)
         
         self._controller.add_passenger(origin, destination)
         logging.debug(f"Generated random passenger: {origin} -> {destination}")
@@ -0,0 +1,385 @@
+"""
+Online statistics and mergeable quantile sketches for run summaries.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Quantiles reported in summaries
+SUMMARY_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+# Journey time metrics and the journey fields they are read from
+TIME_METRICS = {
+    'wait_time': 'wait_time',
+    'ride_time': 'travel_time',
+    'journey_time': 'total_time'
+}
+
+class RunningStats:
+    """
+    Count, mean, variance, minimum and maximum updated one value at a time.
+
+    Uses Welford's algorithm, so the variance stays accurate over long
+    runs, and merges with Chan's parallel update, so statistics of
+    separate runs combine into the statistics of all their values.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min: Optional[float] = None
+        self._max: Optional[float] = None
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._mean if self._count else None
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Get the sample variance, or None with fewer than two values."""
+        return self._m2 / (self._count - 1) if self._count > 1 else None
+
+    @property
+    def std(self) -> Optional[float]:
+        """Get the sample standard deviation, or None with fewer than two values."""
+        variance = self.variance
+        return math.sqrt(variance) if variance is not None else None
+
+    @property
+    def min(self) -> Optional[float]:
+        return self._min
+
+    @property
+    def max(self) -> Optional[float]:
+        return self._max
+
+    def add(self, value: float) -> None:
+        """
+        Add a value.
+
+        Args:
+            value: Value to include
+        """
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+        self._min = value if self._min is None else min(self._min, value)
+        self._max = value if self._max is None else max(self._max, value)
+
+    def merge(self, other: 'RunningStats') -> None:
+        """
+        Add the values summarized by other statistics.
+
+        Args:
+            other: Statistics to merge into these
+        """
+        if other._count == 0:
+            return
+        if self._count == 0:
+            self._count, self._mean, self._m2 = other._count, other._mean, other._m2
+            self._min, self._max = other._min, other._max
+            return
+
+        count = self._count + other._count
+        delta = other._mean - self._mean
+        self._mean += delta * other._count / count
+        self._m2 += other._m2 + delta * delta * self._count * other._count / count
+        self._count = count
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+
+class QuantileSketch:
+    """
+    Mergeable sketch of a distribution of non-negative values.
+
+    Values are counted in logarithmic buckets (as in DDSketch), so every
+    quantile is estimated within a fixed relative error, memory depends
+    on the range of the values rather than on their number, and sketches
+    with the same accuracy merge by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Largest relative error of estimated quantiles
+            max_buckets: Buckets kept before the lowest ones are combined,
+                which only reduces the accuracy of the smallest values
+
+        Raises:
+            ValueError: If the relative accuracy is not between 0 and 1
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"Invalid relative accuracy: {relative_accuracy}")
+
+        self._relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._max_buckets = max_buckets
+        self._buckets: Dict[int, int] = {}
+        self._zero_count = 0
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def relative_accuracy(self) -> float:
+        return self._relative_accuracy
+
+    def add(self, value: float) -> None:
+        """
+        Add a value.
+
+        Args:
+            value: Non-negative value to include
+
+        Raises:
+            ValueError: If the value is negative
+        """
+        if value < 0:
+            raise ValueError(f"Quantile sketches only hold non-negative values: {value}")
+
+        self._count += 1
+        if value < 1e-9:
+            self._zero_count += 1
+            return
+
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[key] = self._buckets.get(key, 0) + 1
+        if len(self._buckets) > self._max_buckets:
+            self._collapse_lowest_buckets()
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """
+        Add the values counted by another sketch.
+
+        Args:
+            other: Sketch to merge into this one
+
+        Raises:
+            ValueError: If the sketches have different accuracies
+        """
+        if other._relative_accuracy != self._relative_accuracy:
+            raise ValueError("Cannot merge quantile sketches with different accuracies")
+
+        for key, count in other._buckets.items():
+            self._buckets[key] = self._buckets.get(key, 0) + count
+        self._zero_count += other._zero_count
+        self._count += other._count
+        if len(self._buckets) > self._max_buckets:
+            self._collapse_lowest_buckets()
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """
+        Estimate a quantile.
+
+        Args:
+            fraction: Quantile as a fraction between 0 and 1
+
+        Returns:
+            Optional[float]: The estimated quantile, or None if the sketch is empty
+        """
+        if self._count == 0:
+            return None
+
+        rank = fraction * (self._count - 1)
+        cumulative = self._zero_count
+        if rank < cumulative:
+            return 0.0
+
+        for key in sorted(self._buckets):
+            cumulative += self._buckets[key]
+            if rank < cumulative:
+                # Midpoint of the bucket in relative terms
+                return 2 * self._gamma ** key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._buckets) / (self._gamma + 1)
+
+    def _collapse_lowest_buckets(self) -> None:
+        """Combine the lowest buckets until the bucket limit is met."""
+        keys = sorted(self._buckets)
+        excess = len(keys) - self._max_buckets
+        target = keys[excess]
+        for key in keys[:excess]:
+            self._buckets[target] += self._buckets.pop(key)
+
+class TimeDistribution:
+    """Running statistics and a quantile sketch of one kind of duration."""
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Initialize an empty distribution.
+
+        Args:
+            relative_accuracy: Relative accuracy of the quantile sketch
+        """
+        self._stats = RunningStats()
+        self._sketch = QuantileSketch(relative_accuracy)
+
+    @property
+    def stats(self) -> RunningStats:
+        return self._stats
+
+    @property
+    def sketch(self) -> QuantileSketch:
+        return self._sketch
+
+    def add(self, value: float) -> None:
+        """Add a duration in seconds."""
+        self._stats.add(value)
+        self._sketch.add(value)
+
+    def merge(self, other: 'TimeDistribution') -> None:
+        """Add the durations of another distribution."""
+        self._stats.merge(other._stats)
+        self._sketch.merge(other._sketch)
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """Estimate a quantile, limited to the observed minimum and maximum."""
+        value = self._sketch.quantile(fraction)
+        if value is None:
+            return None
+        return min(max(value, self._stats.min), self._stats.max)
+
+    def get_summary(self) -> Dict[str, Optional[float]]:
+        """
+        Summarize the distribution.
+
+        Returns:
+            Dict[str, Optional[float]]: count, mean, std, min, max and the
+            SUMMARY_QUANTILES as p50, p90, p95 and p99
+        """
+        summary = {
+            'count': self._stats.count,
+            'mean': self._stats.mean,
+            'std': self._stats.std,
+            'min': self._stats.min,
+            'max': self._stats.max
+        }
+        for fraction in SUMMARY_QUANTILES:
+            summary[f'p{round(fraction * 100)}'] = self.quantile(fraction)
+        return summary
+
+class JourneyStatistics:
+    """
+    Wait, ride and journey time distributions of completed journeys.
+
+    Each metric (see TIME_METRICS) is summarized over all journeys, per
+    elevator and per origin floor, as journeys complete. Statistics from
+    separate runs, such as parallel replications, merge into the
+    statistics of all their journeys.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Initialize empty statistics.
+
+        Args:
+            relative_accuracy: Relative accuracy of the quantile sketches
+        """
+        self._relative_accuracy = relative_accuracy
+        self._distributions: Dict[Tuple[str, Any, str], TimeDistribution] = {}
+        self._journeys = 0
+
+    @property
+    def journey_count(self) -> int:
+        return self._journeys
+
+    def add_journey(self, journey: Dict[str, Any]) -> None:
+        """
+        Add a completed journey.
+
+        Args:
+            journey: Completed journey (see JourneyLog.get_journey)
+        """
+        self._journeys += 1
+        scopes = [('all', None),
+                  ('elevator', journey.get('elevator_id')),
+                  ('floor', journey.get('origin_floor'))]
+
+        for metric, field in TIME_METRICS.items():
+            value = journey.get(field)
+            if value is None:
+                continue
+            for scope, key in scopes:
+                if scope != 'all' and key is None:
+                    continue
+                self._distribution(scope, key, metric).add(value)
+
+    def add_journeys(self, journeys: Iterable[Dict[str, Any]]) -> None:
+        """Add several completed journeys."""
+        for journey in journeys:
+            self.add_journey(journey)
+
+    def merge(self, other: 'JourneyStatistics') -> None:
+        """
+        Add the journeys summarized by other statistics.
+
+        Args:
+            other: Statistics to merge into these
+        """
+        for (scope, key, metric), distribution in other._distributions.items():
+            self._distribution(scope, key, metric).merge(distribution)
+        self._journeys += other._journeys
+
+    def get(self, metric: str, elevator_id: str = None,
+            floor: int = None) -> Optional[TimeDistribution]:
+        """
+        Get the distribution of a metric.
+
+        Args:
+            metric: Metric name (see TIME_METRICS)
+            elevator_id: Only journeys in this elevator (optional)
+            floor: Only journeys from this origin floor (optional)
+
+        Returns:
+            Optional[TimeDistribution]: The distribution, or None if no
+            journey contributed to it
+        """
+        if elevator_id is not None:
+            return self._distributions.get(('elevator', elevator_id, metric))
+        if floor is not None:
+            return self._distributions.get(('floor', floor, metric))
+        return self._distributions.get(('all', None, metric))
+
+    def get_summary(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Get the summaries of each metric over all journeys, keyed by metric."""
+        return {metric: distribution.get_summary()
+                for (scope, _, metric), distribution in self._distributions.items()
+                if scope == 'all'}
+
+    def get_rows(self) -> List[Dict[str, Any]]:
+        """
+        Get one summary row per scope and metric.
+
+        Returns:
+            List[Dict[str, Any]]: scope ('all', 'elevator' or 'floor'), key,
+            metric and the summary values, overall rows first
+        """
+        order = {'all': 0, 'elevator': 1, 'floor': 2}
+        rows = []
+        # Sorting is stable, so metrics keep their TIME_METRICS order
+        for (scope, key, metric), distribution in sorted(
+                self._distributions.items(),
+                key=lambda item: (order[item[0][0]], item[0][1] or 0)):
+            rows.append({'scope': scope, 'key': '' if key is None else key,
+                         'metric': metric, **distribution.get_summary()})
+        return rows
+
+    def _distribution(self, scope: str, key: Any, metric: str) -> TimeDistribution:
+        """Get or create the distribution of a metric in a scope."""
+        distribution_key = (scope, key, metric)
+        distribution = self._distributions.get(distribution_key)
+        if distribution is None:
+            distribution = TimeDistribution(self._relative_accuracy)
+            self._distributions[distribution_key] = distribution
+        return distribution
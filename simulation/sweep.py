@@ -0,0 +1,309 @@
+"""
+Parameter sweep engine running every configuration in a grid in parallel.
+"""
+
+import csv
+import json
+import hashlib
+import itertools
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+from config.building_config import BuildingConfig
+from config.simulation_config import SimulationConfig
+from controllers.dispatch import is_dispatcher_available
+from .replication import KPI_NAMES, run_replication_task
+
+# Elevator parameters that can be varied per car
+ELEVATOR_PARAMETERS = ('capacity', 'speed', 'door_open_time', 'door_operation_time')
+
+# Simulation parameters that can be varied per run
+SIMULATION_PARAMETERS = ('dispatch_algorithm', 'dispatch_cycle', 'passenger_arrival_rate')
+
+# All parameters accepted in a sweep grid
+GRID_PARAMETERS = ('elevator_count',) + ELEVATOR_PARAMETERS + SIMULATION_PARAMETERS
+
+# Numeric grid parameters, their type and whether zero is allowed
+NUMERIC_PARAMETERS = {
+    'elevator_count': (int, False),
+    'capacity': (int, False),
+    'speed': ((int, float), False),
+    'door_open_time': ((int, float), True),
+    'door_operation_time': ((int, float), True),
+    'dispatch_cycle': ((int, float), True),
+    'passenger_arrival_rate': ((int, float), False)
+}
+
+RESULT_COLUMNS = (['cell_id'] + list(GRID_PARAMETERS) +
+                  ['replications', 'total_passengers', 'completed_passengers'] +
+                  KPI_NAMES)
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Expand a parameter grid into every combination of its values.
+
+    Repeated values of a parameter are dropped, so every cell is distinct.
+
+    Args:
+        grid: Lists of values keyed by parameter name
+
+    Returns:
+        List[Dict[str, Any]]: One parameter dictionary per grid cell
+
+    Raises:
+        ValueError: If the grid contains unknown parameters or algorithms,
+            or a parameter has no values or an invalid value
+    """
+    unknown = set(grid) - set(GRID_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+
+    names = [name for name in GRID_PARAMETERS if name in grid]
+    values = []
+    for name in names:
+        parameter_values = grid[name] if isinstance(grid[name], list) else [grid[name]]
+        if not parameter_values:
+            raise ValueError(f"Sweep parameter {name} has no values")
+
+        unique_values = []
+        for value in parameter_values:
+            _validate_grid_value(name, value)
+            if value not in unique_values:
+                unique_values.append(value)
+        values.append(unique_values)
+
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+def _validate_grid_value(name: str, value: Any) -> None:
+    """Raise ValueError if a value of a grid parameter is invalid."""
+    if name == 'dispatch_algorithm':
+        if not is_dispatcher_available(value):
+            raise ValueError(f"Unknown dispatch algorithm: {value}")
+        return
+
+    kinds, zero_allowed = NUMERIC_PARAMETERS[name]
+    if isinstance(value, bool) or not isinstance(value, kinds):
+        raise ValueError(f"Invalid value of sweep parameter {name}: {value!r}")
+    if value < 0 or (value == 0 and not zero_allowed):
+        raise ValueError(f"Sweep parameter {name} must be "
+                         f"{'non-negative' if zero_allowed else 'positive'}: {value!r}")
+
+def get_file_digest(file_path: str = None) -> str:
+    """
+    Get a digest of a configuration file's contents.
+
+    Args:
+        file_path: Path of the file (optional)
+
+    Returns:
+        str: Hexadecimal SHA-1 of the file, or an empty string without a file
+    """
+    if file_path is None:
+        return ''
+    with open(file_path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def get_cell_id(params: Dict[str, Any], run_settings: Dict[str, Any]) -> str:
+    """
+    Get a stable identifier for a grid cell and the settings it was run with.
+
+    Args:
+        params: Grid parameters of the cell
+        run_settings: Duration, replications, seed and configuration file
+            digests shared by all cells
+
+    Returns:
+        str: Short hexadecimal identifier
+    """
+    key = json.dumps({'params': params, 'run': run_settings}, sort_keys=True)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+
+def build_cell_elevators(base_elevators: List[Dict[str, Any]],
+                         params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Build the elevator configuration for a grid cell.
+
+    Cars beyond those in the base configuration copy the last base car.
+
+    Args:
+        base_elevators: Elevator configuration from the building file
+        params: Grid parameters of the cell
+
+    Returns:
+        List[Dict[str, Any]]: Elevator configuration dictionaries
+
+    Raises:
+        ValueError: If the cell has no elevators
+    """
+    count = params.get('elevator_count', len(base_elevators))
+    if count < 1 or not base_elevators:
+        raise ValueError(f"A sweep cell needs at least one elevator, got {count}")
+    elevators = []
+
+    for i in range(count):
+        if i < len(base_elevators):
+            elevator = dict(base_elevators[i])
+        else:
+            elevator = dict(base_elevators[-1])
+            elevator['id'] = f"elevator_{i + 1}"
+
+        for name in ELEVATOR_PARAMETERS:
+            if name in params:
+                elevator[name] = params[name]
+        elevators.append(elevator)
+
+    return elevators
+
+def _run_cell_task(task: Tuple) -> Dict[str, Any]:
+    """Run all replications of one grid cell in a worker process."""
+    (cell_id, params, building_data, elevators_data, simulation_config_file,
+     duration, seeds) = task
+
+    simulation_params = {name: params[name]
+                         for name in SIMULATION_PARAMETERS if name in params}
+    results = [run_replication_task((building_data, elevators_data,
+                                     simulation_config_file, simulation_params,
+                                     duration, seed))
+               for seed in seeds]
+
+    row = {'cell_id': cell_id, 'replications': len(results)}
+    for name in ['total_passengers', 'completed_passengers'] + KPI_NAMES:
+        values = [result[name] for result in results if result[name] is not None]
+        row[name] = sum(values) / len(values) if values else None
+
+    return row
+
+def _truncate_partial_row(output_file: Path) -> None:
+    """Remove a last row that was cut off before its line ending."""
+    with open(output_file, 'rb+') as f:
+        content = f.read()
+        if content and not content.endswith(b'\n'):
+            f.truncate(content.rfind(b'\n') + 1)
+            logging.warning(f"Dropped a partial last row from {output_file}")
+
+def _read_completed_cells(output_file: Path) -> Set[str]:
+    """
+    Read the identifiers of cells already present in a results file.
+
+    A sweep interrupted while appending can leave its last row cut off.
+    That row is removed so the next row starts on a new line, and cells
+    whose rows are missing columns are not counted, so they run again.
+    """
+    if not output_file.exists():
+        return set()
+
+    _truncate_partial_row(output_file)
+    if output_file.stat().st_size == 0:
+        return set()
+
+    with open(output_file, 'r', newline='') as csvfile:
+        reader = csv.DictReader(csvfile)
+        if reader.fieldnames != RESULT_COLUMNS:
+            raise ValueError(f"Existing results file {output_file} has different columns")
+        return {row['cell_id'] for row in reader
+                if len(row) == len(RESULT_COLUMNS) and None not in row.values()}
+
+def run_sweep(building_config_file: str, grid: Dict[str, List[Any]],
+              output_file: str, simulation_config_file: str = None,
+              duration: float = None, replications: int = 1,
+              base_seed: int = 0, max_workers: int = None) -> Dict[str, Any]:
+    """
+    Run every combination of a parameter grid in parallel worker processes.
+
+    Each finished cell is appended to one consolidated CSV table as soon
+    as it completes. Cells already in the table are skipped, so an
+    interrupted sweep resumes where it stopped; cell identifiers include
+    the contents of the configuration files, so editing a file reruns
+    its cells. All cells use the same
+    seeds, so configurations are compared under identical traffic.
+
+    Args:
+        building_config_file: Path to the base building configuration CSV file
+        grid: Lists of values keyed by parameter name (see GRID_PARAMETERS)
+        output_file: Path of the consolidated results CSV file
+        simulation_config_file: Path to the simulation configuration CSV file (optional)
+        duration: Simulated duration per run (defaults to the configured duration)
+        replications: Seeded runs per cell; KPIs are averaged across them
+        base_seed: Seed of the first replication of every cell
+        max_workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        Dict[str, Any]: Counts of total, skipped and newly completed cells
+
+    Raises:
+        ValueError: If the configuration, grid or existing results file is invalid
+    """
+    building_config = BuildingConfig(building_config_file)
+    errors = building_config.validate_configuration()
+    if errors:
+        raise ValueError("Invalid building configuration: " + "; ".join(errors))
+
+    simulation_config = SimulationConfig(simulation_config_file)
+    if duration is None:
+        duration = simulation_config.get_simulation_duration()
+
+    cells = expand_grid(grid)
+    run_settings = {'duration': duration, 'replications': replications,
+                    'base_seed': base_seed,
+                    'building_config': get_file_digest(building_config_file),
+                    'simulation_config': get_file_digest(simulation_config_file)}
+    seeds = [base_seed + i for i in range(replications)]
+
+    output_path = Path(output_file)
+    completed = _read_completed_cells(output_path)
+
+    base_elevators = building_config.elevators_data
+    building_data = building_config.building_data
+    cell_params = {}
+    tasks = []
+
+    for params in cells:
+        cell_id = get_cell_id(params, run_settings)
+        if cell_id in completed:
+            continue
+
+        elevators_data = build_cell_elevators(base_elevators, params)
+        cell_params[cell_id] = {
+            'elevator_count': len(elevators_data),
+            **{name: elevators_data[0][name] for name in ELEVATOR_PARAMETERS},
+            'dispatch_algorithm': params.get('dispatch_algorithm',
+                                             simulation_config.get_dispatch_algorithm()),
+            'dispatch_cycle': params.get('dispatch_cycle',
+                                         simulation_config.get_dispatch_cycle()),
+            'passenger_arrival_rate': params.get('passenger_arrival_rate',
+                                                 simulation_config.get_passenger_arrival_rate())
+        }
+        tasks.append((cell_id, params, building_data, elevators_data,
+                      simulation_config_file, duration, seeds))
+
+    logging.info(f"Sweep: {len(cells)} cells, {len(cells) - len(tasks)} already "
+                f"completed, {len(tasks)} to run")
+
+    wall_start = time.perf_counter()
+    write_header = not output_path.exists() or output_path.stat().st_size == 0
+
+    with open(output_path, 'a', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=RESULT_COLUMNS)
+        if write_header:
+            writer.writeheader()
+            csvfile.flush()
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_run_cell_task, task) for task in tasks]
+
+            for future in as_completed(futures):
+                row = future.result()
+                writer.writerow({**cell_params[row['cell_id']], **row})
+                csvfile.flush()
+
+    wall_time = time.perf_counter() - wall_start
+
+    return {
+        'total_cells': len(cells),
+        'skipped_cells': len(cells) - len(tasks),
+        'completed_cells': len(tasks),
+        'output_file': str(output_path),
+        'wall_time': wall_time
+    }